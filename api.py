@@ -0,0 +1,424 @@
+"""Local HTTP API over the finance tracker features.
+
+A dependency-free ASGI application; serve it with any ASGI server:
+
+    pip install uvicorn
+    python api.py --port 8000
+    uvicorn api:app --port 8000
+
+Endpoints take and return JSON, with amounts in rupees/dollars:
+
+    GET  /health
+    GET  /balance?month=YYYY-MM
+    GET  /transactions?from=YYYY-MM-DD&to=YYYY-MM-DD&type=&category=&limit=&offset=
+    POST /transactions            {"type", "amount", "category", "description"?, "date"?}
+    GET  /budgets?month=YYYY-MM
+    PUT  /budgets/<category>      {"amount"}
+    GET  /report?date=YYYY-MM-DD
+    GET  /reports/<name>?date=YYYY-MM-DD   (spending, income, savings, health_score, ...)
+
+Each request works on the ledger named by the X-Ledger header (or ?ledger=),
+defaulting to the server's --ledger; GETs on a ledger that does not exist
+yet get a 404, while a write creates it. Every response is {"ok": true,
+"result": ...} or {"ok": false, "error": ...}, as in cli.py.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import re
+import sys
+from contextlib import asynccontextmanager
+from urllib.parse import parse_qs
+
+from features.analytics.aggregation import by_category
+from features.analytics.report_cache import REPORTS, get_report, report_cache_stats
+from features.budgets.budgets import BUDGET_CATEGORIES, Budget, load_budgets, save_budgets
+from features.data_management.data_management import build_monthly_report
+from features.storage.storage import current_ledger, list_ledgers, set_default_ledger, using_ledger, validate_ledger
+from features.transactions.models import to_paisa
+from features.transactions.repository import get_repository
+from features.transactions.transactions import (
+    append_transaction, make_transaction, month_balance, monthly_totals, rolling_totals, transaction_summary
+)
+
+# Page size of GET /transactions when no limit is given, and the largest limit accepted
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Amounts in paisa/cents must stay below this to fit an int64 column
+MAX_AMOUNT = 2 ** 63
+
+
+class ApiError(Exception):
+    """Rejects a request with an HTTP status and a message for the client."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    def __init__(self, method, path, query, body, path_params):
+        self.method = method
+        self.path = path
+        self.query = query  # first value of each query parameter
+        self.body = body  # decoded JSON body, or None
+        self.path_params = path_params
+
+
+# ============= PARAMETERS =============
+def query_date(request, name):
+    text = request.query.get(name)
+    if text is None:
+        return None
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise ApiError(400, f"invalid {name} {text!r}, expected YYYY-MM-DD")
+
+
+def query_month(request):
+    text = request.query.get("month")
+    if text is None:
+        return datetime.date.today()
+    try:
+        return datetime.datetime.strptime(text, "%Y-%m").date()
+    except ValueError:
+        raise ApiError(400, f"invalid month {text!r}, expected YYYY-MM")
+
+
+def query_int(request, name, default, maximum=None):
+    text = request.query.get(name)
+    if text is None:
+        return default
+    try:
+        value = int(text)
+    except ValueError:
+        raise ApiError(400, f"invalid {name} {text!r}, expected an integer")
+    if value < 0 or (maximum is not None and value > maximum):
+        raise ApiError(400, f"{name} must be between 0 and {maximum}" if maximum else f"{name} must not be negative")
+    return value
+
+
+def body_field(request, name, required=True):
+    if not isinstance(request.body, dict):
+        raise ApiError(400, "expected a JSON object body")
+    if name not in request.body:
+        if required:
+            raise ApiError(400, f"missing field {name!r}")
+        return None
+    return request.body[name]
+
+
+def body_text(request, name, required=True):
+    """A string field of the body, or None if it is optional and missing."""
+    value = body_field(request, name, required)
+    if value is not None and not isinstance(value, str):
+        raise ApiError(400, f"field {name!r} must be a string")
+    return value
+
+
+def body_amount(request):
+    """The "amount" field in rupees/dollars, as integer paisa/cents."""
+    value = body_field(request, "amount")
+    if isinstance(value, bool):
+        raise ApiError(400, f"invalid amount {value!r}")
+    try:
+        # Also rejects NaN and Infinity, which JSON allows
+        amount = to_paisa(value)
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    if abs(amount) >= MAX_AMOUNT:
+        raise ApiError(400, f"invalid amount {value!r}")
+    return amount
+
+
+# ============= HANDLERS =============
+def get_health(request):
+    return {"ledger": current_ledger(), "report_cache": report_cache_stats()}
+
+
+def get_balance(request):
+    return month_balance(query_month(request))
+
+
+def list_transactions(request):
+    start = query_date(request, "from")
+    to = query_date(request, "to")
+    # "to" is inclusive, the repository's end bound is exclusive
+    end = to + datetime.timedelta(days=1) if to else None
+    limit = query_int(request, "limit", DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    offset = query_int(request, "offset", 0)
+    listing = get_repository().listing(start, end, request.query.get("type"), request.query.get("category"))
+    return {
+        "total": len(listing),
+        "offset": offset,
+        "transactions": [transaction_summary(t) for t in listing.page(offset, limit)],
+    }
+
+
+def add_transaction(request):
+    date_text = body_text(request, "date", required=False)
+    try:
+        date = datetime.date.fromisoformat(date_text) if date_text else None
+    except ValueError:
+        raise ApiError(400, f"invalid date {date_text!r}, expected YYYY-MM-DD")
+    try:
+        transaction = make_transaction(
+            body_text(request, "type"),
+            body_amount(request),
+            body_text(request, "category"),
+            body_text(request, "description", required=False) or "",
+            date
+        )
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    append_transaction(transaction)
+    return {"added": transaction_summary(transaction)}
+
+
+def get_budgets(request):
+    month = query_month(request)
+    spending = by_category(monthly_totals().month(month.year, month.month), "Expense")
+    return {
+        category: {
+            "budgeted": budget.amount / 100,
+            "spent": spending.get(category, 0) / 100,
+            "remaining": (budget.amount - spending.get(category, 0)) / 100,
+        }
+        for category, budget in load_budgets().items()
+    }
+
+
+def put_budget(request):
+    category = request.path_params["category"]
+    if category not in BUDGET_CATEGORIES:
+        raise ApiError(404, f"unknown budget category {category!r}")
+    amount = body_amount(request)
+    if amount <= 0:
+        raise ApiError(400, "amount must be positive")
+    budgets = load_budgets()
+    budgets[category] = Budget(category, amount)
+    save_budgets(budgets)
+    return {"category": category, "amount": amount / 100}
+
+
+def get_monthly_report(request):
+    return build_monthly_report(query_date(request, "date"))
+
+
+def get_named_report(request):
+    name = request.path_params["name"]
+    if name not in REPORTS:
+        raise ApiError(404, f"unknown report {name!r}, expected one of: {', '.join(REPORTS)}")
+    return get_report(name, query_date(request, "date")).to_dict()
+
+
+# (method, path pattern, handler, success status)
+ROUTES = [
+    ("GET", "/health", get_health, 200),
+    ("GET", "/balance", get_balance, 200),
+    ("GET", "/transactions", list_transactions, 200),
+    ("POST", "/transactions", add_transaction, 201),
+    ("GET", "/budgets", get_budgets, 200),
+    ("PUT", "/budgets/(?P<category>[^/]+)", put_budget, 200),
+    ("GET", "/report", get_monthly_report, 200),
+    ("GET", "/reports/(?P<name>[^/]+)", get_named_report, 200),
+]
+ROUTES = [(method, re.compile(pattern), handler, status) for method, pattern, handler, status in ROUTES]
+
+
+def match_route(method, path):
+    """Returns (handler, success status, path params); raises ApiError 404/405."""
+    allowed = False
+    for route_method, pattern, handler, status in ROUTES:
+        match = pattern.fullmatch(path)
+        if match:
+            if route_method == method:
+                return handler, status, match.groupdict()
+            allowed = True
+    raise ApiError(405 if allowed else 404, f"{method} {path} is not supported" if allowed else f"no such endpoint {path}")
+
+
+# ============= ASGI =============
+class ReadWriteLock:
+    """asyncio lock held by any number of readers at once, or by one writer alone.
+
+    A waiting writer holds back new readers, so a stream of GETs cannot starve it.
+    """
+
+    def __init__(self):
+        self.users = 0  # requests holding or waiting for the lock, see ledger_access()
+        self._changed = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @asynccontextmanager
+    async def reading(self):
+        async with self._changed:
+            await self._changed.wait_for(lambda: not self._writer and not self._writers_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._readers -= 1
+                self._changed.notify_all()
+
+    @asynccontextmanager
+    async def writing(self):
+        async with self._changed:
+            self._writers_waiting += 1
+            try:
+                await self._changed.wait_for(lambda: not self._writer and not self._readers)
+            finally:
+                self._writers_waiting -= 1
+                # Wakes readers held back by this writer if it was cancelled while waiting
+                self._changed.notify_all()
+            self._writer = True
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._writer = False
+                self._changed.notify_all()
+
+
+# GETs on one ledger run side by side; a write (its cached table is extended
+# in place) runs alone. Different ledgers run in parallel worker threads.
+# Kept in least recently used first order.
+_ledger_locks = {}
+# Ledger locks kept before unused ones are dropped, least recently used first
+MAX_LEDGER_LOCKS = 64
+
+
+@asynccontextmanager
+async def ledger_access(ledger, write):
+    """Holds ledger's lock for one request: shared for a read, exclusive for a write."""
+    lock = _ledger_locks.pop(ledger, None) or ReadWriteLock()
+    _ledger_locks[ledger] = lock
+    lock.users += 1
+    try:
+        async with lock.writing() if write else lock.reading():
+            yield
+    finally:
+        lock.users -= 1
+        excess = len(_ledger_locks) - MAX_LEDGER_LOCKS
+        if excess > 0:
+            # A lock nobody holds or waits for can be recreated later without losing anything
+            for name in [name for name, other in _ledger_locks.items() if not other.users][:excess]:
+                del _ledger_locks[name]
+
+
+def run_handler(ledger, handler, request):
+    with using_ledger(ledger):
+        return handler(request)
+
+
+def warm_up(ledger):
+    """Loads a ledger's table, rollup, rolling sums and budgets so the first request is already fast."""
+    with using_ledger(ledger):
+        get_repository().load()
+        monthly_totals()
+        rolling_totals()
+        load_budgets()
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+async def handle(scope, receive):
+    """Returns (status, payload) for one HTTP request."""
+    try:
+        handler, status, path_params = match_route(scope["method"], scope["path"])
+        query = {k: v[0] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+        headers = dict(scope.get("headers", []))
+        ledger = headers.get(b"x-ledger", b"").decode() or query.pop("ledger", None) or current_ledger()
+        try:
+            validate_ledger(ledger)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        write = scope["method"] != "GET"
+        # Only a write creates a ledger; reading one that does not exist must not
+        if not write and ledger not in list_ledgers():
+            raise ApiError(404, f"unknown ledger {ledger!r}")
+
+        raw = await read_body(receive)
+        try:
+            body = json.loads(raw) if raw else None
+        except json.JSONDecodeError:
+            raise ApiError(400, "request body is not valid JSON")
+
+        request = Request(scope["method"], scope["path"], query, body, path_params)
+        async with ledger_access(ledger, write):
+            result = await asyncio.to_thread(run_handler, ledger, handler, request)
+        return status, {"ok": True, "result": result}
+    except ApiError as e:
+        return e.status, {"ok": False, "error": str(e)}
+    except Exception as e:
+        # Invalid input is rejected with an ApiError where it is parsed, so anything else is a server fault
+        return 500, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await asyncio.to_thread(warm_up, current_ledger())
+            except Exception as e:
+                await send({"type": "lifespan.startup.failed", "message": f"{type(e).__name__}: {e}"})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """The ASGI application."""
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+    status, payload = await handle(scope, receive)
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Personal Finance Tracker HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--ledger", help="Ledger used when a request names none (default: FINANCE_TRACKER_LEDGER or 'default')")
+    args = parser.parse_args(argv)
+    if args.ledger:
+        set_default_ledger(args.ledger)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("Serving the API requires an ASGI server (pip install uvicorn), or run: <server> api:app", file=sys.stderr)
+        return 1
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
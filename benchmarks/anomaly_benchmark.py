@@ -0,0 +1,93 @@
+"""Per-insert cost of streaming anomaly detection as history grows.
+
+Grows an in-memory ColumnStore to --rows synthetic transactions and, at each
+checkpoint, times --batch new expenses being scored and folded into the
+per-category Welford statistics. It also times the naive approach of
+recomputing each category's mean and standard deviation from the full
+history for every insert. The streaming cost should stay flat while the
+naive cost grows linearly.
+
+    python benchmarks/anomaly_benchmark.py
+    python benchmarks/anomaly_benchmark.py --rows 1000000 --batch 2000
+"""
+import argparse
+import datetime
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features.analytics.anomaly import SpendingAnomalies
+from features.transactions.columnar import ColumnStore
+from features.transactions.models import Transaction
+
+CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
+START_DAY = datetime.date(2015, 1, 1).toordinal()
+
+
+def synthetic_transactions(count, rng, first_day):
+    for i in range(count):
+        day = datetime.date.fromordinal(first_day + i // 250)
+        if rng.random() < 0.1:
+            yield Transaction(day, "Income", "Salary", "", rng.randint(100000, 500000))
+        else:
+            amount = int(rng.lognormvariate(7, 1)) + 1
+            yield Transaction(day, "Expense", rng.choice(CATEGORIES), "", amount)
+
+
+def naive_check(store, category_code, amount):
+    """Recomputes the category's statistics from scratch, as a non-streaming check would."""
+    history = [math.log(a) for c, a in zip(store.category_codes, store.amounts) if c == category_code and a > 0]
+    if len(history) < 2:
+        return 0.0
+    stddev = statistics.stdev(history)
+    return (math.log(amount) - statistics.fmean(history)) / stddev if stddev else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=1000, help="Inserts timed at each checkpoint")
+    parser.add_argument("--naive-samples", type=int, default=3, help="Naive full recomputes timed per checkpoint")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    store = ColumnStore()
+    detector = SpendingAnomalies(store)
+    checkpoints = [n for n in (1_000, 10_000, 100_000, 1_000_000, 10_000_000) if n <= args.rows]
+    if not checkpoints or checkpoints[-1] != args.rows:
+        checkpoints.append(args.rows)
+
+    print(f"{'history rows':>14} {'streaming us/insert':>20} {'naive us/insert':>16} {'flagged':>8}")
+    for checkpoint in checkpoints:
+        # Grow the history (untimed) up to the checkpoint
+        missing = checkpoint - len(store)
+        if missing > 0:
+            store.extend(synthetic_transactions(missing, rng, START_DAY + len(store) // 250))
+            detector.refresh()
+
+        batch = list(synthetic_transactions(args.batch, rng, START_DAY + len(store) // 250))
+        started = time.perf_counter()
+        for t in batch:
+            store.append(t)
+            detector.refresh()
+        streaming_us = (time.perf_counter() - started) / len(batch) * 1e6
+
+        expenses = [t for t in batch if t.type == "Expense"][:args.naive_samples]
+        started = time.perf_counter()
+        for t in expenses:
+            naive_check(store, store.categories.code_of(t.category), t.amount)
+        naive_us = (time.perf_counter() - started) / max(len(expenses), 1) * 1e6
+
+        print(f"{checkpoint:>14,} {streaming_us:>20.2f} {naive_us:>16,.0f} {len(detector.flagged):>8,}")
+
+    print("\nstreaming cost includes ColumnStore.append; naive cost is the statistics recompute alone")
+
+
+if __name__ == "__main__":
+    main()
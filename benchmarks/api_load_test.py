@@ -0,0 +1,153 @@
+"""Load test for the HTTP API: requests/sec and latency percentiles.
+
+Opens --connections keep-alive connections and sends a mix of reads
+(balance, a page of transactions, budgets) and, with --write-ratio, posted
+transactions, for --duration seconds. Without --url it starts `python api.py`
+itself (needs uvicorn). Requests go to --ledger, so posted transactions land
+in that ledger's shard rather than your real data.
+
+    python benchmarks/api_load_test.py
+    python benchmarks/api_load_test.py --url http://127.0.0.1:8000 --connections 64 --duration 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READS = [
+    ("GET", "/balance", None),
+    ("GET", "/transactions?limit=20", None),
+    ("GET", "/budgets", None),
+]
+WRITE_BODY = {"type": "Expense", "amount": 12.5, "category": "Food", "description": "load test"}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def send_request(reader, writer, host, ledger, method, path, body):
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nX-Ledger: {ledger}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, ledger, deadline, write_ratio, rng, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            if rng.random() < write_ratio:
+                method, path, body = "POST", "/transactions", WRITE_BODY
+            else:
+                method, path, body = rng.choice(READS)
+            started = time.perf_counter()
+            status = await send_request(reader, writer, host, ledger, method, path, body)
+            results.append((f"{method} {path.split('?')[0]}", time.perf_counter() - started, status < 400))
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, ledger, connections, duration, write_ratio, seed):
+    results = []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, ledger, deadline, write_ratio, random.Random(seed + i), results)
+        for i in range(connections)
+    ))
+    return results, time.perf_counter() - started
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(host, port, server, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"api.py exited with {server.returncode} (is uvicorn installed?)")
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit("api.py did not start listening in time")
+
+
+def report(results, elapsed):
+    print(f"{'endpoint':<20} {'requests':>9} {'errors':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    groups = {}
+    for name, latency, ok in results:
+        groups.setdefault(name, []).append((latency, ok))
+    groups["all"] = [(latency, ok) for _, latency, ok in results]
+    for name, items in groups.items():
+        latencies = sorted(latency * 1000 for latency, _ in items)
+        errors = sum(not ok for _, ok in items)
+        print(f"{name:<20} {len(items):>9,} {errors:>7,} {percentile(latencies, 50):>8.2f} "
+              f"{percentile(latencies, 90):>8.2f} {percentile(latencies, 99):>8.2f} {latencies[-1] if latencies else 0:>8.2f}")
+    print(f"\n{len(results) / elapsed:,.0f} requests/sec over {elapsed:.1f}s")
+    return sum(not ok for _, _, ok in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running API; omit to start one")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Share of requests that POST a transaction")
+    parser.add_argument("--ledger", default="loadtest")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        server = subprocess.Popen([sys.executable, "api.py", "--port", str(port), "--ledger", args.ledger], cwd=ROOT)
+        wait_until_up(host, port, server)
+
+    try:
+        results, elapsed = asyncio.run(run_load(
+            host, port, args.ledger, args.connections, args.duration, args.write_ratio, args.seed
+        ))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    errors = report(results, elapsed)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Cold vs cached report times, and the report cache's hit/miss counters.
+
+Fills --ledger with --rows synthetic transactions (only if it is empty),
+then computes every report three times: cold, again with nothing changed
+(served from the cache), and after one new transaction (recomputed, since
+the data version moved). Prints per-report times and the cache stats.
+
+    python benchmarks/report_cache_benchmark.py
+    python benchmarks/report_cache_benchmark.py --rows 200000 --ledger bench
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features.analytics.report_cache import REPORTS, clear_report_cache, get_report, report_cache_stats
+from features.budgets.budgets import Budget, save_budgets
+from features.storage.storage import using_ledger
+from features.transactions.transactions import append_transaction, append_transactions, make_transaction, query_transactions
+
+CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
+
+
+def seed(rows, rng):
+    today = datetime.date.today()
+    transactions = []
+    for i in range(rows):
+        day = today - datetime.timedelta(days=i * 365 // rows)
+        if rng.random() < 0.05:
+            transactions.append(make_transaction("Income", rng.randint(100000, 500000), "Salary", "", day))
+        else:
+            transactions.append(make_transaction("Expense", int(rng.lognormvariate(7, 1)) + 1, rng.choice(CATEGORIES), "", day))
+    append_transactions(transactions)
+    save_budgets({category: Budget(category, 2000000) for category in CATEGORIES[:4]})
+
+
+def time_reports():
+    times = {}
+    for name in REPORTS:
+        started = time.perf_counter()
+        get_report(name)
+        times[name] = (time.perf_counter() - started) * 1000
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--ledger", default="reportbench")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with using_ledger(args.ledger):
+        if not query_transactions():
+            seed(args.rows, random.Random(args.seed))
+        clear_report_cache()
+
+        cold = time_reports()
+        cached = time_reports()
+        append_transaction(make_transaction("Expense", 1000, "Food", "report cache benchmark"))
+        changed = time_reports()
+
+    print(f"{'report':<24} {'cold ms':>9} {'cached ms':>10} {'changed ms':>11}")
+    for name in REPORTS:
+        print(f"{name:<24} {cold[name]:>9.2f} {cached[name]:>10.3f} {changed[name]:>11.2f}")
+    stats = report_cache_stats()
+    print(f"\ncache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), "
+          f"{stats['entries']}/{stats['max_entries']} entries, {stats['evictions']} evictions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Cold-start benchmark for the interactive CLI.
+
+Imports main.py in fresh interpreters with ``-X importtime`` and reports the
+median import time of ``main`` (everything needed before the first prompt) and
+the wall-clock time of the whole process. It fails when the median exceeds
+--max-ms, or when a module that should only load on demand is imported at
+startup.
+
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --runs 10 --max-ms 250 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the lazy menu registry must keep out of startup
+LAZY_MODULES = ("numpy", "pandas", "csv", "glob", "rich.table", "rich.bar", "features")
+
+
+def parse_importtime(stderr):
+    """Returns {module: (self_us, cumulative_us)} from -X importtime output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module):
+    """Imports module in a fresh interpreter; returns (wall seconds, import timings)."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    return wall, parse_importtime(result.stderr)
+
+
+def eager_lazy_modules(timings):
+    return sorted(
+        name for name in timings
+        if any(name == m or name.startswith(m + ".") for m in LAZY_MODULES)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=300.0, help="Fail if the median import time exceeds this")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest modules by self time")
+    args = parser.parse_args()
+
+    # One warm-up run so the .pyc cache does not count against the first sample
+    measure(args.module)
+    walls, import_ms, timings = [], [], {}
+    for _ in range(args.runs):
+        wall, timings = measure(args.module)
+        walls.append(wall * 1000)
+        import_ms.append(timings[args.module][1] / 1000)
+
+    median_import = statistics.median(import_ms)
+    print(f"import {args.module}: median {median_import:.1f} ms "
+          f"(min {min(import_ms):.1f}, max {max(import_ms):.1f}) over {args.runs} runs")
+    print(f"process wall time: median {statistics.median(walls):.1f} ms")
+
+    print(f"\nSlowest {args.top} modules by self time (last run):")
+    slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {self_us / 1000:8.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+    failed = False
+    eager = eager_lazy_modules(timings)
+    if eager:
+        failed = True
+        print("\nFAIL: imported at startup but should load on demand:")
+        for name in eager:
+            print(f"  {name}")
+    if median_import > args.max_ms:
+        failed = True
+        print(f"\nFAIL: median import time {median_import:.1f} ms exceeds budget of {args.max_ms:.0f} ms")
+    if not failed:
+        print(f"\nOK: within {args.max_ms:.0f} ms budget and no on-demand modules loaded at startup")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
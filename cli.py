@@ -0,0 +1,289 @@
+"""Non-interactive command line for scripting the finance tracker.
+
+Every command prints one JSON object. ``batch`` reads one command per line
+from a file (or stdin) and runs them all in this process, printing one JSON
+line per command; consecutive ``add`` commands are stored with one write.
+
+    python cli.py add --type Expense --amount 250 --category Food --description Lunch
+    python cli.py import statements/*.csv
+    python cli.py export out.csv.gz --format csv --from 2025-01-01 --category Food --gzip
+    python cli.py report --output monthly_report.json
+    python cli.py balance --month 2025-06
+    python cli.py batch commands.txt
+    python cli.py --ledger smith-household balance
+
+``--ledger`` selects the ledger for the whole run; inside a batch, a line
+may start with its own ``--ledger`` to run just that command on another one.
+A batch line with ``-h`` gets the help text as its result.
+"""
+import argparse
+import datetime
+import itertools
+import json
+import shlex
+import sys
+
+from features.transactions.transactions import (
+    make_transaction,
+    append_transactions,
+    month_balance,
+    transaction_summary,
+)
+from features.transactions.models import to_paisa
+from features.data_management.data_management import (
+    MAX_SHOWN_ERRORS,
+    build_monthly_report,
+    import_transactions,
+    iter_csv_transactions,
+    resolve_import_files,
+)
+from features.data_management.exporters import EXPORT_FORMATS, export_transactions
+from features.storage.storage import current_ledger, set_default_ledger, using_ledger, validate_ledger
+
+
+class CommandError(Exception):
+    """Raised for invalid arguments instead of exiting, so batches keep going."""
+
+
+class HelpRequested(Exception):
+    """Raised for -h/--help instead of printing and exiting; carries the help text."""
+
+
+class ArgumentParser(argparse.ArgumentParser):
+    def error(self, message):
+        raise CommandError(message)
+
+    def print_help(self, file=None):
+        raise HelpRequested(self.format_help())
+
+    def exit(self, status=0, message=None):
+        raise CommandError(message.strip() if message else f"exited with status {status}")
+
+
+def parse_date(text):
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {text!r}, expected YYYY-MM-DD")
+
+
+def parse_month(text):
+    try:
+        return datetime.datetime.strptime(text, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid month {text!r}, expected YYYY-MM")
+
+
+def parse_ledger(text):
+    try:
+        return validate_ledger(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_amount(text):
+    """Parses an amount in rupees/dollars into integer paisa/cents."""
+    try:
+        return to_paisa(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+# ============= COMMANDS =============
+def prepare_add(args):
+    """Validates an add command; returns the Transaction it would store."""
+    try:
+        return make_transaction(args.type, args.amount, args.category, args.description, args.date)
+    except ValueError as e:
+        raise CommandError(str(e))
+
+
+def command_add(args):
+    transaction = prepare_add(args)
+    append_transactions([transaction])
+    return {"added": transaction_summary(transaction)}
+
+
+def command_import(args):
+    files = sorted({f for pattern in args.files for f in resolve_import_files(pattern)})
+    if not files:
+        raise CommandError("no CSV files matched")
+    errors = []
+    rows = itertools.chain.from_iterable(
+        iter_csv_transactions(f, on_error=errors.append) for f in files
+    )
+    imported, duplicates = import_transactions(rows)
+    return {
+        "files": files,
+        "imported": imported,
+        "duplicates": duplicates,
+        "skipped_rows": len(errors),
+        "errors": errors[:args.max_errors],
+    }
+
+
+def command_export(args):
+    # --to is inclusive, the exporter's end bound is exclusive
+    end = args.end + datetime.timedelta(days=1) if args.end else None
+    count = export_transactions(
+        args.file, args.format, args.start, end, args.category, args.type, args.gzip
+    )
+    return {"file": args.file, "format": args.format, "exported": count}
+
+
+def command_report(args):
+    report = build_monthly_report(args.date)
+    if args.output:
+        with open(args.output, "w") as jsonfile:
+            json.dump(report, jsonfile, indent=4)
+        return {"file": args.output}
+    return report
+
+
+def command_balance(args):
+    return month_balance(args.month or datetime.date.today())
+
+
+def build_parser():
+    parser = ArgumentParser(prog="cli.py", description="Personal Finance Tracker (non-interactive)")
+    parser.add_argument("--ledger", type=parse_ledger, help="Ledger to work on (default: FINANCE_TRACKER_LEDGER or 'default')")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Add an expense or income")
+    add.add_argument("--type", required=True, choices=["Expense", "Income"])
+    add.add_argument("--amount", required=True, type=parse_amount)
+    add.add_argument("--category", required=True)
+    add.add_argument("--description", default="")
+    add.add_argument("--date", type=parse_date, help="YYYY-MM-DD, defaults to today")
+    add.set_defaults(handler=command_add)
+
+    import_ = commands.add_parser("import", help="Import CSV files, directories or glob patterns")
+    import_.add_argument("files", nargs="+")
+    import_.add_argument("--max-errors", type=int, default=MAX_SHOWN_ERRORS, help="Row errors to include in the output")
+    import_.set_defaults(handler=command_import)
+
+    export = commands.add_parser("export", help="Export transactions")
+    export.add_argument("file")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export.add_argument("--from", dest="start", type=parse_date)
+    export.add_argument("--to", dest="end", type=parse_date, help="Inclusive")
+    export.add_argument("--category")
+    export.add_argument("--type", choices=["Expense", "Income"])
+    export.add_argument("--gzip", action="store_true")
+    export.set_defaults(handler=command_export)
+
+    report = commands.add_parser("report", help="Monthly report")
+    report.add_argument("--date", type=parse_date, help="Any day in the month to report on")
+    report.add_argument("--output", help="Write the report to this file instead of stdout")
+    report.set_defaults(handler=command_report)
+
+    balance = commands.add_parser("balance", help="Income, expenses and balance for a month")
+    balance.add_argument("--month", type=parse_month, help="YYYY-MM, defaults to this month")
+    balance.set_defaults(handler=command_balance)
+
+    batch = commands.add_parser("batch", help="Run one command per line from a file or stdin")
+    batch.add_argument("file", nargs="?", default="-")
+    batch.set_defaults(handler=None)
+    return parser
+
+
+def run(parser, argv):
+    """Runs one command; returns a JSON-ready result with an "ok" flag."""
+    try:
+        args = parser.parse_args(argv)
+        if args.command == "batch":
+            raise CommandError("batch cannot be nested")
+        with using_ledger(args.ledger or current_ledger()):
+            return {"ok": True, "command": args.command, "result": args.handler(args)}
+    except HelpRequested as e:
+        return {"ok": True, "command": argv[0] if argv else None, "result": {"help": str(e)}}
+    except CommandError as e:
+        return {"ok": False, "command": argv[0] if argv else None, "error": str(e)}
+    except Exception as e:
+        return {"ok": False, "command": argv[0] if argv else None, "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(parser, lines):
+    """Runs commands line by line, yielding results in order.
+
+    Consecutive adds to the same ledger are validated individually but
+    written with a single append_transactions call.
+    """
+    pending = []  # (result, transaction) for adds not yet written
+    pending_ledger = None
+
+    def flush():
+        if not pending:
+            return
+        try:
+            with using_ledger(pending_ledger):
+                append_transactions([t for _, t in pending])
+        except Exception as e:
+            for result, _ in pending:
+                result.update(ok=False, error=f"{type(e).__name__}: {e}")
+                result.pop("result", None)
+        yield from (result for result, _ in pending)
+        pending.clear()
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            yield from flush()
+            yield {"ok": False, "command": None, "error": str(e)}
+            continue
+        try:
+            args = parser.parse_args(argv)
+        except (CommandError, HelpRequested):
+            args = None  # run() reports it
+        if args is None or args.command != "add":
+            yield from flush()
+            yield run(parser, argv)
+            continue
+        try:
+            transaction = prepare_add(args)
+        except CommandError as e:
+            yield from flush()
+            yield {"ok": False, "command": "add", "error": str(e)}
+            continue
+        ledger = args.ledger or current_ledger()
+        if ledger != pending_ledger:
+            yield from flush()
+            pending_ledger = ledger
+        pending.append(({"ok": True, "command": "add", "result": {"added": transaction_summary(transaction)}}, transaction))
+    yield from flush()
+
+
+def main(argv=None):
+    parser = build_parser()
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        args = parser.parse_args(argv)
+    except HelpRequested as e:
+        print(e, end="")
+        return 0
+    except CommandError as e:
+        print(json.dumps({"ok": False, "error": str(e)}))
+        return 2
+    if args.ledger:
+        set_default_ledger(args.ledger)
+
+    if args.command != "batch":
+        result = run(parser, argv)
+        print(json.dumps(result))
+        return 0 if result["ok"] else 1
+
+    failed = 0
+    source = sys.stdin if args.file == "-" else open(args.file)
+    with source:
+        for result in run_batch(parser, source):
+            failed += not result["ok"]
+            print(json.dumps(result), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
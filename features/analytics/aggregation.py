@@ -0,0 +1,112 @@
+import datetime
+
+# numpy is only imported the first time a full aggregation runs (see _numpy)
+_np = None
+
+# Day ordinal of 1970-01-01, the numpy datetime64 epoch
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def type_total(totals, transaction_type):
+    """Sums a {(type, category): amount} mapping for one transaction type."""
+    return sum(amount for (t_type, _), amount in totals.items() if t_type == transaction_type)
+
+
+def by_category(totals, transaction_type):
+    """Returns {category: amount} for one transaction type."""
+    return {category: amount for (t_type, category), amount in totals.items() if t_type == transaction_type}
+
+
+class MonthlyTotals:
+    """Transaction totals grouped by (year, month, type, category)."""
+
+    def __init__(self, sums):
+        self.sums = sums  # {(year, month, type, category): amount in paisa}
+        self._months = {}
+        for (year, month, transaction_type, category), amount in sums.items():
+            self._months.setdefault((year, month), {})[(transaction_type, category)] = amount
+
+    def month(self, year, month):
+        """Returns {(type, category): amount} for one calendar month."""
+        return self._months.get((year, month), {})
+
+    def month_of(self, day):
+        return self.month(day.year, day.month)
+
+    def overall(self):
+        """Returns {(type, category): amount} across every month."""
+        totals = {}
+        for (_, _, transaction_type, category), amount in self.sums.items():
+            key = (transaction_type, category)
+            totals[key] = totals.get(key, 0) + amount
+        return totals
+
+
+def _numpy():
+    """Returns the numpy module, importing it on first use, or None if it is not installed."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:  # numpy is optional, the pure-Python pass gives the same result
+            _np = False
+    return _np or None
+
+
+def _aggregate_numpy(store, np):
+    days = np.frombuffer(store.days, dtype=np.int32)
+    amounts = np.frombuffer(store.amounts, dtype=np.int64)
+    # The code columns may have been widened, so read them with their own typecode
+    type_codes = np.frombuffer(store.type_codes, dtype=store.type_codes.typecode).astype(np.int64)
+    category_codes = np.frombuffer(store.category_codes, dtype=store.category_codes.typecode).astype(np.int64)
+
+    # Months since 1970-01 for every row, then one combined integer group key
+    months = (days - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    n_types, n_categories = len(store.types), len(store.categories)
+    keys = (months * n_types + type_codes) * n_categories + category_codes
+
+    # Sort by key and sum each run; reduceat keeps the int64 sums exact
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+    group_sums = np.add.reduceat(amounts[order], starts)
+    group_keys = sorted_keys[starts]
+
+    sums = {}
+    for key, amount in zip(group_keys.tolist(), group_sums.tolist()):
+        key, category_code = divmod(key, n_categories)
+        month_index, type_code = divmod(key, n_types)
+        year, month = divmod(month_index, 12)
+        sums[(1970 + year, month + 1, store.types.values[type_code], store.categories.values[category_code])] = amount
+    return sums
+
+
+def _aggregate_python(store):
+    months = {}  # day ordinal -> (year, month)
+    sums = {}
+    for day, type_code, category_code, amount in zip(store.days, store.type_codes, store.category_codes, store.amounts):
+        year_month = months.get(day)
+        if year_month is None:
+            date = datetime.date.fromordinal(day)
+            year_month = months[day] = (date.year, date.month)
+        key = (year_month, type_code, category_code)
+        sums[key] = sums.get(key, 0) + amount
+    return {
+        (year, month, store.types.values[type_code], store.categories.values[category_code]): amount
+        for ((year, month), type_code, category_code), amount in sums.items()
+    }
+
+
+def aggregate(store):
+    """Groups a ColumnStore by (month, type, category) in a single pass.
+
+    Uses one vectorized numpy pass when numpy is installed and the amounts fit
+    in int64, otherwise a single pure-Python pass over the columns.
+    """
+    if not len(store):
+        return MonthlyTotals({})
+    np = _numpy()
+    if np is not None and not isinstance(store.amounts, list):
+        return MonthlyTotals(_aggregate_numpy(store, np))
+    return MonthlyTotals(_aggregate_python(store))
@@ -0,0 +1,94 @@
+import math
+
+# An expense is unusual when its log amount is this many standard deviations
+# above its category's mean (spending is right-skewed, roughly log-normal)
+Z_THRESHOLD = 3.0
+# ...and the category already has at least this many expenses to compare against
+MIN_SAMPLES = 10
+
+
+class RunningStats:
+    """Welford's streaming mean and variance; each add() is O(1)."""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def zscore(self, value):
+        stddev = self.stddev
+        return (value - self.mean) / stddev if stddev > 0 else 0.0
+
+
+class SpendingAnomalies:
+    """Flags unusually large expenses using per-category running statistics.
+
+    Each expense is scored against its category's statistics as they stood
+    before it arrived, then folded in, so checking a new transaction costs
+    O(1) regardless of history size. Rows appended to the store are picked
+    up by refresh().
+    """
+
+    def __init__(self, store, z_threshold=Z_THRESHOLD, min_samples=MIN_SAMPLES):
+        self.store = store
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.stats = {}  # category code -> RunningStats of log expense amounts
+        self.flagged = []  # (row, z-score) of unusual expenses, in arrival order
+        self.indexed_rows = 0
+
+    def refresh(self):
+        """Scores and folds in the rows appended to the store since the last call."""
+        store = self.store
+        expense_code = store.types.code_of("Expense")
+        if expense_code is not None:
+            for row in range(self.indexed_rows, len(store)):
+                if store.type_codes[row] == expense_code:
+                    self._observe(row, store.category_codes[row], store.amounts[row])
+        self.indexed_rows = len(store)
+
+    def _observe(self, row, category_code, amount):
+        if amount <= 0:
+            return
+        value = math.log(amount)
+        stats = self.stats.get(category_code)
+        if stats is None:
+            stats = self.stats[category_code] = RunningStats()
+        if stats.count >= self.min_samples:
+            z = stats.zscore(value)
+            if z >= self.z_threshold:
+                self.flagged.append((row, z))
+        stats.add(value)
+
+    def category_stats(self, category):
+        """Returns the RunningStats of category's log expense amounts, or None if it has none."""
+        code = self.store.categories.code_of(category)
+        return self.stats.get(code) if code is not None else None
+
+    def unusual(self, start=None, end=None):
+        """Returns [(transaction, z-score)] flagged with start <= date < end, newest first."""
+        lo = start.toordinal() if start else None
+        hi = end.toordinal() if end else None
+        days = self.store.days
+        found = [
+            (row, z) for row, z in self.flagged
+            if (lo is None or days[row] >= lo) and (hi is None or days[row] < hi)
+        ]
+        found.sort(key=lambda item: (days[item[0]], item[0]), reverse=True)
+        return [(self.store[row], z) for row, z in found]
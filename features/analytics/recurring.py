@@ -0,0 +1,93 @@
+import datetime
+
+from features.storage.storage import add_to_recurring, build_recurring
+
+# A series needs this many payments before it counts as a recurring bill
+MIN_OCCURRENCES = 3
+
+# (name, period in days, allowed deviation of each gap in days)
+PERIODS = (
+    ("weekly", 7, 1),
+    ("fortnightly", 14, 2),
+    ("monthly", 30, 3),
+    ("quarterly", 91, 7),
+    ("yearly", 365, 10),
+)
+# Periods that follow the calendar (next bill on the same day of the month) rather than a fixed day count
+CALENDAR_MONTHS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+
+
+def add_months(day, months):
+    """The same day months later, clamped to the end of the target month."""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    return day.replace(year=year, month=month, day=min(day.day, (next_month - datetime.timedelta(days=1)).day))
+
+
+def detect_period(days):
+    """Returns the (name, days, tolerance) PERIODS entry every gap between sorted day ordinals fits, or None."""
+    if len(days) < MIN_OCCURRENCES:
+        return None
+    gaps = [b - a for a, b in zip(days, days[1:])]
+    median = sorted(gaps)[len(gaps) // 2]
+    for period in PERIODS:
+        _, length, tolerance = period
+        if abs(median - length) <= tolerance:
+            return period if all(abs(gap - length) <= tolerance for gap in gaps) else None
+    return None
+
+
+class RecurringBill:
+    def __init__(self, category, description, amount, frequency, last_paid, next_due):
+        self.category = category
+        self.description = description
+        self.amount = amount
+        self.frequency = frequency
+        self.last_paid = last_paid
+        self.next_due = next_due
+
+
+class RecurringIndex:
+    """Expenses grouped by (category, normalized description, amount bucket).
+
+    The groups are the plain series rows storage keeps (see
+    add_to_recurring): each holds only its latest payment days, so adding a
+    transaction touches one group and detection reads the groups, never the
+    transaction history.
+    """
+
+    def __init__(self, series=None):
+        self.series = series or {}  # (category, words, bucket) -> {"days", "description", "amount"}
+
+    @classmethod
+    def from_records(cls, records):
+        return cls(build_recurring(records))
+
+    def add(self, records):
+        """Folds transaction records into their groups; returns the set of keys that changed."""
+        return add_to_recurring(self.series, records)
+
+    def bills(self, today=None):
+        """Returns the detected recurring bills that are still active, soonest due first.
+
+        A bill lapses (e.g. a cancelled subscription) once a whole period has
+        passed since it was due without a payment.
+        """
+        today = today or datetime.date.today()
+        bills = []
+        for (category, _, _), series in self.series.items():
+            period = detect_period(series["days"])
+            if period is None:
+                continue
+            name, length, tolerance = period
+            last_paid = datetime.date.fromordinal(series["days"][-1])
+            if name in CALENDAR_MONTHS:
+                next_due = add_months(last_paid, CALENDAR_MONTHS[name])
+            else:
+                next_due = last_paid + datetime.timedelta(days=length)
+            if (today - next_due).days > length:
+                continue
+            bills.append(RecurringBill(category, series["description"], series["amount"], name, last_paid, next_due))
+        bills.sort(key=lambda bill: bill.next_due)
+        return bills
@@ -0,0 +1,119 @@
+"""Memoized reports, shared by the CLI menus, the dashboard and the API.
+
+A report is computed once per (ledger, report name, parameters, data
+version) and kept in a bounded LRU cache. The data version is the storage
+backend's data_version(), which moves on every save of transactions,
+budgets or goals, including saves made by other processes, so a cached
+report is never served for data that has since changed.
+"""
+import datetime
+import threading
+from collections import OrderedDict
+
+from features.analytics.reports import (
+    compute_spending_report,
+    compute_income_report,
+    compute_savings_report,
+    compute_health_score,
+    compute_comprehensive_report,
+)
+from features.smart_assistant.reports import (
+    compute_daily_check,
+    compute_recommendations,
+    compute_spending_alerts,
+    compute_savings_opportunities,
+)
+from features.storage.storage import current_ledger, get_storage
+
+# Reports kept across all ledgers before the least recently used is evicted
+MAX_CACHED_REPORTS = 64
+
+# Report name -> function computing it; each takes today plus keyword parameters
+REPORTS = {
+    "spending": compute_spending_report,
+    "income": compute_income_report,
+    "savings": compute_savings_report,
+    "health_score": compute_health_score,
+    "comprehensive": compute_comprehensive_report,
+    "daily_check": compute_daily_check,
+    "recommendations": compute_recommendations,
+    "alerts": compute_spending_alerts,
+    "savings_opportunities": compute_savings_opportunities,
+}
+
+
+def _hashable(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+class ReportCache:
+    """LRU mapping of cache keys to computed reports, with hit/miss counters. Thread-safe."""
+
+    def __init__(self, max_entries=MAX_CACHED_REPORTS):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Computed outside the lock so a slow report does not hold up other ledgers
+        result = compute()
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = ReportCache()
+
+
+def get_report(name, today=None, **params):
+    """Returns report name for the current ledger, computing it only if the data changed.
+
+    The result is shared with later callers, so treat it as read-only.
+    """
+    compute = REPORTS.get(name)
+    if compute is None:
+        raise ValueError(f"unknown report {name!r}, expected one of: {', '.join(REPORTS)}")
+    today = today or datetime.date.today()
+    ledger = current_ledger()
+    key = (ledger, name, today, tuple(sorted(params.items())), _hashable(get_storage(ledger).data_version()))
+    return _cache.get_or_compute(key, lambda: compute(today=today, **params))
+
+
+def report_cache_stats():
+    return _cache.stats()
+
+
+def clear_report_cache():
+    _cache.clear()
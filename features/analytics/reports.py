@@ -0,0 +1,316 @@
+"""Headless report computation.
+
+Each compute_* function reads the stored data and returns a plain result
+object; nothing here prints. analytics.py renders the results to the
+console, the dashboard and the monthly report export read them directly,
+and to_dict() gives a JSON-ready form (amounts in rupees/dollars).
+"""
+import datetime
+
+from features.analytics.aggregation import type_total, by_category
+from features.analytics.recurring import add_months
+from features.budgets.budgets import load_budgets
+from features.transactions.transactions import monthly_totals
+
+# Months shown in the savings trend, counting back from last month
+SAVINGS_TREND_MONTHS = 3
+
+
+def sorted_amounts(amounts):
+    """{category: amount} as [(category, amount)], largest first."""
+    return sorted(amounts.items(), key=lambda item: item[1], reverse=True)
+
+
+def percent_change(current, previous):
+    """Change from previous to current in percent, or None without a previous amount."""
+    return ((current - previous) / previous) * 100 if previous > 0 else None
+
+
+def savings_rate(income, expenses):
+    """Share of income kept, in percent, or None without income."""
+    return ((income - expenses) / income) * 100 if income > 0 else None
+
+
+class BudgetStatus:
+    """One category's budget against its spending for the month."""
+
+    def __init__(self, category, budgeted, spent):
+        self.category = category
+        self.budgeted = budgeted
+        self.spent = spent
+
+    @property
+    def remaining(self):
+        return self.budgeted - self.spent
+
+    @property
+    def utilization(self):
+        return (self.spent / self.budgeted) * 100 if self.budgeted > 0 else 0
+
+    @property
+    def over_budget(self):
+        return self.spent > self.budgeted
+
+    def to_dict(self):
+        return {"budgeted": self.budgeted / 100, "spent": self.spent / 100, "remaining": self.remaining / 100}
+
+
+def budget_statuses(budgets, category_spending):
+    return [BudgetStatus(category, b.amount, category_spending.get(category, 0)) for category, b in budgets.items()]
+
+
+class SpendingReport:
+    def __init__(self, today, categories, month_expenses):
+        self.today = today
+        self.categories = categories  # [(category, amount)] across all months, largest first
+        self.month_expenses = month_expenses  # this month's expenses so far
+
+    @property
+    def total(self):
+        return sum(amount for _, amount in self.categories)
+
+    @property
+    def average_daily_expense(self):
+        """This month's expenses per day so far, or None if there are none."""
+        return self.month_expenses / self.today.day if self.month_expenses else None
+
+    def to_dict(self):
+        return {
+            "date": self.today.isoformat(),
+            "by_category": {category: amount / 100 for category, amount in self.categories},
+            "total": self.total / 100,
+            "average_daily_expense": None if self.average_daily_expense is None else self.average_daily_expense / 100,
+        }
+
+
+def compute_spending_report(today=None):
+    today = today or datetime.date.today()
+    totals = monthly_totals()
+    return SpendingReport(
+        today,
+        sorted_amounts(by_category(totals.overall(), "Expense")),
+        type_total(totals.month_of(today), "Expense")
+    )
+
+
+class IncomeReport:
+    def __init__(self, today, has_income, sources, last_month_total):
+        self.today = today
+        self.has_income = has_income  # any income recorded at all
+        self.sources = sources  # [(category, amount)] this month, largest first
+        self.last_month_total = last_month_total
+
+    @property
+    def total(self):
+        return sum(amount for _, amount in self.sources)
+
+    @property
+    def change(self):
+        """Month-over-month change in percent, or None without income last month."""
+        return percent_change(self.total, self.last_month_total)
+
+    def to_dict(self):
+        return {
+            "date": self.today.isoformat(),
+            "by_source": {category: amount / 100 for category, amount in self.sources},
+            "total": self.total / 100,
+            "last_month_total": self.last_month_total / 100,
+            "change_pct": self.change,
+        }
+
+
+def compute_income_report(today=None):
+    today = today or datetime.date.today()
+    totals = monthly_totals()
+    last_month = today.replace(day=1) - datetime.timedelta(days=1)
+    return IncomeReport(
+        today,
+        bool(by_category(totals.overall(), "Income")),
+        sorted_amounts(by_category(totals.month_of(today), "Income")),
+        type_total(totals.month_of(last_month), "Income")
+    )
+
+
+class SavingsReport:
+    def __init__(self, today, income, expenses, trend):
+        self.today = today
+        self.income = income
+        self.expenses = expenses
+        self.trend = trend  # [(first day of month, savings)], last month first
+
+    @property
+    def savings(self):
+        return self.income - self.expenses
+
+    @property
+    def savings_rate(self):
+        return savings_rate(self.income, self.expenses)
+
+    def to_dict(self):
+        return {
+            "date": self.today.isoformat(),
+            "savings": self.savings / 100,
+            "savings_rate": self.savings_rate,
+            "trend": {month.strftime("%Y-%m"): amount / 100 for month, amount in self.trend},
+        }
+
+
+def compute_savings_report(today=None):
+    today = today or datetime.date.today()
+    totals = monthly_totals()
+    current = totals.month_of(today)
+    trend = []
+    for months_back in range(1, SAVINGS_TREND_MONTHS + 1):
+        month = add_months(today.replace(day=1), -months_back)
+        month_totals = totals.month_of(month)
+        trend.append((month, type_total(month_totals, "Income") - type_total(month_totals, "Expense")))
+    return SavingsReport(today, type_total(current, "Income"), type_total(current, "Expense"), trend)
+
+
+class HealthFactor:
+    def __init__(self, name, score, detail):
+        self.name = name
+        self.score = score
+        self.detail = detail
+
+
+class HealthScore:
+    def __init__(self, today, factors):
+        self.today = today
+        self.factors = factors  # [HealthFactor]
+
+    @property
+    def score(self):
+        return sum(f.score for f in self.factors)
+
+    @property
+    def advice(self):
+        if self.score < 50:
+            return ["Focus on increasing income or significantly reducing expenses.",
+                    "Create and stick to a strict budget."]
+        if self.score < 75:
+            return ["Review your budget for areas to save more.",
+                    "Consider setting financial goals like an emergency fund."]
+        return ["Keep up the great work!",
+                "Explore investment opportunities to grow your wealth."]
+
+    def to_dict(self):
+        return {
+            "date": self.today.isoformat(),
+            "score": self.score,
+            "factors": {f.name: {"score": f.score, "detail": f.detail} for f in self.factors},
+            "advice": self.advice,
+        }
+
+
+def savings_rate_factor(income, expenses):
+    """Savings Rate, 30 points: aim for 20%."""
+    rate = savings_rate(income, expenses)
+    if rate is None:
+        return HealthFactor("Savings Rate", 0, "No income to calculate savings rate.")
+    if rate >= 20:
+        return HealthFactor("Savings Rate", 30, f"Excellent ({rate:.2f}%)")
+    if rate >= 10:
+        return HealthFactor("Savings Rate", 20, f"Good ({rate:.2f}%)")
+    return HealthFactor("Savings Rate", 0, f"Low ({rate:.2f}%) - Aim for at least 10-20%")
+
+
+def budget_adherence_factor(statuses):
+    """Budget Adherence, 25 points: spending counts only up to each budget."""
+    if not statuses:
+        return HealthFactor("Budget Adherence", 0, "No budgets set.")
+    total_budgeted = sum(s.budgeted for s in statuses)
+    if total_budgeted <= 0:
+        return HealthFactor("Budget Adherence", 0, "No active budgets to calculate adherence.")
+    utilization = (sum(min(s.spent, s.budgeted) for s in statuses) / total_budgeted) * 100
+    if utilization <= 80:
+        return HealthFactor("Budget Adherence", 25, f"Excellent ({utilization:.2f}% utilized)")
+    if utilization <= 100:
+        return HealthFactor("Budget Adherence", 15, f"Good ({utilization:.2f}% utilized)")
+    return HealthFactor("Budget Adherence", 0, f"Over budget ({utilization:.2f}% utilized) - Review spending")
+
+
+def income_vs_expenses_factor(income, expenses):
+    """Income vs Expenses, 25 points."""
+    if income > expenses:
+        return HealthFactor("Income vs Expenses", 25, "Income exceeds expenses - Healthy!")
+    if income == expenses:
+        return HealthFactor("Income vs Expenses", 10, "Income equals expenses - Room for improvement.")
+    return HealthFactor("Income vs Expenses", 0, "Expenses exceed income - Caution!")
+
+
+def compute_health_score(today=None):
+    today = today or datetime.date.today()
+    current = monthly_totals().month_of(today)
+    income = type_total(current, "Income")
+    expenses = type_total(current, "Expense")
+    statuses = budget_statuses(load_budgets(), by_category(current, "Expense"))
+    return HealthScore(today, [
+        savings_rate_factor(income, expenses),
+        budget_adherence_factor(statuses),
+        income_vs_expenses_factor(income, expenses),
+        # Debt Management (20 points) is not tracked yet
+        HealthFactor("Debt Management", 0, "Not tracked in this version. (Assumed 0 points)"),
+    ])
+
+
+class ComprehensiveReport:
+    """The month's overview, income, expenses and budgets, compared with last month."""
+
+    def __init__(self, today, income_sources, expense_categories, last_month_income, last_month_expenses, budgets):
+        self.today = today
+        self.income_sources = income_sources  # [(category, amount)], largest first
+        self.expense_categories = expense_categories  # [(category, amount)], largest first
+        self.last_month_income = last_month_income
+        self.last_month_expenses = last_month_expenses
+        self.budgets = budgets  # [BudgetStatus]
+
+    @property
+    def income(self):
+        return sum(amount for _, amount in self.income_sources)
+
+    @property
+    def expenses(self):
+        return sum(amount for _, amount in self.expense_categories)
+
+    @property
+    def savings(self):
+        return self.income - self.expenses
+
+    @property
+    def savings_rate(self):
+        return savings_rate(self.income, self.expenses)
+
+    @property
+    def over_budget(self):
+        return [s for s in self.budgets if s.over_budget]
+
+    def to_dict(self):
+        return {
+            "date": self.today.isoformat(),
+            "income": self.income / 100,
+            "expenses": self.expenses / 100,
+            "savings": self.savings / 100,
+            "savings_rate": self.savings_rate,
+            "last_month_income": self.last_month_income / 100,
+            "last_month_expenses": self.last_month_expenses / 100,
+            "income_by_source": {category: amount / 100 for category, amount in self.income_sources},
+            "expenses_by_category": {category: amount / 100 for category, amount in self.expense_categories},
+            "budgets": {s.category: s.to_dict() for s in self.budgets},
+        }
+
+
+def compute_comprehensive_report(today=None):
+    today = today or datetime.date.today()
+    totals = monthly_totals()
+    current = totals.month_of(today)
+    last_month = totals.month_of(today.replace(day=1) - datetime.timedelta(days=1))
+    category_spending = by_category(current, "Expense")
+    return ComprehensiveReport(
+        today,
+        sorted_amounts(by_category(current, "Income")),
+        sorted_amounts(category_spending),
+        type_total(last_month, "Income"),
+        type_total(last_month, "Expense"),
+        budget_statuses(load_budgets(), category_spending)
+    )
@@ -0,0 +1,129 @@
+import datetime
+from array import array
+from bisect import bisect_left
+
+# Out-of-order batches larger than this rebuild the sums in one pass instead
+# of being inserted row by row
+REBUILD_THRESHOLD = 64
+
+
+class RollingTotals:
+    """Per-(type, category) running totals over the days that have transactions.
+
+    Each series keeps its distinct days in order and, for each of them, the
+    total up to and including that day, so the total for any window
+    start <= date < end is two bisects and a subtraction: O(log n) for a
+    series, O(categories log n) for a whole transaction type. Memory grows
+    with the number of days that have transactions, not with the span from
+    the first to the last date, so one mistyped year costs one entry.
+    Rows appended to the store are folded in by refresh().
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.series = {}  # (type code, category code) -> (array of days, [running total per day])
+        self.last_day = None
+        self.indexed_rows = 0
+
+    def refresh(self):
+        """Folds rows appended to the store since the last call into the running totals."""
+        store = self.store
+        if self.indexed_rows == len(store):
+            return
+        new_rows = range(self.indexed_rows, len(store))
+        if self.last_day is None or (
+            len(new_rows) > REBUILD_THRESHOLD and min(store.days[row] for row in new_rows) < self.last_day
+        ):
+            self._rebuild()
+        else:
+            for row in new_rows:
+                self._add(row)
+        self.indexed_rows = len(store)
+
+    def _rebuild(self):
+        store = self.store
+        days, type_codes, category_codes, amounts = store.days, store.type_codes, store.category_codes, store.amounts
+        series = {}
+        # The date index visits rows in day order, so every series is built by appending
+        for row in store.date_order:
+            key = (type_codes[row], category_codes[row])
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = (array("i"), [])
+            series_days, totals = entry
+            day, amount = days[row], amounts[row]
+            if series_days and series_days[-1] == day:
+                totals[-1] += amount
+            else:
+                series_days.append(day)
+                totals.append((totals[-1] if totals else 0) + amount)
+        self.series = series
+        self.last_day = store.sorted_days[-1] if len(store) else None
+
+    def _add(self, row):
+        store = self.store
+        key = (store.type_codes[row], store.category_codes[row])
+        day, amount = store.days[row], store.amounts[row]
+        entry = self.series.get(key)
+        if entry is None:
+            entry = self.series[key] = (array("i"), [])
+        series_days, totals = entry
+        if not series_days or day > series_days[-1]:
+            series_days.append(day)
+            totals.append((totals[-1] if totals else 0) + amount)
+        else:
+            i = bisect_left(series_days, day)
+            if series_days[i] != day:
+                series_days.insert(i, day)
+                totals.insert(i, totals[i - 1] if i else 0)
+            # Usually the newest day, so this touches one or two entries
+            for j in range(i, len(totals)):
+                totals[j] += amount
+        if self.last_day is None or day > self.last_day:
+            self.last_day = day
+
+    @staticmethod
+    def _total_before(entry, day):
+        """Total of a series on the days before day."""
+        series_days, totals = entry
+        i = bisect_left(series_days, day)
+        return totals[i - 1] if i else 0
+
+    def _keys(self, transaction_type, category=None):
+        type_code = self.store.types.code_of(transaction_type)
+        if type_code is None:
+            return []
+        if category is None:
+            return [key for key in self.series if key[0] == type_code]
+        category_code = self.store.categories.code_of(category)
+        return [(type_code, category_code)] if (type_code, category_code) in self.series else []
+
+    def window(self, start, end, transaction_type, category=None):
+        """Total of transaction_type (optionally one category) for start <= date < end."""
+        lo, hi = start.toordinal(), end.toordinal()
+        return sum(
+            self._total_before(self.series[key], hi) - self._total_before(self.series[key], lo)
+            for key in self._keys(transaction_type, category)
+        )
+
+    def by_category(self, start, end, transaction_type):
+        """Returns {category: total} of transaction_type for start <= date < end."""
+        lo, hi = start.toordinal(), end.toordinal()
+        categories = self.store.categories.values
+        totals = {}
+        for key in self._keys(transaction_type):
+            entry = self.series[key]
+            total = self._total_before(entry, hi) - self._total_before(entry, lo)
+            if total:
+                totals[categories[key[1]]] = total
+        return totals
+
+    def last_days(self, days, transaction_type, category=None, today=None):
+        """Total over the `days` days ending with today (inclusive)."""
+        today = today or datetime.date.today()
+        end = today + datetime.timedelta(days=1)
+        return self.window(end - datetime.timedelta(days=days), end, transaction_type, category)
+
+    def month_to_date(self, transaction_type, category=None, today=None):
+        today = today or datetime.date.today()
+        return self.window(today.replace(day=1), today + datetime.timedelta(days=1), transaction_type, category)
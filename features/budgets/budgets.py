@@ -1,11 +1,17 @@
-import json
+import threading
+
 import questionary
 from rich.console import Console
 from rich.text import Text
 
-# In-memory budget storage
-budgets = {}
-BUDGETS_FILE = "database/budgets.txt"
+from features.storage.storage import current_ledger, get_storage
+from features.transactions.models import to_paisa
+
+# Shared in-memory budgets per ledger: ledger -> [data_version() they were read at, budgets dict].
+# Each dict is updated in place (never rebound), so every module holding the
+# dict from load_budgets() sees the current data.
+_ledger_budgets = {}
+_budgets_lock = threading.Lock()
 
 BUDGET_CATEGORIES = [
     "Food", "Transport", "Shopping", "Bills",
@@ -27,41 +33,57 @@ class Budget:
 
 # ============= STREAMLIT-COMPATIBLE VERSION =============
 def load_budgets():
-    """Loads budgets from file (Streamlit safe)."""
-    global budgets
-    try:
-        with open(BUDGETS_FILE, "r") as f:
-            data = json.load(f)
-            budgets = {b["category"]: Budget(b["category"], b["amount"]) for b in data}
-    except (FileNotFoundError, json.JSONDecodeError):
-        budgets = {}
-    except Exception:
-        budgets = {}
-
-
-def save_budgets():
-    """Saves budgets to file safely."""
+    """Returns the current ledger's shared budgets dict, re-reading storage only if it changed (Streamlit safe)."""
+    storage = get_storage()
+    version = storage.data_version()
+    cached = _ledger_budgets.setdefault(current_ledger(), [None, {}])
+    budgets = cached[1]
+    if version != cached[0]:
+        # Concurrent readers (see api.py) must not reload the shared dict at the same time
+        with _budgets_lock:
+            if version != cached[0]:
+                try:
+                    records = storage.load_budget_records()
+                except Exception:
+                    records = []
+                budgets.clear()
+                budgets.update({b["category"]: Budget(b["category"], b["amount"]) for b in records})
+                cached[0] = version
+    return budgets
+
+
+def save_budgets(budgets=None):
+    """Saves budgets (default: the current ledger's shared dict) to storage.
+
+    Raises whatever the storage write raised, so callers can report a failed save.
+    """
+    cached = _ledger_budgets.setdefault(current_ledger(), [None, {}])
+    if budgets is None:
+        budgets = cached[1]
+    storage = get_storage()
     try:
-        with open(BUDGETS_FILE, "w") as f:
-            json.dump([b.to_dict() for b in budgets.values()], f, indent=4)
+        storage.save_budget_records([b.to_dict() for b in budgets.values()])
     except Exception:
-        pass
+        # The shared dict may now hold budgets that were never written; re-read it next time
+        cached[0] = None
+        raise
+    # Only the shared dict is known to match what was just written
+    cached[0] = storage.data_version() if budgets is cached[1] else None
 
 
 # ============= CLI BUDGET FUNCTIONS =============
 def _validate_amount(text):
     try:
-        value = float(text)
-        if value <= 0:
+        if to_paisa(text) <= 0:
             return "Amount must be positive."
         return True
-    except:
+    except ValueError:
         return "Enter a valid number."
 
 
 def set_budget():
     console = Console()
-    load_budgets()
+    budgets = load_budgets()
 
     category = questionary.select(
         "Select category:",
@@ -79,17 +101,21 @@ def set_budget():
     if amount_str is None:
         return
 
-    amount = int(float(amount_str) * 100)
+    amount = to_paisa(amount_str)
 
     budgets[category] = Budget(category, amount)
-    save_budgets()
+    try:
+        save_budgets(budgets)
+    except Exception as e:
+        console.print(f"[bold red]Could not save budgets: {e}[/bold red]")
+        return
 
     console.print(f"[bold green]Budget set for {category}: Rs {amount / 100:.2f}[/bold green]")
 
 
 def view_budgets():
     console = Console()
-    load_budgets()
+    budgets = load_budgets()
 
     if not budgets:
         console.print("[yellow]No budgets set yet.[/yellow]")
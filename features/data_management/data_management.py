@@ -5,71 +5,96 @@ import json
 import os
 import shutil
 import glob
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from rich.console import Console
 from rich.panel import Panel
+from rich.progress import Progress
+from rich.table import Table
 from rich.text import Text
 
-from features.budgets.budgets import (
-    load_budgets as load_budgets_analytics,
-    budgets as budgets_analytics,
-)
+from features.budgets.budgets import load_budgets as load_budgets_analytics
 from features.smart_assistant.smart_assistant import generate_smart_recommendations
+from features.analytics.report_cache import get_report
 from features.transactions.transactions import (
     Transaction,
-    save_transactions,
-    TRANSACTIONS_FILE,
+    to_paisa,
+    load_transactions,
+    append_transactions,
+    compact_transactions,
+    query_transactions,
+    EXPENSE_CATEGORIES,
+    INCOME_CATEGORIES,
 )
+from features.data_management.exporters import export_transactions
 from features.budgets.budgets import BUDGET_CATEGORIES
+from features.storage.storage import get_storage
 
 console = Console()
 
 
-def export_transactions_csv():
-    load_transactions()
+def is_date_or_blank(text):
+    if text == "":
+        return True
+    try:
+        datetime.date.fromisoformat(text)
+        return True
+    except ValueError:
+        return "Please enter a date as YYYY-MM-DD, or leave blank."
 
-    if not transactions:
-        console.print(
-            Panel(
-                Text("No transactions to export.", style="bold yellow"),
-                border_style="yellow",
-            )
-        )
-        return
 
+def export_transactions_interactive(export_format, example_name):
+    """Prompts for a file name and filters, then streams matching transactions to disk."""
     file_name = questionary.text(
-        "Enter CSV file name (e.g., transactions.csv):", qmark="[?]"
+        f"Enter file name (e.g., {example_name}):", qmark="[?]"
     ).ask()
     if not file_name:
         console.print("[bold red]File name cannot be empty.[/bold red]")
         return
 
+    start_str = questionary.text(
+        "Export from date (YYYY-MM-DD) or leave blank for all:",
+        validate=is_date_or_blank,
+        qmark="[?]",
+    ).ask()
+    if start_str is None:
+        return
+    end_str = questionary.text(
+        "Export up to and including date (YYYY-MM-DD) or leave blank for all:",
+        validate=is_date_or_blank,
+        qmark="[?]",
+    ).ask()
+    if end_str is None:
+        return
+    category = questionary.select(
+        "Export which category?",
+        choices=["All Categories"] + EXPENSE_CATEGORIES + INCOME_CATEGORIES,
+        qmark="[?]",
+    ).ask()
+    if category is None:
+        return
+    compress = questionary.confirm("Compress with gzip?", default=False).ask()
+    if compress is None:
+        return
+
+    start = datetime.date.fromisoformat(start_str) if start_str else None
+    end = (
+        datetime.date.fromisoformat(end_str) + datetime.timedelta(days=1)
+        if end_str
+        else None
+    )
+    if category == "All Categories":
+        category = None
+    if compress and export_format != "parquet" and not file_name.endswith(".gz"):
+        file_name += ".gz"
+
     try:
-        with open(file_name, "w", newline="") as csvfile:
-            fieldnames = ["Date", "Type", "Category", "Description", "Amount"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            writer.writeheader()
-            for t in transactions:
-                writer.writerow(
-                    {
-                        "Date": t.date.isoformat(),
-                        "Type": t.type,
-                        "Category": t.category,
-                        "Description": t.description,
-                        "Amount": t.amount / 100,
-                    }
-                )
-        console.print(
-            Panel(
-                Text(
-                    f"Transactions exported successfully to [bold green]{file_name}[/bold green]",
-                    justify="center",
-                    style="bold green",
-                ),
-                border_style="green",
-            )
+        started = time.perf_counter()
+        count = export_transactions(
+            file_name, export_format, start, end, category, compress=compress
         )
+        elapsed = time.perf_counter() - started
     except Exception as e:
         console.print(
             Panel(
@@ -81,100 +106,62 @@ def export_transactions_csv():
                 border_style="red",
             )
         )
+        return
 
-
-def export_transactions_json():
-    load_transactions()
-
-    if not transactions:
+    if count == 0:
         console.print(
             Panel(
-                Text("No transactions to export.", style="bold yellow"),
+                Text("No transactions matched; wrote an empty export.", style="bold yellow"),
                 border_style="yellow",
             )
         )
         return
+    console.print(
+        Panel(
+            Text(
+                f"Exported {count} transactions to [bold green]{file_name}[/bold green] in {elapsed:.2f}s",
+                justify="center",
+                style="bold green",
+            ),
+            border_style="green",
+        )
+    )
 
-    file_name = questionary.text(
-        "Enter JSON file name (e.g., transactions.json):", qmark="[?]"
-    ).ask()
-    if not file_name:
-        console.print("[bold red]File name cannot be empty.[/bold red]")
-        return
 
-    try:
-        transactions_data = [t.to_dict() for t in transactions]
-        with open(file_name, "w") as jsonfile:
-            json.dump(transactions_data, jsonfile, indent=4)
-        console.print(
-            Panel(
-                Text(
-                    f"Transactions exported successfully to [bold green]{file_name}[/bold green]",
-                    justify="center",
-                    style="bold green",
-                ),
-                border_style="green",
-            )
-        )
-    except Exception as e:
-        console.print(
-            Panel(
-                Text(
-                    f"Error exporting transactions: [bold red]{e}[/bold red]",
-                    justify="center",
-                    style="bold red",
-                ),
-                border_style="red",
-            )
-        )
+def export_transactions_csv():
+    export_transactions_interactive("csv", "transactions.csv")
 
 
-def export_monthly_report():
-    load_transactions()
-    load_budgets_analytics(console)
-
-    report = {}
-    today = datetime.date.today()
-    current_month_start = today.replace(day=1)
-
-    report["transactions_current_month"] = [
-        t.to_dict() for t in transactions if t.date >= current_month_start
-    ]
-
-    budget_summary = {}
-    for category, budget_obj in budgets_analytics.items():
-        spent = sum(
-            t.amount
-            for t in transactions
-            if t.type == "Expense"
-            and t.category == category
-            and t.date >= current_month_start
-        )
-        budget_summary[category] = {
-            "budgeted": budget_obj.amount / 100,
-            "spent": spent / 100,
-            "remaining": (budget_obj.amount - spent) / 100,
-        }
-    report["budget_summary"] = budget_summary
-
-    total_income_cm = sum(
-        t.amount
-        for t in transactions
-        if t.type == "Income" and t.date >= current_month_start
-    )
-    total_expenses_cm = sum(
-        t.amount
-        for t in transactions
-        if t.type == "Expense" and t.date >= current_month_start
-    )
-    monthly_savings_cm = total_income_cm - total_expenses_cm
+def export_transactions_json():
+    export_transactions_interactive("json", "transactions.json")
+
+
+def export_transactions_jsonl():
+    export_transactions_interactive("jsonl", "transactions.jsonl")
+
+
+def export_transactions_parquet():
+    export_transactions_interactive("parquet", "transactions.parquet")
+
 
-    report["analytics_summary"] = {
-        "total_income": total_income_cm / 100,
-        "total_expenses": total_expenses_cm / 100,
-        "monthly_savings": monthly_savings_cm / 100,
+def build_monthly_report(today=None):
+    """Returns the current month's transactions, budget status and totals as a JSON-ready dict."""
+    summary = get_report("comprehensive", today)
+    current_month_start = summary.today.replace(day=1)
+    return {
+        "transactions_current_month": [t.to_dict() for t in query_transactions(start=current_month_start)],
+        "budget_summary": {status.category: status.to_dict() for status in summary.budgets},
+        "analytics_summary": {
+            "total_income": summary.income / 100,
+            "total_expenses": summary.expenses / 100,
+            "monthly_savings": summary.savings / 100,
+        },
     }
 
+
+def export_monthly_report():
+    report = build_monthly_report()
+
     file_name = questionary.text(
         "Enter JSON file name for monthly report (e.g., monthly_report.json):",
         qmark="[?]",
@@ -209,6 +196,80 @@ def export_monthly_report():
         )
 
 
+IMPORT_COLUMNS = ["Date", "Type", "Category", "Description", "Amount"]
+# Imported rows are written to storage in batches of this size
+IMPORT_BATCH_SIZE = 5000
+# Row errors printed after an import; the rest are only counted
+MAX_SHOWN_ERRORS = 20
+
+
+def iter_csv_transactions(file_name, on_error=None):
+    """Lazily parses a CSV file, yielding one Transaction per valid row."""
+    with open(file_name, "r", newline="") as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            if not all(k in row for k in IMPORT_COLUMNS):
+                if on_error:
+                    on_error(f"Skipping row due to missing columns: {row}")
+                continue
+            try:
+                date = datetime.datetime.fromisoformat(row["Date"]).date()
+                amount = to_paisa(row["Amount"])
+                yield Transaction(
+                    date, row["Type"], row["Category"], row["Description"], amount
+                )
+            except (ValueError, TypeError) as ve:
+                if on_error:
+                    on_error(
+                        f"Skipping row due to data conversion error: {row} - {ve}"
+                    )
+                continue
+
+
+def transaction_key(t):
+    """Duplicate-detection key: same date, type, category and amount."""
+    return (t.date.toordinal(), t.type, t.category, t.amount)
+
+
+def import_transactions(new_transactions, batch_size=IMPORT_BATCH_SIZE):
+    """Streams transactions into storage in bounded batches, skipping duplicates.
+
+    Duplicates are found with a hash set of (date, type, category, amount)
+    keys seeded from the stored transactions, so each row costs O(1) to check.
+    Returns (imported, duplicates).
+    """
+    seen = load_transactions().duplicate_keys()
+    imported = duplicates = 0
+    batch = []
+    for t in new_transactions:
+        key = transaction_key(t)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        batch.append(t)
+        if len(batch) >= batch_size:
+            append_transactions(batch, compact=False)
+            imported += len(batch)
+            batch = []
+    if batch:
+        append_transactions(batch, compact=False)
+        imported += len(batch)
+
+    # Fold the batches into the main data file with a single save
+    compact_transactions()
+    return imported, duplicates
+
+
+def print_row_errors(errors, limit=MAX_SHOWN_ERRORS):
+    """Prints the first limit row errors of an import and how many more there were."""
+    for message in errors[:limit]:
+        # Messages quote the row, which is file content rather than rich markup
+        console.print(Text(message, style="red"))
+    if len(errors) > limit:
+        console.print(f"[red]... and {len(errors) - limit} more skipped rows.[/red]")
+
+
 def import_transactions_csv():
     file_name = questionary.text(
         "Enter CSV file name to import (e.g., transactions.csv):", qmark="[?]"
@@ -216,99 +277,132 @@ def import_transactions_csv():
     if not file_name:
         console.print("[bold red]File name cannot be empty.[/bold red]")
         return
+    if not os.path.isfile(file_name):
+        console.print(
+            Panel(
+                Text(f"File not found: {file_name}", justify="center", style="bold red"),
+                border_style="red",
+            )
+        )
+        return
 
-    try:
-        new_transactions = []
-        with open(file_name, "r") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                if not all(
-                    k in row
-                    for k in ["Date", "Type", "Category", "Description", "Amount"]
-                ):
-                    console.print(
-                        f"[bold red]Skipping row due to missing columns: {row}[/bold red]"
-                    )
-                    continue
-                try:
-                    date = datetime.datetime.fromisoformat(row["Date"]).date()
-                    amount = int(float(row["Amount"]) * 100)
-                    transaction_type = row["Type"]
-                    category = row["Category"]
-                    description = row["Description"]
-                    new_transactions.append(
-                        Transaction(
-                            date, transaction_type, category, description, amount
-                        )
-                    )
-                except ValueError as ve:
-                    console.print(
-                        f"[bold red]Skipping row due to data conversion error: {row} - {ve}[/bold red]"
-                    )
-                    continue
+    confirm = questionary.confirm(
+        f"Do you want to import the transactions in {file_name}?"
+    ).ask()
+    if not confirm:
+        console.print("[bold yellow]Import cancelled.[/bold yellow]")
+        return
 
-        if not new_transactions:
-            console.print(
-                Panel(
-                    Text(
-                        "No valid transactions found in CSV to import.",
-                        style="bold yellow",
-                    ),
-                    border_style="yellow",
-                )
+    # One pass: rows are parsed, deduplicated and stored as they stream in
+    errors = []
+    try:
+        started = time.perf_counter()
+        imported_count, duplicate_count = import_transactions(
+            iter_csv_transactions(file_name, on_error=errors.append)
+        )
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        console.print(
+            Panel(
+                Text(f"Error importing transactions: {e}", justify="center", style="bold red"),
+                border_style="red",
             )
-            return
+        )
+        return
 
+    print_row_errors(errors)
+    valid_count = imported_count + duplicate_count
+    if not valid_count:
         console.print(
-            f"\n[bold blue]{len(new_transactions)} new transactions found in {file_name}.[/bold blue]"
+            Panel(
+                Text(
+                    "No valid transactions found in CSV to import.",
+                    style="bold yellow",
+                ),
+                border_style="yellow",
+            )
         )
-        confirm = questionary.confirm(
-            "Do you want to import these transactions?"
-        ).ask()
+        return
+
+    rows_per_sec = valid_count / elapsed if elapsed > 0 else float(valid_count)
+    console.print(
+        Panel(
+            Text(
+                f"Successfully imported {imported_count} new transactions "
+                f"({duplicate_count} duplicates, {len(errors)} invalid rows skipped) in {elapsed:.2f}s "
+                f"- {rows_per_sec:,.0f} rows/sec.",
+                justify="center",
+                style="bold green",
+            ),
+            border_style="green",
+        )
+    )
+
+
+def parse_csv_file(file_name):
+    """Parses one CSV file (runs in a worker process); returns (transactions, row errors)."""
+    errors = []
+    file_transactions = list(iter_csv_transactions(file_name, on_error=errors.append))
+    return file_transactions, errors
 
-        if confirm:
-            load_transactions()
-            initial_count = len(transactions)
-            for new_t in new_transactions:
-                duplicate = any(
-                    (
-                        new_t.date == t.date
-                        and new_t.type == t.type
-                        and new_t.category == t.category
-                        and new_t.amount == t.amount
-                    )
-                    for t in transactions
-                )
-                if not duplicate:
-                    transactions.append(new_t)
-
-            save_transactions()
-            imported_count = len(transactions) - initial_count
-
-            console.print(
-                Panel(
-                    Text(
-                        f"Successfully imported [bold green]{imported_count}[/bold green] new transactions.",
-                        justify="center",
-                        style="bold green",
-                    ),
-                    border_style="green",
-                )
-            )
-        else:
-            console.print("[bold yellow]Import cancelled.[/bold yellow]")
 
-    except FileNotFoundError:
+def resolve_import_files(pattern):
+    """Expands a directory (all *.csv inside it) or a glob pattern into CSV file names."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.csv")
+    return sorted(glob.glob(pattern))
+
+
+def bulk_import_transactions_csv():
+    pattern = questionary.text(
+        "Enter a directory or glob pattern to import (e.g., statements/*.csv):",
+        qmark="[?]",
+    ).ask()
+    if not pattern:
+        console.print("[bold red]Pattern cannot be empty.[/bold red]")
+        return
+
+    files = resolve_import_files(pattern)
+    if not files:
         console.print(
             Panel(
-                Text(
-                    f"[bold red]File not found: {file_name}[/bold red]",
-                    justify="center",
-                    style="bold red",
-                ),
-                border_style="red",
+                Text(f"No CSV files matched {pattern}.", style="bold yellow"),
+                border_style="yellow",
             )
         )
+        return
+
+    console.print(f"\n[bold blue]{len(files)} CSV files matched {pattern}.[/bold blue]")
+    confirm = questionary.confirm("Do you want to import these files?").ask()
+    if not confirm:
+        console.print("[bold yellow]Import cancelled.[/bold yellow]")
+        return
+
+    file_results = {}  # file name -> (valid rows, row errors, file error)
+
+    def parsed_transactions(progress, task):
+        # Files are parsed in parallel; results stream into the single dedup/commit stage as they finish
+        with ProcessPoolExecutor() as pool:
+            futures = {pool.submit(parse_csv_file, f): f for f in files}
+            for future in as_completed(futures):
+                file_name = futures[future]
+                progress.advance(task)
+                try:
+                    file_transactions, errors = future.result()
+                except Exception as e:
+                    file_results[file_name] = (0, [], str(e))
+                    continue
+                file_results[file_name] = (len(file_transactions), errors, None)
+                yield from file_transactions
+
+    try:
+        started = time.perf_counter()
+        with Progress(console=console) as progress:
+            task = progress.add_task("Parsing CSV files", total=len(files))
+            imported_count, duplicate_count = import_transactions(
+                parsed_transactions(progress, task)
+            )
+        elapsed = time.perf_counter() - started
     except Exception as e:
         console.print(
             Panel(
@@ -320,6 +414,35 @@ def import_transactions_csv():
                 border_style="red",
             )
         )
+        return
+
+    table = Table(title="Bulk Import Summary")
+    table.add_column("File", style="cyan")
+    table.add_column("Valid Rows", justify="right")
+    table.add_column("Skipped Rows", justify="right", style="yellow")
+    table.add_column("Error", style="red")
+    row_errors = []
+    for file_name in files:
+        valid, errors, file_error = file_results.get(file_name, (0, [], "Not processed"))
+        table.add_row(file_name, str(valid), str(len(errors)), file_error or "")
+        row_errors += [f"{file_name}: {message}" for message in errors]
+    console.print(table)
+    print_row_errors(row_errors)
+
+    total_rows = sum(valid for valid, _, _ in file_results.values())
+    rows_per_sec = total_rows / elapsed if elapsed > 0 else float(total_rows)
+    console.print(
+        Panel(
+            Text(
+                f"Imported {imported_count} new transactions from {len(files)} files "
+                f"({duplicate_count} duplicates skipped) in {elapsed:.2f}s "
+                f"- {rows_per_sec:,.0f} rows/sec.",
+                justify="center",
+                style="bold green",
+            ),
+            border_style="green",
+        )
+    )
 
 
 def backup_data():
@@ -341,10 +464,9 @@ def backup_data():
         temp_source = os.path.join(backup_dir, f"temp_{timestamp}")
         os.makedirs(temp_source, exist_ok=True)
 
-        shutil.copy("database/transactions.txt", temp_source)
-        shutil.copy("database/budgets.txt", temp_source)
-        if os.path.exists("database/goals.txt"):
-            shutil.copy("database/goals.txt", temp_source)
+        for data_file in get_storage().data_files():
+            if os.path.exists(data_file):
+                shutil.copy(data_file, temp_source)
 
         shutil.make_archive(backup_path, "zip", temp_source)
         shutil.rmtree(temp_source)
@@ -396,8 +518,7 @@ def data_validation():
     issues = []
 
     # Validate Transactions
-    load_transactions()
-    for i, t in enumerate(transactions):
+    for i, t in enumerate(load_transactions()):
         if not all([t.date, t.type, t.category, t.description, t.amount is not None]):
             issues.append(f"Transaction {i+1}: Missing fields")
 
@@ -408,8 +529,7 @@ def data_validation():
             issues.append(f"Transaction {i+1}: Unknown expense category {t.category}")
 
     # Validate Budgets
-    load_budgets_analytics(console) # Pass console
-    for category, budget_obj in budgets_analytics.items(): # Use budgets_analytics
+    for category, budget_obj in load_budgets_analytics().items():
         if not all([budget_obj.category, budget_obj.amount is not None]):
             issues.append(f"Budget for '{category}': Missing fields")
         if not isinstance(budget_obj.amount, int):
@@ -450,8 +570,11 @@ def display_data_management_menu():
             choices=[
                 "Export Transactions (CSV)",
                 "Export Transactions (JSON)",
+                "Export Transactions (JSON Lines)",
+                "Export Transactions (Parquet)",
                 "Export Monthly Report",
                 "Import Transactions (CSV)",
+                "Bulk Import Transactions (CSV)",
                 "Backup Data",
                 "Data Validation",
                 "Back to Main Menu",
@@ -462,10 +585,16 @@ def display_data_management_menu():
             export_transactions_csv()
         elif choice == "Export Transactions (JSON)":
             export_transactions_json()
+        elif choice == "Export Transactions (JSON Lines)":
+            export_transactions_jsonl()
+        elif choice == "Export Transactions (Parquet)":
+            export_transactions_parquet()
         elif choice == "Export Monthly Report":
             export_monthly_report()
         elif choice == "Import Transactions (CSV)":
             import_transactions_csv()
+        elif choice == "Bulk Import Transactions (CSV)":
+            bulk_import_transactions_csv()
         elif choice == "Backup Data":
             backup_data()
         elif choice == "Data Validation":
@@ -0,0 +1,107 @@
+import csv
+import gzip
+import json
+
+from features.transactions.transactions import iter_transaction_chunks
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is optional
+    pyarrow = None
+
+EXPORT_CHUNK_SIZE = 5000
+EXPORT_FORMATS = ("csv", "json", "jsonl", "parquet")
+CSV_FIELDNAMES = ["Date", "Type", "Category", "Description", "Amount"]
+
+
+def open_export_file(file_name, compress=False):
+    """Opens file_name for text writing, through gzip when compress is set."""
+    if compress:
+        return gzip.open(file_name, "wt", newline="", encoding="utf-8")
+    return open(file_name, "w", newline="", encoding="utf-8")
+
+
+def write_csv(chunks, file_name, compress=False):
+    count = 0
+    with open_export_file(file_name, compress) as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDNAMES)
+        for chunk in chunks:
+            writer.writerows(
+                (t.date.isoformat(), t.type, t.category, t.description, t.amount / 100)
+                for t in chunk
+            )
+            count += len(chunk)
+    return count
+
+
+def write_jsonl(chunks, file_name, compress=False):
+    count = 0
+    with open_export_file(file_name, compress) as f:
+        for chunk in chunks:
+            f.write("".join(json.dumps(t.to_dict()) + "\n" for t in chunk))
+            count += len(chunk)
+    return count
+
+
+def write_json(chunks, file_name, compress=False):
+    """Writes a JSON array one chunk at a time instead of building the whole list first."""
+    count = 0
+    with open_export_file(file_name, compress) as f:
+        f.write("[")
+        for chunk in chunks:
+            for t in chunk:
+                f.write(",\n    " if count else "\n    ")
+                f.write(json.dumps(t.to_dict()))
+                count += 1
+        f.write("\n]\n" if count else "]\n")
+    return count
+
+
+def write_parquet(chunks, file_name, compress=False):
+    """Writes one Parquet row group per chunk (requires pyarrow)."""
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow).")
+    schema = pyarrow.schema([
+        ("date", pyarrow.date32()),
+        ("type", pyarrow.string()),
+        ("category", pyarrow.string()),
+        ("description", pyarrow.string()),
+        ("amount", pyarrow.int64()),
+    ])
+    count = 0
+    compression = "gzip" if compress else "snappy"
+    with pyarrow.parquet.ParquetWriter(file_name, schema, compression=compression) as writer:
+        for chunk in chunks:
+            writer.write_table(pyarrow.table({
+                "date": [t.date for t in chunk],
+                "type": [t.type for t in chunk],
+                "category": [t.category for t in chunk],
+                "description": [t.description for t in chunk],
+                "amount": [t.amount for t in chunk],
+            }, schema=schema))
+            count += len(chunk)
+    return count
+
+
+WRITERS = {
+    "csv": write_csv,
+    "json": write_json,
+    "jsonl": write_jsonl,
+    "parquet": write_parquet,
+}
+
+
+def export_transactions(file_name, export_format, start=None, end=None, category=None,
+                        transaction_type=None, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """Streams matching transactions (start <= date < end) to file_name; returns the row count.
+
+    Filters are pushed down to the repository, and only one chunk of rows is
+    held at a time. With compress, text formats are gzipped and Parquet uses
+    its gzip codec.
+    """
+    if export_format not in WRITERS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    chunks = iter_transaction_chunks(start, end, transaction_type, category, chunk_size)
+    return WRITERS[export_format](chunks, file_name, compress)
@@ -0,0 +1,132 @@
+"""Headless smart assistant reports.
+
+Each compute_* function evaluates the rules against one FinancialSnapshot
+and returns a plain result object; smart_assistant.py renders them.
+"""
+import datetime
+
+from features.smart_assistant.rules import FinancialSnapshot, evaluate, RECOMMENDATION, ALERT, OPPORTUNITY, REMINDER
+from features.transactions.transactions import rolling_totals
+
+# Share of spending the savings estimate assumes can be cut from each of the top categories
+REDUCTION_SHARE = 0.10
+# Categories left out of the savings estimate
+ESSENTIAL_CATEGORIES = ("Bills", "Health")
+
+
+def same_day_last_month(day):
+    """The same day of the previous month, clamped to that month's last day."""
+    last_month_end = day.replace(day=1) - datetime.timedelta(days=1)
+    return last_month_end.replace(day=min(day.day, last_month_end.day))
+
+
+class DailyCheck:
+    def __init__(self, today, todays_expenses, daily_budget, last_7_days, previous_7_days,
+                 last_month_day, last_month_day_expenses, alerts):
+        self.today = today
+        self.todays_expenses = todays_expenses
+        self.daily_budget = daily_budget  # average per day of this month's budgets
+        self.last_7_days = last_7_days
+        self.previous_7_days = previous_7_days
+        self.last_month_day = last_month_day
+        self.last_month_day_expenses = last_month_day_expenses
+        self.alerts = alerts
+
+    @property
+    def remaining(self):
+        return self.daily_budget - self.todays_expenses
+
+    def to_dict(self):
+        return {
+            "date": self.today.isoformat(),
+            "todays_expenses": self.todays_expenses / 100,
+            "daily_budget": self.daily_budget / 100,
+            "remaining": self.remaining / 100,
+            "last_7_days": self.last_7_days / 100,
+            "previous_7_days": self.previous_7_days / 100,
+            "same_day_last_month": self.last_month_day_expenses / 100,
+            "alerts": self.alerts,
+        }
+
+
+def compute_daily_check(today=None):
+    snapshot = FinancialSnapshot(today)
+    last_month_day = same_day_last_month(snapshot.today)
+    return DailyCheck(
+        snapshot.today,
+        snapshot.todays_expenses,
+        snapshot.avg_daily_budget,
+        snapshot.last_7_days,
+        snapshot.previous_7_days,
+        last_month_day,
+        rolling_totals().last_days(1, "Expense", today=last_month_day),
+        evaluate(snapshot, kinds=(ALERT,))[ALERT]
+    )
+
+
+class Recommendations:
+    def __init__(self, today, messages):
+        self.today = today
+        self.messages = messages
+
+    def to_dict(self):
+        return {"date": self.today.isoformat(), "recommendations": self.messages}
+
+
+def compute_recommendations(today=None):
+    snapshot = FinancialSnapshot(today)
+    return Recommendations(snapshot.today, evaluate(snapshot, kinds=(RECOMMENDATION,))[RECOMMENDATION])
+
+
+class SpendingAlerts:
+    def __init__(self, today, alerts, reminders):
+        self.today = today
+        self.alerts = alerts
+        self.reminders = reminders  # upcoming or overdue recurring bills
+
+    def to_dict(self):
+        return {"date": self.today.isoformat(), "alerts": self.alerts, "reminders": self.reminders}
+
+
+def compute_spending_alerts(today=None):
+    snapshot = FinancialSnapshot(today)
+    findings = evaluate(snapshot, kinds=(ALERT, REMINDER))
+    return SpendingAlerts(snapshot.today, findings[ALERT], findings[REMINDER])
+
+
+class SavingsOpportunities:
+    def __init__(self, today, has_expenses, opportunities, reductions):
+        self.today = today
+        self.has_expenses = has_expenses  # any expense this month
+        self.opportunities = opportunities
+        self.reductions = reductions  # [(category, possible monthly saving)]
+
+    @property
+    def potential(self):
+        return sum(amount for _, amount in self.reductions)
+
+    def to_dict(self):
+        return {
+            "date": self.today.isoformat(),
+            "opportunities": self.opportunities,
+            "reductions": {category: amount / 100 for category, amount in self.reductions},
+            "potential": self.potential / 100,
+        }
+
+
+def compute_savings_opportunities(today=None):
+    snapshot = FinancialSnapshot(today)
+    spending = snapshot.category_spending
+    if not spending:
+        return SavingsOpportunities(snapshot.today, False, [], [])
+    # Simple estimation: cut the two highest non-essential categories by REDUCTION_SHARE
+    top = sorted(
+        ((category, amount) for category, amount in spending.items() if category not in ESSENTIAL_CATEGORIES),
+        key=lambda item: item[1], reverse=True
+    )[:2]
+    return SavingsOpportunities(
+        snapshot.today,
+        True,
+        evaluate(snapshot, kinds=(OPPORTUNITY,))[OPPORTUNITY],
+        [(category, amount * REDUCTION_SHARE) for category, amount in top]
+    )
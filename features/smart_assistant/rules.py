@@ -0,0 +1,200 @@
+import datetime
+from functools import cached_property
+
+from features.transactions.transactions import query_transactions, recurring_bills, rolling_totals, spending_anomalies
+from features.budgets.budgets import load_budgets
+
+RECOMMENDATION = "recommendation"
+ALERT = "alert"
+OPPORTUNITY = "opportunity"
+REMINDER = "reminder"
+RULE_KINDS = (RECOMMENDATION, ALERT, OPPORTUNITY, REMINDER)
+
+
+class FinancialSnapshot:
+    """Everything the rules read, computed once per evaluation.
+
+    Month figures are month to date, read from the rolling prefix sums, so
+    building a snapshot does not scan transactions. Large expenses, outliers
+    and recurring bills are only fetched if a rule asks for them.
+    """
+
+    def __init__(self, today=None):
+        self.today = today or datetime.date.today()
+        self.month_start = self.today.replace(day=1)
+        self.tomorrow = self.today + datetime.timedelta(days=1)
+        rolling = rolling_totals()
+
+        self.budgets = {category: b.amount for category, b in load_budgets().items()}
+        self.total_budget = sum(self.budgets.values())
+        self.income = rolling.month_to_date("Income", today=self.today)
+        self.expenses = rolling.month_to_date("Expense", today=self.today)
+        self.savings = self.income - self.expenses
+        self.savings_rate = (self.savings / self.income) * 100 if self.income > 0 else 0
+        self.category_spending = rolling.by_category(self.month_start, self.tomorrow, "Expense")
+
+        self.todays_expenses = rolling.last_days(1, "Expense", today=self.today)
+        self.last_7_days = rolling.last_days(7, "Expense", today=self.today)
+        self.previous_7_days = rolling.last_days(7, "Expense", today=self.today - datetime.timedelta(days=7))
+        days_in_month = ((self.month_start + datetime.timedelta(days=32)).replace(day=1) - self.month_start).days
+        self.avg_daily_budget = self.total_budget / days_in_month
+
+    @cached_property
+    def month_expenses(self):
+        """This month's expense transactions, newest first."""
+        return query_transactions(self.month_start, self.tomorrow, "Expense", newest_first=True)
+
+    @cached_property
+    def unusual_expenses(self):
+        """This month's expenses flagged as outliers for their category, as [(transaction, z-score)]."""
+        return spending_anomalies().unusual(self.month_start, self.tomorrow)
+
+    @cached_property
+    def recurring_bills(self):
+        """Active recurring bills, soonest due first."""
+        return recurring_bills(self.today)
+
+
+class Rule:
+    def __init__(self, name, kind, check, thresholds):
+        self.name = name
+        self.kind = kind
+        self.check = check
+        self.thresholds = thresholds
+
+
+# Registered rules, evaluated in registration order
+RULES = []
+
+
+def rule(kind, **thresholds):
+    """Registers the decorated function as a rule.
+
+    The function receives the snapshot plus the thresholds as keyword
+    arguments and yields finding messages.
+    """
+    def register(check):
+        RULES.append(Rule(check.__name__, kind, check, thresholds))
+        return check
+    return register
+
+
+def evaluate(snapshot, kinds=RULE_KINDS):
+    """Runs every registered rule of the given kinds against one snapshot.
+
+    Returns {kind: [messages]}.
+    """
+    findings = {kind: [] for kind in kinds}
+    for r in RULES:
+        if r.kind in findings:
+            findings[r.kind].extend(r.check(snapshot, **r.thresholds))
+    return findings
+
+
+# ============= RECOMMENDATIONS =============
+@rule(RECOMMENDATION, min_savings_rate=10)
+def low_savings_rate(s, min_savings_rate):
+    if s.savings_rate < min_savings_rate and s.income > 0:
+        yield "Low savings rate. Try to save at least 10-20% of your income."
+        yield "Consider the 50/30/20 rule: 50% for needs, 30% for wants, 20% for savings/debt."
+
+
+@rule(RECOMMENDATION, over_ratio=1.1, near_ratio=0.9)
+def category_budget_status(s, over_ratio, near_ratio):
+    for category, spent in s.category_spending.items():
+        budget = s.budgets.get(category)
+        if budget is not None and budget > 0:
+            if spent > budget * over_ratio:
+                yield f"You are overspending in '{category}'. Consider reducing spending in this area."
+            elif spent > budget * near_ratio:
+                yield f"You are close to your budget limit in '{category}'. Be mindful of spending."
+        elif budget is None and spent > 0:
+            yield f"Consider setting a budget for '{category}' as you have significant spending there."
+
+
+@rule(RECOMMENDATION)
+def no_budgets(s):
+    if not s.budgets:
+        yield "No budgets set. Setting budgets can help you control your spending."
+
+
+@rule(RECOMMENDATION, min_savings_rate=20)
+def strong_performance(s, min_savings_rate):
+    within_budgets = all(
+        spent <= s.budgets[category] for category, spent in s.category_spending.items() if category in s.budgets
+    )
+    if s.savings_rate >= min_savings_rate and within_budgets:
+        yield "Excellent financial performance! Consider increasing your savings goals or exploring investments."
+
+
+# ============= ALERTS =============
+@rule(ALERT, alert_pct=100, warning_pct=80)
+def budget_utilization(s, alert_pct, warning_pct):
+    for category, budget in s.budgets.items():
+        if budget <= 0:
+            continue
+        spent = s.category_spending.get(category, 0)
+        utilization = (spent / budget) * 100
+        if utilization >= alert_pct:
+            yield f"⚠️  Budget ALERT: '{category}' is {utilization:.0f}% used! (Spent: {spent / 100:.2f}, Budget: {budget / 100:.2f})"
+        elif utilization >= warning_pct:
+            yield f"🔔 Budget WARNING: '{category}' is {utilization:.0f}% used. Approaching limit! (Spent: {spent / 100:.2f}, Budget: {budget / 100:.2f})"
+
+
+@rule(ALERT, income_share=0.20)
+def large_transactions(s, income_share):
+    threshold = s.income * income_share
+    if threshold <= 0:
+        return
+    for t in s.month_expenses:
+        if t.amount >= threshold:
+            yield f"⚡ Large Transaction ALERT: Expense of {t.amount / 100:.2f} in '{t.category}' on {t.date.strftime('%Y-%m-%d')}."
+
+
+@rule(ALERT)
+def over_daily_budget(s):
+    if s.avg_daily_budget > 0 and s.todays_expenses > s.avg_daily_budget:
+        yield f"📅 Today's spending ({s.todays_expenses / 100:.2f}) is above your average daily budget ({s.avg_daily_budget / 100:.2f})."
+
+
+@rule(ALERT, increase_ratio=1.25)
+def weekly_spending_jump(s, increase_ratio):
+    if s.previous_7_days > 0 and s.last_7_days > s.previous_7_days * increase_ratio:
+        increase = (s.last_7_days / s.previous_7_days - 1) * 100
+        yield f"📈 You spent {increase:.0f}% more in the last 7 days than in the 7 days before."
+
+
+@rule(ALERT, max_shown=5)
+def unusual_spending(s, max_shown):
+    for t, z in s.unusual_expenses[:max_shown]:
+        yield (f"🔍 Unusual Spending: {t.amount / 100:.2f} in '{t.category}' on {t.date.strftime('%Y-%m-%d')} "
+               f"is far above your usual '{t.category}' expense (z-score {z:.1f}).")
+
+
+# ============= SAVINGS OPPORTUNITIES =============
+@rule(OPPORTUNITY, high_share=0.15)
+def reducible_categories(s, high_share):
+    total = sum(s.category_spending.values())
+    for category, spent in sorted(s.category_spending.items(), key=lambda item: item[1], reverse=True):
+        budget = s.budgets.get(category, 0)
+        if budget > 0 and spent > budget:
+            yield f"- '{category}': You are over budget by {(spent - budget) / 100:.2f}. Consider reducing this amount."
+        elif spent > total * high_share:
+            yield f"- '{category}': High spending ({spent / 100:.2f}). Is there a way to cut back here?"
+
+
+# ============= BILL REMINDERS =============
+@rule(REMINDER, days_ahead=7)
+def upcoming_bills(s, days_ahead):
+    for bill in s.recurring_bills:
+        days_left = (bill.next_due - s.today).days
+        if days_left > days_ahead:
+            break
+        name = bill.description or bill.category
+        due = bill.next_due.strftime('%Y-%m-%d')
+        if days_left < 0:
+            yield f"⏰ '{name}' ({bill.frequency}, ~{bill.amount / 100:.2f}) was due on {due} and has not been recorded yet."
+        elif days_left == 0:
+            yield f"⏰ '{name}' ({bill.frequency}, ~{bill.amount / 100:.2f}) is due today."
+        else:
+            yield f"📆 '{name}' ({bill.frequency}, ~{bill.amount / 100:.2f}) is due in {days_left} day(s), on {due}."
@@ -0,0 +1,137 @@
+"""Coordination between processes sharing the JSON database files.
+
+Writers serialize on an advisory fcntl lock and replace whole files
+atomically, so any single file is always either its old or its new version.
+Readers never take the lock: a sequence number, odd while a write is in
+progress, tells them whether the files they read changed underneath them
+(a seqlock), in which case they simply read again.
+"""
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
+
+# Optimistic reads attempted before a reader waits for the lock instead
+READ_RETRIES = 20
+
+
+def atomic_write(path, text, durable=True):
+    """Replaces path with text via a temp file in the same directory and os.replace().
+
+    Readers see either the old or the new contents, never a truncated file.
+    With durable=True the data is fsynced before the rename.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class WriterLock:
+    """Exclusive inter-process write lock plus the seqlock sequence readers check.
+
+    Reentrant within a process (a save that compacts and then updates the
+    rollup takes it once), and safe across threads.
+    """
+
+    def __init__(self, lock_file, sequence_file):
+        self.lock_file = lock_file
+        self.sequence_file = sequence_file
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._owner = None  # thread holding the lock
+        self._file = None
+
+    def sequence(self):
+        """Returns the current sequence number (0 before the first write)."""
+        try:
+            with open(self.sequence_file, "r") as f:
+                return int(f.read() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _set_sequence(self, value):
+        # Not fsynced: after a crash only its parity matters, and __enter__ repairs that
+        atomic_write(self.sequence_file, str(value), durable=False)
+
+    def _flock(self, operation):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.lock_file) or ".", exist_ok=True)
+            self._file = open(self.lock_file, "a")
+        if fcntl is not None:
+            fcntl.flock(self._file, operation)
+
+    def _unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._flock(fcntl.LOCK_EX if fcntl else None)
+                sequence = self.sequence()
+                # Always lands on an odd number, even if a crashed writer left one behind
+                self._set_sequence(sequence + 1 if sequence % 2 == 0 else sequence + 2)
+                self._owner = threading.get_ident()
+            except BaseException:
+                if self._file is not None:
+                    self._unlock()
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        try:
+            if self._depth == 0:
+                self._owner = None
+                try:
+                    self._set_sequence(self.sequence() + 1)
+                finally:
+                    self._unlock()
+        finally:
+            self._thread_lock.release()
+
+    def read_consistent(self, read):
+        """Returns read() computed while no write was in progress.
+
+        Retries while the sequence is odd or moves during the read, so readers
+        never block writers. If writers keep the files busy (or one died
+        mid-write), it falls back to reading under the write lock, which also
+        puts a sequence left odd by a dead writer back to even.
+        """
+        if self._owner == threading.get_ident():
+            # Called from inside this thread's own write; nothing else can be writing
+            return read()
+
+        for attempt in range(READ_RETRIES):
+            before = self.sequence()
+            if before % 2 == 0:
+                result = read()
+                if self.sequence() == before:
+                    return result
+            time.sleep(min(0.001 * 2 ** attempt, 0.05))
+
+        with self:
+            return read()
@@ -0,0 +1,56 @@
+"""One-shot import of the JSON database files into the SQLite backend.
+
+Run from the project root:
+
+    python -m features.storage.migrate
+
+Once database/finance.db exists it is picked up automatically; set
+FINANCE_TRACKER_STORAGE=json to keep using the text files. To migrate
+another ledger, set FINANCE_TRACKER_LEDGER=<name>.
+"""
+import os
+import sqlite3
+
+from rich.console import Console
+
+from features.storage.storage import (
+    JsonStorage, SqliteStorage, SQLITE_FILE, TRANSACTION_COLUMNS, current_ledger, ledger_directory
+)
+
+console = Console()
+
+
+def migrate_json_to_sqlite(sqlite_path=SQLITE_FILE, source=None):
+    """Copies transactions, budgets and goals from the JSON files into SQLite."""
+    source = source or JsonStorage()
+    target = SqliteStorage(sqlite_path)
+
+    migrated, skipped = 0, []
+    with target.connection:
+        target.connection.execute("DELETE FROM transactions")
+        for i, record in enumerate(source.load_transaction_records()):
+            try:
+                target.connection.execute(
+                    "INSERT INTO transactions (date, type, category, description, amount) VALUES (?, ?, ?, ?, ?)",
+                    tuple(record[c] for c in TRANSACTION_COLUMNS)
+                )
+                migrated += 1
+            except (KeyError, OverflowError, sqlite3.Error) as e:
+                skipped.append(f"Transaction {i+1}: {e}")
+        target.rebuild_rollup()
+        target.rebuild_recurring()
+
+    target.save_budget_records(source.load_budget_records())
+    target.save_goals(source.load_goals())
+    return migrated, skipped
+
+
+if __name__ == "__main__":
+    directory = ledger_directory(current_ledger())
+    sqlite_file = os.path.join(directory, os.path.basename(SQLITE_FILE))
+    if os.path.exists(sqlite_file):
+        console.print(f"[bold yellow]{sqlite_file} already exists, its contents will be replaced.[/bold yellow]")
+    migrated, skipped = migrate_json_to_sqlite(sqlite_file, JsonStorage.in_directory(directory))
+    console.print(f"[bold green]Migrated {migrated} transactions into {sqlite_file}.[/bold green]")
+    for issue in skipped:
+        console.print(f"[bold red]Skipped {issue}[/bold red]")
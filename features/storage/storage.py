@@ -0,0 +1,821 @@
+import contextvars
+import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from bisect import insort
+from contextlib import contextmanager
+
+from features.storage.locking import WriterLock, atomic_write
+
+# Storage locations
+DATABASE_DIR = "database"
+TRANSACTIONS_FILE = os.path.join(DATABASE_DIR, "transactions.txt")
+# Append-only log of transactions added since the last snapshot (one JSON record per line)
+TRANSACTIONS_LOG_FILE = os.path.join(DATABASE_DIR, "transactions.log")
+BUDGETS_FILE = os.path.join(DATABASE_DIR, "budgets.txt")
+GOALS_FILE = os.path.join(DATABASE_DIR, "goals.txt")
+# Per-(year, month, type, category) totals kept in step with the transaction files
+ROLLUP_FILE = os.path.join(DATABASE_DIR, "rollup.txt")
+# Recurring-payment groups, likewise kept in step with the transaction files
+RECURRING_FILE = os.path.join(DATABASE_DIR, "recurring.txt")
+# Expense amounts are grouped into buckets of this many paisa, so 499.00 and 502.00 fall together
+AMOUNT_BUCKET = 1000
+# Only the most recent payment days of each group are kept
+MAX_OCCURRENCES = 12
+SQLITE_FILE = os.path.join(DATABASE_DIR, "finance.db")
+# Advisory lock serializing writers across processes, and the sequence number readers validate against
+LOCK_FILE = os.path.join(DATABASE_DIR, "write.lock")
+SEQUENCE_FILE = os.path.join(DATABASE_DIR, "write.seq")
+
+# Key of the log's header line, and of the snapshot field naming the log it includes
+LOG_ID_KEY = "log_id"
+# Once the log grows past this many bytes it is folded back into the snapshot
+LOG_COMPACT_BYTES = 256 * 1024
+
+# "json" or "sqlite"; when unset, SQLite is used as soon as the database file exists
+STORAGE_ENV_VAR = "FINANCE_TRACKER_STORAGE"
+
+# The default ledger is DATABASE_DIR itself; every other ledger is its own shard under LEDGERS_DIR
+DEFAULT_LEDGER = "default"
+LEDGERS_DIR = os.path.join(DATABASE_DIR, "ledgers")
+# Ledger used when none is selected explicitly
+LEDGER_ENV_VAR = "FINANCE_TRACKER_LEDGER"
+LEDGER_NAME_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+def _stat_fingerprint(path):
+    """Returns [mtime_ns, size, inode] for a file (a list so it round-trips through JSON), or None.
+
+    Files are replaced rather than rewritten, so the inode changes on every save.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _log_id(line):
+    """Returns the id in a log header line, or None if line is a record (or a log written without a header)."""
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        header = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return header.get(LOG_ID_KEY) if isinstance(header, dict) else None
+
+
+def _complete_lines_end(f):
+    """Returns the offset just past the last newline of an open log (its size, unless the last line is torn)."""
+    position = f.seek(0, os.SEEK_END)
+    while position > 0:
+        start = max(0, position - 4096)
+        f.seek(start)
+        newline = f.read(position - start).rfind(b"\n")
+        if newline != -1:
+            return start + newline + 1
+        position = start
+    return 0
+
+
+def _truncate_torn_tail(f):
+    """Cuts everything after the last newline off a log opened for reading and writing; returns its new size."""
+    end = f.seek(0, os.SEEK_END)
+    position = _complete_lines_end(f)
+    if position != end:
+        f.truncate(position)
+    return position
+
+
+def rollup_key(record):
+    """Returns the (year, month, type, category) rollup key of a transaction record."""
+    date = record["date"]
+    return (int(date[:4]), int(date[5:7]), record["type"], record["category"])
+
+
+def add_to_rollup(rollup, records):
+    """Adds transaction records into a {(year, month, type, category): amount} rollup."""
+    for record in records:
+        key = rollup_key(record)
+        rollup[key] = rollup.get(key, 0) + record["amount"]
+    return rollup
+
+
+def normalize_description(description):
+    """Lower-cased words of description, dropping digits (invoice numbers, dates, ...)."""
+    return " ".join(WORD_PATTERN.findall(description.lower()))
+
+
+def recurring_key(record):
+    """Returns the (category, normalized description, amount bucket) group of an expense record, else None."""
+    if record["type"] != "Expense":
+        return None
+    return (record["category"], normalize_description(record["description"]), round(record["amount"] / AMOUNT_BUCKET))
+
+
+def add_to_recurring(series, records):
+    """Folds transaction records into {group: {"days", "description", "amount"}} recurring series.
+
+    days are the group's latest MAX_OCCURRENCES distinct day ordinals in
+    order; description and amount are those of its latest payment. Returns
+    the set of groups that changed.
+    """
+    changed = set()
+    for record in records:
+        key = recurring_key(record)
+        if key is None:
+            continue
+        row = series.get(key)
+        if row is None:
+            row = series[key] = {"days": [], "description": "", "amount": 0}
+        days = row["days"]
+        day = datetime.date.fromisoformat(record["date"][:10]).toordinal()
+        if day in days:
+            continue
+        if not days or day > days[-1]:
+            days.append(day)
+            row["description"] = record["description"]
+            row["amount"] = record["amount"]
+        else:
+            insort(days, day)
+        if len(days) > MAX_OCCURRENCES:
+            del days[0]
+        changed.add(key)
+    return changed
+
+
+def build_recurring(records):
+    """Returns the recurring series of transaction records, built from scratch."""
+    series = {}
+    add_to_recurring(series, records)
+    return series
+
+
+class JsonStorage:
+    """Whole-file JSON documents plus an append-only transaction log.
+
+    Safe to share between processes (the CLI and the dashboard): every write
+    holds the WriterLock and replaces files atomically, and reads of the
+    snapshot plus log are validated against the writers' sequence number.
+    """
+
+    name = "json"
+    # Filtering and aggregation happen in memory on the cached transaction list
+    indexed = False
+
+    @classmethod
+    def in_directory(cls, directory):
+        """A JsonStorage whose files all live in directory, named as in DATABASE_DIR."""
+        def path(constant):
+            return os.path.join(directory, os.path.basename(constant))
+        return cls(
+            path(TRANSACTIONS_FILE), path(TRANSACTIONS_LOG_FILE), path(BUDGETS_FILE), path(GOALS_FILE),
+            path(ROLLUP_FILE), path(RECURRING_FILE), path(LOCK_FILE), path(SEQUENCE_FILE)
+        )
+
+    def __init__(self, transactions_file=TRANSACTIONS_FILE, log_file=TRANSACTIONS_LOG_FILE,
+                 budgets_file=BUDGETS_FILE, goals_file=GOALS_FILE, rollup_file=ROLLUP_FILE,
+                 recurring_file=RECURRING_FILE, lock_file=LOCK_FILE, sequence_file=SEQUENCE_FILE):
+        self.transactions_file = transactions_file
+        self.log_file = log_file
+        self.budgets_file = budgets_file
+        self.goals_file = goals_file
+        self.rollup_file = rollup_file
+        self.recurring_file = recurring_file
+        self.lock = WriterLock(lock_file, sequence_file)
+
+    def data_files(self):
+        return [self.transactions_file, self.log_file, self.budgets_file, self.goals_file]
+
+    def fingerprint(self):
+        """Changes whenever the transaction snapshot or log is written."""
+        return [_stat_fingerprint(self.transactions_file), _stat_fingerprint(self.log_file)]
+
+    def data_version(self):
+        """Changes whenever any data file (transactions, budgets, goals) is written."""
+        return [_stat_fingerprint(path) for path in self.data_files()]
+
+    # ============= TRANSACTIONS =============
+    def load_transaction_records(self):
+        """Reads the snapshot and replays the append-only log on top of it, as of one consistent moment."""
+        return self.lock.read_consistent(self._read_transaction_records)
+
+    def _read_transaction_records(self):
+        return self._read_transactions_state()[0]
+
+    def _read_transactions_state(self):
+        """Returns (records, log position they include up to) from the snapshot plus the log."""
+        records, covered = self._read_snapshot()
+        log_id, tail, end = self._read_log(after=covered)
+        records.extend(tail)
+        return records, (log_id, end)
+
+    def _read_snapshot(self):
+        """Returns (records, (log id, byte offset) of the log already folded into them)."""
+        try:
+            with open(self.transactions_file, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return [], None
+        if isinstance(data, list):  # written before snapshots recorded the log they include
+            return data, None
+        return data["transactions"], (data["log_id"], data["log_offset"])
+
+    def _read_log(self, after=None):
+        """Returns (log id, records, end offset) of the append-only log.
+
+        after is a (log id, byte offset) position already accounted for; if it
+        names this log, only the records past that offset are returned. A torn
+        last line from an interrupted append is ignored, and end is where it starts.
+        """
+        try:
+            f = open(self.log_file, "rb")
+        except FileNotFoundError:
+            return None, [], 0
+        with f:
+            first = f.readline()
+            log_id = _log_id(first)
+            offset = len(first) if log_id is not None else 0
+            if after is not None and after[0] == log_id:
+                offset = max(offset, after[1])
+            f.seek(offset)
+            records = []
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                line = line.strip()
+                if line:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+            return log_id, records, offset
+
+    def _append_to_log(self, records):
+        """Appends records to the log and fsyncs it; returns the log size. Caller holds the lock.
+
+        A new log starts with a header line naming it, so a snapshot can say
+        which log (and how much of it) it already includes. A torn last line
+        left by an interrupted append is cut off first, so the new records
+        start on a line of their own instead of being glued onto it.
+        """
+        with open(self.log_file, "ab+") as f:
+            size = _truncate_torn_tail(f)
+            lines = [json.dumps(record).encode() + b"\n" for record in records]
+            if size == 0:
+                lines.insert(0, json.dumps({LOG_ID_KEY: uuid.uuid4().hex}).encode() + b"\n")
+            data = b"".join(lines)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            return size + len(data)
+
+    def _write_snapshot(self, records, covers):
+        """Replaces the snapshot with records, which include the log up to position covers, then drops the log.
+
+        The snapshot names the log position it includes, so if a crash leaves
+        the old log behind, replay skips the records already in the snapshot.
+        """
+        log_id, log_offset = covers
+        # dumps() encodes in one shot, much faster than streaming through json.dump()
+        atomic_write(self.transactions_file, json.dumps(
+            {LOG_ID_KEY: log_id, "log_offset": log_offset, "transactions": records}, indent=4
+        ))
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+
+    def save_transaction_records(self, records):
+        """Writes the full snapshot, clears the append-only log and rebuilds the rollup and recurring index.
+
+        Returns the fingerprint of exactly what was written.
+        """
+        with self.lock:
+            log_id, _, end = self._read_log()
+            self._write_snapshot(records, (log_id, end))
+            self.save_rollup(add_to_rollup({}, records))
+            self.save_recurring(build_recurring(records))
+            return self.fingerprint()
+
+    def append_transaction_record(self, record):
+        self.append_transaction_records([record])
+
+    def append_transaction_records(self, records, compact=True):
+        """Appends records to the log; the only file an append writes.
+
+        The rollup and recurring index are not rewritten: readers fold in the
+        log records added since they were saved, and compaction saves them
+        again. The log is compacted once it grows past LOG_COMPACT_BYTES
+        unless compact is False (bulk imports compact once at the end instead).
+        Returns the fingerprints just before and just after this write, so a
+        caller can tell whether anyone else wrote in between.
+        """
+        with self.lock:
+            before = self.fingerprint()
+            log_size = self._append_to_log(records)
+            if compact and log_size > LOG_COMPACT_BYTES:
+                self.compact()
+            return before, self.fingerprint()
+
+    def compact(self):
+        """Folds the log into the snapshot and saves the rollup and recurring index against it.
+
+        Derived files left stale (say by a crash in an earlier compaction)
+        are rebuilt from the records at hand.
+        """
+        with self.lock:
+            rollup = self.load_rollup()
+            recurring = self.load_recurring()
+            records, covers = self._read_transactions_state()
+            self._write_snapshot(records, covers)
+            self.save_rollup(rollup if rollup is not None else add_to_rollup({}, records))
+            self.save_recurring(recurring if recurring is not None else build_recurring(records))
+
+    # ============= DERIVED FILES =============
+    def _derived_source(self):
+        """Where derived files (rollup, recurring index) are up to: the snapshot's fingerprint plus a log position."""
+        log_id, end = None, 0
+        try:
+            with open(self.log_file, "rb") as f:
+                log_id = _log_id(f.readline())
+                end = _complete_lines_end(f)
+        except FileNotFoundError:
+            pass
+        return {"snapshot": _stat_fingerprint(self.transactions_file), LOG_ID_KEY: log_id, "log_offset": end}
+
+    def _read_derived(self, path):
+        """Returns (saved data, records appended to the log since), or (None, None) if missing or stale."""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None, None
+        source = data.get("source")
+        if not isinstance(source, dict) or source.get("snapshot") != _stat_fingerprint(self.transactions_file):
+            return None, None
+        log_id, tail, _ = self._read_log(after=(source[LOG_ID_KEY], source["log_offset"]))
+        # A log other than the one it was saved against is only expected if there was none then
+        if log_id != source[LOG_ID_KEY] and source["log_offset"]:
+            return None, None
+        return data, tail
+
+    def _save_derived(self, path, data, source, indent=None):
+        """Writes a derived file stamped with where it is up to, unless the transactions changed since source."""
+        with self.lock:
+            if source is not None and source != self.fingerprint():
+                return
+            # Derived data: a copy lost in a crash is rebuilt, so no fsync
+            atomic_write(path, json.dumps({"source": self._derived_source(), **data}, indent=indent), durable=False)
+
+    # ============= MONTHLY ROLLUP =============
+    def load_rollup(self):
+        """Returns the persisted rollup plus the log records added since, or None if it is missing or stale."""
+        return self.lock.read_consistent(self._read_rollup)
+
+    def _read_rollup(self):
+        data, tail = self._read_derived(self.rollup_file)
+        if data is None:
+            return None
+        rollup = {
+            (r["year"], r["month"], r["type"], r["category"]): r["amount"]
+            for r in data["totals"]
+        }
+        return add_to_rollup(rollup, tail)
+
+    def save_rollup(self, rollup, source=None):
+        """Persists the rollup, stamped with the transaction data it includes.
+
+        source is the fingerprint the caller computed it at; if another
+        process has written since, the rollup is out of date and not saved.
+        """
+        totals = [
+            {"year": year, "month": month, "type": t_type, "category": category, "amount": amount}
+            for (year, month, t_type, category), amount in sorted(rollup.items())
+        ]
+        self._save_derived(self.rollup_file, {"totals": totals}, source, indent=4)
+
+    # ============= RECURRING PAYMENTS =============
+    def load_recurring(self):
+        """Returns the persisted recurring series plus the log records added since, or None if missing or stale."""
+        return self.lock.read_consistent(self._read_recurring)
+
+    def _read_recurring(self):
+        data, tail = self._read_derived(self.recurring_file)
+        if data is None:
+            return None
+        series = {
+            (s["category"], s["key"], s["bucket"]): {"days": s["days"], "description": s["description"], "amount": s["amount"]}
+            for s in data["series"]
+        }
+        add_to_recurring(series, tail)
+        return series
+
+    def save_recurring(self, series, source=None):
+        """Persists the {group: row} recurring series, stamped with the transaction data they include.
+
+        Like save_rollup, skipped if the transactions changed since source.
+        """
+        series = [
+            {"category": category, "key": key, "bucket": bucket, **row}
+            for (category, key, bucket), row in series.items()
+        ]
+        # Written compactly: one entry per distinct expense, so it grows with the history
+        self._save_derived(self.recurring_file, {"series": series}, source)
+
+    # ============= BUDGETS & GOALS =============
+    def load_budget_records(self):
+        try:
+            with open(self.budgets_file, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+    def save_budget_records(self, records):
+        with self.lock:
+            atomic_write(self.budgets_file, json.dumps(records, indent=4))
+
+    def load_goals(self):
+        try:
+            with open(self.goals_file, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_goals(self, goals):
+        with self.lock:
+            atomic_write(self.goals_file, json.dumps(goals, indent=4))
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    amount INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS idx_transactions_type_date ON transactions (type, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions (category, date);
+
+CREATE TABLE IF NOT EXISTS monthly_rollup (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    PRIMARY KEY (year, month, type, category)
+);
+
+CREATE TABLE IF NOT EXISTS recurring_series (
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (category, key, bucket)
+);
+
+CREATE TABLE IF NOT EXISTS budgets (
+    category TEXT PRIMARY KEY,
+    amount INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS goals (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+TRANSACTION_COLUMNS = ("date", "type", "category", "description", "amount")
+
+
+def _where(start, end, transaction_type, category):
+    """Builds a WHERE clause that the (date), (type, date) and (category, date) indexes can serve."""
+    clauses, params = [], []
+    if transaction_type is not None:
+        clauses.append("type = ?")
+        params.append(transaction_type)
+    if category is not None:
+        clauses.append("category = ?")
+        params.append(category)
+    if start is not None:
+        clauses.append("date >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("date < ?")
+        params.append(end)
+    sql = " WHERE " + " AND ".join(clauses) if clauses else ""
+    return sql, params
+
+
+class SqliteStorage:
+    """SQLite database with indexes on (date), (type, date) and (category, date)."""
+
+    name = "sqlite"
+    # Filters and totals are answered by indexed SQL queries
+    indexed = True
+
+    def __init__(self, path=SQLITE_FILE):
+        self.path = path
+        # Streamlit serves each session from its own thread, all sharing this backend
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        if self.has_transactions() and not self.connection.execute("SELECT EXISTS (SELECT 1 FROM monthly_rollup)").fetchone()[0]:
+            with self.connection:
+                self.rebuild_rollup()
+        if self.has_transactions() and not self.connection.execute("SELECT EXISTS (SELECT 1 FROM recurring_series)").fetchone()[0]:
+            with self.connection:
+                self.rebuild_recurring()
+
+    def data_files(self):
+        return [self.path]
+
+    def fingerprint(self):
+        """Changes on commits from other connections (data_version) and from this one (total_changes)."""
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        return (data_version, self.connection.total_changes)
+
+    def data_version(self):
+        """Changes on any write; budgets and goals live in the same database."""
+        return self.fingerprint()
+
+    # ============= TRANSACTIONS =============
+    def _rows_to_records(self, rows):
+        return [dict(zip(TRANSACTION_COLUMNS, row)) for row in rows]
+
+    def load_transaction_records(self):
+        rows = self.connection.execute(
+            "SELECT date, type, category, description, amount FROM transactions ORDER BY id"
+        )
+        return self._rows_to_records(rows)
+
+    def save_transaction_records(self, records):
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            self.connection.execute("DELETE FROM transactions")
+            self.connection.executemany(
+                "INSERT INTO transactions (date, type, category, description, amount) VALUES (?, ?, ?, ?, ?)",
+                [tuple(r[c] for c in TRANSACTION_COLUMNS) for r in records]
+            )
+            self.rebuild_rollup()
+            self.rebuild_recurring()
+        # data_version only moves for other connections' commits, so this is our write alone
+        return (data_version, self.connection.total_changes)
+
+    def append_transaction_record(self, record):
+        self.append_transaction_records([record])
+
+    def append_transaction_records(self, records, compact=True):
+        """Inserts records and updates the rollup and recurring groups in the same SQL transaction.
+
+        SQLite checkpoints its write-ahead log on its own, so compact is unused.
+        Returns the fingerprints just before and just after this write.
+        """
+        with self.connection:
+            # Take the write lock up front so no other connection commits between the fingerprints
+            self.connection.execute("BEGIN IMMEDIATE")
+            before = self.fingerprint()
+            self.connection.executemany(
+                "INSERT INTO transactions (date, type, category, description, amount) VALUES (?, ?, ?, ?, ?)",
+                [tuple(r[c] for c in TRANSACTION_COLUMNS) for r in records]
+            )
+            self.connection.executemany(
+                "INSERT INTO monthly_rollup (year, month, type, category, amount) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (year, month, type, category) DO UPDATE SET amount = amount + excluded.amount",
+                [rollup_key(r) + (r["amount"],) for r in records]
+            )
+            self._add_to_recurring(records)
+        # data_version only moves for other connections' commits, so this is our write alone
+        return before, (before[0], self.connection.total_changes)
+
+    def compact(self):
+        """Folds the write-ahead log back into the main database file."""
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def has_transactions(self):
+        return self.connection.execute("SELECT EXISTS (SELECT 1 FROM transactions)").fetchone()[0] == 1
+
+    def count_transactions(self, start=None, end=None, transaction_type=None, category=None):
+        """Counts records with start <= date < end (ISO strings) matching the filters."""
+        where, params = _where(start, end, transaction_type, category)
+        return self.connection.execute(f"SELECT COUNT(*) FROM transactions{where}", params).fetchone()[0]
+
+    def query_transaction_records(self, start=None, end=None, transaction_type=None,
+                                  category=None, newest_first=False, limit=None, offset=0):
+        """Returns records with start <= date < end (ISO strings) matching the filters."""
+        where, params = _where(start, end, transaction_type, category)
+        order = "DESC" if newest_first else "ASC"
+        sql = (
+            "SELECT date, type, category, description, amount FROM transactions"
+            f"{where} ORDER BY date {order}, id {order}"
+        )
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend((limit, offset))
+        rows = self.connection.execute(sql, params)
+        return self._rows_to_records(rows)
+
+    def iter_transaction_record_chunks(self, start=None, end=None, transaction_type=None,
+                                       category=None, chunk_size=5000):
+        """Yields lists of at most chunk_size matching records in date order, fetched lazily."""
+        where, params = _where(start, end, transaction_type, category)
+        cursor = self.connection.execute(
+            "SELECT date, type, category, description, amount FROM transactions"
+            f"{where} ORDER BY date, id",
+            params
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield self._rows_to_records(rows)
+
+    def transaction_totals(self, start=None, end=None):
+        """Returns {(type, category): total amount} for start <= date < end."""
+        where, params = _where(start, end, None, None)
+        rows = self.connection.execute(
+            f"SELECT type, category, SUM(amount) FROM transactions{where} GROUP BY type, category",
+            params
+        )
+        return {(t, c): total for t, c, total in rows}
+
+    # ============= MONTHLY ROLLUP =============
+    def rebuild_rollup(self):
+        """Recomputes the rollup table from the transactions table (caller commits)."""
+        self.connection.execute("DELETE FROM monthly_rollup")
+        self.connection.execute(
+            "INSERT INTO monthly_rollup (year, month, type, category, amount) "
+            "SELECT CAST(substr(date, 1, 4) AS INTEGER), CAST(substr(date, 6, 2) AS INTEGER), type, category, SUM(amount) "
+            "FROM transactions GROUP BY 1, 2, 3, 4"
+        )
+
+    def load_rollup(self):
+        """Returns the rollup table; it is maintained transactionally so it is always current."""
+        rows = self.connection.execute("SELECT year, month, type, category, amount FROM monthly_rollup")
+        return {(year, month, t_type, category): amount for year, month, t_type, category, amount in rows}
+
+    def save_rollup(self, rollup, source=None):
+        with self.connection:
+            self.connection.execute("DELETE FROM monthly_rollup")
+            self.connection.executemany(
+                "INSERT INTO monthly_rollup (year, month, type, category, amount) VALUES (?, ?, ?, ?, ?)",
+                [key + (amount,) for key, amount in rollup.items()]
+            )
+
+    # ============= RECURRING PAYMENTS =============
+    def _add_to_recurring(self, records):
+        """Folds records into the groups they belong to, reading and writing only those rows (caller commits)."""
+        series = {}
+        for key in {recurring_key(r) for r in records} - {None}:
+            row = self.connection.execute(
+                "SELECT data FROM recurring_series WHERE category = ? AND key = ? AND bucket = ?", key
+            ).fetchone()
+            if row is not None:
+                series[key] = json.loads(row[0])
+        changed = add_to_recurring(series, records)
+        self._write_recurring(series, changed)
+
+    def _write_recurring(self, series, keys):
+        self.connection.executemany(
+            "INSERT INTO recurring_series (category, key, bucket, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (category, key, bucket) DO UPDATE SET data = excluded.data",
+            [key + (json.dumps(series[key]),) for key in keys]
+        )
+
+    def rebuild_recurring(self):
+        """Recomputes the recurring groups from the transactions table (caller commits)."""
+        self.connection.execute("DELETE FROM recurring_series")
+        rows = self.connection.execute(
+            "SELECT date, type, category, description, amount FROM transactions WHERE type = 'Expense' ORDER BY date, id"
+        )
+        series = build_recurring(self._rows_to_records(rows))
+        self._write_recurring(series, series)
+
+    def load_recurring(self):
+        """Returns the {group: row} recurring series; they are maintained transactionally so always current."""
+        rows = self.connection.execute("SELECT category, key, bucket, data FROM recurring_series")
+        return {(category, key, bucket): json.loads(data) for category, key, bucket, data in rows}
+
+    def save_recurring(self, series, source=None):
+        with self.connection:
+            self.connection.execute("DELETE FROM recurring_series")
+            self._write_recurring(series, series)
+
+    # ============= BUDGETS & GOALS =============
+    def load_budget_records(self):
+        rows = self.connection.execute("SELECT category, amount FROM budgets ORDER BY rowid")
+        return [{"category": c, "amount": a} for c, a in rows]
+
+    def save_budget_records(self, records):
+        with self.connection:
+            self.connection.execute("DELETE FROM budgets")
+            self.connection.executemany(
+                "INSERT INTO budgets (category, amount) VALUES (?, ?)",
+                [(b["category"], b["amount"]) for b in records]
+            )
+
+    def load_goals(self):
+        rows = self.connection.execute("SELECT key, data FROM goals ORDER BY rowid")
+        return {key: json.loads(data) for key, data in rows}
+
+    def save_goals(self, goals):
+        with self.connection:
+            self.connection.execute("DELETE FROM goals")
+            self.connection.executemany(
+                "INSERT INTO goals (key, data) VALUES (?, ?)",
+                [(key, json.dumps(data)) for key, data in goals.items()]
+            )
+
+
+# Ledger selected for the current request (thread or task); falls back to the process default
+_request_ledger = contextvars.ContextVar("ledger", default=None)
+_default_ledger = None
+# One backend per ledger, created on first use
+_storages = {}
+_storages_lock = threading.Lock()
+
+
+def validate_ledger(ledger):
+    """Returns ledger if it is a usable ledger name, else raises ValueError."""
+    if not LEDGER_NAME_PATTERN.fullmatch(ledger):
+        raise ValueError(f"Invalid ledger name '{ledger}' (letters, digits, '-' and '_' only)")
+    return ledger
+
+
+def ledger_directory(ledger):
+    """Directory holding a ledger's shard: its JSON files or its finance.db."""
+    if ledger == DEFAULT_LEDGER:
+        return DATABASE_DIR
+    return os.path.join(LEDGERS_DIR, validate_ledger(ledger))
+
+
+def list_ledgers():
+    """Names of the existing ledgers, the default one first."""
+    try:
+        names = sorted(
+            name for name in os.listdir(LEDGERS_DIR)
+            if LEDGER_NAME_PATTERN.fullmatch(name) and os.path.isdir(os.path.join(LEDGERS_DIR, name))
+        )
+    except FileNotFoundError:
+        names = []
+    return [DEFAULT_LEDGER] + [name for name in names if name != DEFAULT_LEDGER]
+
+
+def set_default_ledger(ledger):
+    """Selects the ledger this process works on (e.g. from a --ledger flag at startup)."""
+    global _default_ledger
+    _default_ledger = validate_ledger(ledger)
+
+
+def current_ledger():
+    """The ledger of the current request, else the process default, else FINANCE_TRACKER_LEDGER."""
+    return _request_ledger.get() or _default_ledger or validate_ledger(os.environ.get(LEDGER_ENV_VAR, DEFAULT_LEDGER))
+
+
+@contextmanager
+def using_ledger(ledger):
+    """Runs the enclosed block (one request) against ledger; other threads and tasks are unaffected."""
+    token = _request_ledger.set(validate_ledger(ledger))
+    try:
+        yield ledger
+    finally:
+        _request_ledger.reset(token)
+
+
+def _open_storage(ledger):
+    directory = ledger_directory(ledger)
+    sqlite_file = os.path.join(directory, os.path.basename(SQLITE_FILE))
+    backend = os.environ.get(STORAGE_ENV_VAR)
+    if backend is None:
+        backend = "sqlite" if os.path.exists(sqlite_file) else "json"
+    if backend not in ("json", "sqlite"):
+        raise ValueError(f"Unknown storage backend '{backend}' (expected 'json' or 'sqlite')")
+    os.makedirs(directory, exist_ok=True)
+    if backend == "sqlite":
+        return SqliteStorage(sqlite_file)
+    return JsonStorage.in_directory(directory)
+
+
+def get_storage(ledger=None):
+    """Returns the storage backend of ledger (default: the current one), creating it on first use.
+
+    Each ledger is a separate shard with its own files, lock and cache, so
+    work on one ledger never reads or locks another.
+    """
+    ledger = ledger or current_ledger()
+    storage = _storages.get(ledger)
+    if storage is None:
+        with _storages_lock:
+            storage = _storages.get(ledger)
+            if storage is None:
+                storage = _storages[ledger] = _open_storage(ledger)
+    return storage
@@ -0,0 +1,275 @@
+import datetime
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class StringPool:
+    """Dictionary encoding: each distinct string is stored once and referenced by code."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def encode(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def code_of(self, value):
+        """Returns the code for value, or None if it has never been stored."""
+        return self._codes.get(value)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class TransactionView:
+    """Lightweight row view over a ColumnStore, usable wherever a Transaction is read."""
+
+    __slots__ = ("_store", "row")
+
+    def __init__(self, store, row):
+        self._store = store
+        self.row = row
+
+    @property
+    def date(self):
+        return datetime.date.fromordinal(self._store.days[self.row])
+
+    @property
+    def type(self):
+        return self._store.types.values[self._store.type_codes[self.row]]
+
+    @property
+    def category(self):
+        return self._store.categories.values[self._store.category_codes[self.row]]
+
+    @property
+    def description(self):
+        return self._store.descriptions.values[self._store.description_codes[self.row]]
+
+    @property
+    def amount(self):
+        return self._store.amounts[self.row]  # integer paisa/cents
+
+    def to_dict(self):
+        return {
+            "date": self.date.isoformat(),
+            "type": self.type,
+            "category": self.category,
+            "description": self.description,
+            "amount": self.amount
+        }
+
+
+class ColumnStore:
+    """Array-backed, column-oriented transaction table.
+
+    Each row costs 19 bytes: an int32 day ordinal, an int64 amount in paisa,
+    and dictionary codes for type, category and description. Iterating or
+    indexing yields TransactionView rows, so code written against lists of
+    Transaction objects keeps working.
+
+    Rows stay in insertion order (row numbers never change). A date index of
+    8 more bytes per row (sorted_days, plus date_order holding the row number
+    at each sorted position) makes date ranges and "most recent N" bisect
+    slices instead of full scans or sorts.
+    """
+
+    # Out-of-order batches larger than this are merged into the index in one
+    # pass instead of being bisect-inserted row by row
+    MERGE_THRESHOLD = 64
+
+    def __init__(self):
+        self.days = array("i")
+        self.amounts = array("q")
+        # Widened to array("I") by _fit_codes past 256 types or 65536 categories
+        self.type_codes = array("B")
+        self.category_codes = array("H")
+        self.description_codes = array("I")
+        self.types = StringPool()
+        self.categories = StringPool()
+        self.descriptions = StringPool()
+        self.sorted_days = array("i")
+        self.date_order = array("I")
+
+    @classmethod
+    def from_records(cls, records):
+        store = cls()
+        for record in records:
+            store._append_record(record)
+        store._index_rows(0)
+        return store
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        store = cls()
+        store.extend(transactions)
+        return store
+
+    def _append_amount(self, amount):
+        try:
+            self.amounts.append(amount)
+        except OverflowError:
+            # Amounts beyond int64 cannot live in the array; fall back to a plain list
+            self.amounts = list(self.amounts)
+            self.amounts.append(amount)
+
+    def _fit_codes(self, name, code):
+        """Widens the code column name to 32 bits once code no longer fits its current typecode."""
+        codes = getattr(self, name)
+        if code >> (8 * codes.itemsize):
+            setattr(self, name, array("I", codes))
+
+    def _append_row(self, day, transaction_type, category, description, amount):
+        # Everything that can fail runs before any column grows, so a bad row
+        # never leaves the columns with different lengths
+        type_code = self.types.encode(transaction_type)
+        category_code = self.categories.encode(category)
+        description_code = self.descriptions.encode(description)
+        self._fit_codes("type_codes", type_code)
+        self._fit_codes("category_codes", category_code)
+        self._append_amount(amount)
+        self.days.append(day)
+        self.type_codes.append(type_code)
+        self.category_codes.append(category_code)
+        self.description_codes.append(description_code)
+
+    def _append_transaction(self, transaction):
+        self._append_row(
+            transaction.date.toordinal(),
+            transaction.type,
+            transaction.category,
+            transaction.description,
+            transaction.amount
+        )
+
+    def _append_record(self, record):
+        self._append_row(
+            datetime.date.fromisoformat(record["date"][:10]).toordinal(),
+            record["type"],
+            record["category"],
+            record["description"],
+            record["amount"]
+        )
+
+    def _index_rows(self, first_row):
+        """Adds rows first_row.. to the date index, keeping it ordered by (day, row)."""
+        day_of = self.days.__getitem__
+        # A stable sort of ascending row numbers orders ties by row
+        new_rows = sorted(range(first_row, len(self)), key=day_of)
+        if not new_rows:
+            return
+        if not self.sorted_days or day_of(new_rows[0]) >= self.sorted_days[-1]:
+            # Common case: the new rows are not older than anything indexed
+            self.date_order.extend(new_rows)
+            self.sorted_days.extend(map(day_of, new_rows))
+        elif len(new_rows) <= self.MERGE_THRESHOLD:
+            for row in new_rows:
+                # Equal days keep row order since new rows have the largest numbers
+                day = day_of(row)
+                position = bisect_right(self.sorted_days, day)
+                self.sorted_days.insert(position, day)
+                self.date_order.insert(position, row)
+        else:
+            # heapq.merge takes from the first (older) input on ties
+            self.date_order = array("I", heapq.merge(self.date_order, new_rows, key=day_of))
+            self.sorted_days = array("i", map(day_of, self.date_order))
+
+    def append(self, transaction):
+        self._append_transaction(transaction)
+        self._index_rows(len(self) - 1)
+
+    def append_record(self, record):
+        """Appends a stored dictionary record without building a Transaction first."""
+        self._append_record(record)
+        self._index_rows(len(self) - 1)
+
+    def extend(self, transactions):
+        first_row = len(self)
+        for transaction in transactions:
+            self._append_transaction(transaction)
+        self._index_rows(first_row)
+
+    def __len__(self):
+        return len(self.days)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TransactionView(self, row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        return TransactionView(self, index)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield TransactionView(self, row)
+
+    def duplicate_keys(self):
+        """Returns {(day ordinal, type, category, amount)} for every row, for duplicate detection."""
+        types, categories = self.types.values, self.categories.values
+        return {
+            (day, types[t_code], categories[c_code], amount)
+            for day, t_code, c_code, amount in zip(self.days, self.type_codes, self.category_codes, self.amounts)
+        }
+
+    def rows_between(self, start=None, end=None):
+        """Returns the row numbers with start <= date < end in date order, in O(log n + k)."""
+        lo = bisect_left(self.sorted_days, start.toordinal()) if start else 0
+        hi = bisect_left(self.sorted_days, end.toordinal()) if end else len(self.sorted_days)
+        return self.date_order[lo:hi]
+
+    def recent(self, n):
+        """Returns the row numbers of the n newest transactions, newest first."""
+        if n <= 0:
+            return []
+        return self.date_order[-n:][::-1]
+
+    def select(self, start=None, end=None, transaction_type=None, category=None):
+        """Returns the row numbers with start <= date < end matching the filters, in date order.
+
+        Without type or category filters this is the index slice itself (an array).
+        """
+        rows = self.rows_between(start, end)
+        type_code = category_code = None
+        if transaction_type is not None:
+            type_code = self.types.code_of(transaction_type)
+            if type_code is None:
+                return []
+        if category is not None:
+            category_code = self.categories.code_of(category)
+            if category_code is None:
+                return []
+        if type_code is None and category_code is None:
+            return rows
+
+        type_codes, category_codes = self.type_codes, self.category_codes
+        return [
+            row for row in rows
+            if (type_code is None or type_codes[row] == type_code)
+            and (category_code is None or category_codes[row] == category_code)
+        ]
+
+    def totals(self, start=None, end=None):
+        """Returns {(type, category): total amount} for start <= date < end."""
+        sums = {}
+        if start is None and end is None:
+            keyed = zip(self.type_codes, self.category_codes, self.amounts)
+        else:
+            type_codes, category_codes, amounts = self.type_codes, self.category_codes, self.amounts
+            keyed = ((type_codes[row], category_codes[row], amounts[row]) for row in self.rows_between(start, end))
+        for t_code, c_code, amount in keyed:
+            key = (t_code, c_code)
+            sums[key] = sums.get(key, 0) + amount
+        return {
+            (self.types.values[t_code], self.categories.values[c_code]): total
+            for (t_code, c_code), total in sums.items()
+        }
@@ -0,0 +1,51 @@
+import datetime
+from decimal import ROUND_HALF_UP, Decimal
+
+# Amounts are rounded to a whole paisa/cent
+PAISA = Decimal("0.01")
+
+
+class Transaction:
+    def __init__(self, date, transaction_type, category, description, amount):
+        self.date = date
+        self.type = transaction_type
+        self.category = category
+        self.description = description
+        self.amount = amount  # Stored as an integer (paisa/cents)
+
+    def to_dict(self):
+        return {
+            "date": self.date.isoformat(),
+            "type": self.type,
+            "category": self.category,
+            "description": self.description,
+            "amount": self.amount
+        }
+
+
+def to_paisa(value):
+    """Converts an amount in rupees/dollars (text or a number) to integer paisa/cents.
+
+    Rounds half up to the nearest paisa in decimal, so "19.99" is 1999 and
+    "2.675" is 268 (binary floats make them 1998.99... and 267.49...).
+    Raises ValueError for anything but a finite number.
+    """
+    try:
+        amount = Decimal(str(value))
+        if not amount.is_finite():
+            raise ValueError
+        return int(amount.quantize(PAISA, ROUND_HALF_UP) * 100)
+    except (ArithmeticError, ValueError):
+        # Decimal's InvalidOperation (bad text, too many digits) is an ArithmeticError
+        raise ValueError(f"invalid amount {value!r}")
+
+
+def transaction_from_dict(t):
+    """Builds a Transaction from its stored dictionary form."""
+    return Transaction(
+        datetime.datetime.fromisoformat(t["date"]).date(),
+        t["type"],
+        t["category"],
+        t["description"],
+        t["amount"]
+    )
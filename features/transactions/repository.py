@@ -0,0 +1,288 @@
+import datetime
+import threading
+from bisect import bisect_right
+
+from features.analytics.aggregation import MonthlyTotals, aggregate
+from features.analytics.anomaly import SpendingAnomalies
+from features.analytics.recurring import RecurringIndex
+from features.analytics.rolling import RollingTotals
+from features.storage.storage import build_recurring, current_ledger, get_storage
+from features.transactions.columnar import ColumnStore
+from features.transactions.models import transaction_from_dict
+from features.transactions.search import SearchIndex
+
+
+class TransactionRepository:
+    """Owns the in-memory transaction table of one ledger, shared by every feature.
+
+    The table is only re-read when the storage fingerprint (file mtime/size, or
+    the SQLite change counters) differs from the one seen at the last load.
+    """
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.transactions = ColumnStore()
+        self._fingerprint = None
+        # Derived indexes over self.transactions (search, rolling totals, anomalies), by name
+        self._indexes = {}
+        # Readers may run concurrently (see api.py); refresh() updates an index in place
+        self._indexes_lock = threading.Lock()
+        # (fingerprint, MonthlyTotals) last read from the persisted rollup
+        self._monthly = None
+        # (fingerprint, RecurringIndex) last read from the persisted recurring index
+        self._recurring = None
+
+    def storage(self):
+        return get_storage(self.ledger)
+
+    def is_current(self):
+        return self._fingerprint is not None and self._fingerprint == self.storage().fingerprint()
+
+    def invalidate(self):
+        self._fingerprint = None
+
+    def load(self):
+        """Returns the cached transactions, reloading them if storage changed."""
+        storage = self.storage()
+        fingerprint = storage.fingerprint()
+        if fingerprint != self._fingerprint:
+            self.transactions = ColumnStore.from_records(storage.load_transaction_records())
+            self._fingerprint = fingerprint
+        return self.transactions
+
+    def save(self, transactions):
+        """Replaces everything in storage with the given transactions."""
+        storage = self.storage()
+        fingerprint = storage.save_transaction_records([t.to_dict() for t in transactions])
+        if not isinstance(transactions, ColumnStore):
+            transactions = ColumnStore.from_transactions(transactions)
+        self.transactions = transactions
+        self._fingerprint = fingerprint
+
+    def append(self, transaction):
+        """Stores one transaction, keeping the cache warm if it was up to date."""
+        self.append_many([transaction])
+
+    def append_many(self, transactions, compact=True):
+        """Stores a batch of transactions with a single storage write.
+
+        The cache is extended in place only if nothing else (another process)
+        wrote since it was loaded; otherwise the next read reloads it.
+        """
+        before, after = self.storage().append_transaction_records([t.to_dict() for t in transactions], compact)
+        if self._fingerprint is not None and before == self._fingerprint:
+            self.transactions.extend(transactions)
+            self._fingerprint = after
+        else:
+            self.invalidate()
+
+    def has_transactions(self):
+        storage = self.storage()
+        if storage.indexed:
+            return storage.has_transactions()
+        return bool(self.load())
+
+    def query(self, start=None, end=None, transaction_type=None, category=None, newest_first=False):
+        """Returns transactions with start <= date < end matching the filters."""
+        storage = self.storage()
+        if storage.indexed:
+            records = storage.query_transaction_records(
+                start.isoformat() if start else None,
+                end.isoformat() if end else None,
+                transaction_type,
+                category,
+                newest_first
+            )
+            return [transaction_from_dict(t) for t in records]
+
+        store = self.load()
+        rows = store.select(start, end, transaction_type, category)
+        if newest_first:
+            rows.reverse()
+        return [store[row] for row in rows]
+
+    def recent(self, n):
+        """Returns the n newest transactions, newest first, without sorting the full history."""
+        storage = self.storage()
+        if storage.indexed:
+            records = storage.query_transaction_records(newest_first=True, limit=n)
+            return [transaction_from_dict(t) for t in records]
+
+        store = self.load()
+        return [store[row] for row in store.recent(n)]
+
+    def _derived_index(self, name, factory):
+        """Returns the named index over the cached table, caught up with appended rows.
+
+        Indexes are built by factory(store) on first use and rebuilt only when
+        the table is reloaded; otherwise refresh() folds in just the new rows.
+        """
+        store = self.load()
+        with self._indexes_lock:
+            index = self._indexes.get(name)
+            if index is None or index.store is not store:
+                index = self._indexes[name] = factory(store)
+            index.refresh()
+        return index
+
+    def search(self, query, start=None, end=None, transaction_type=None, category=None):
+        """Returns transactions whose description has every query word (word* for prefixes), newest first."""
+        index = self._derived_index("search", SearchIndex)
+        rows = index.search(query, start, end, transaction_type, category)
+        return [index.store[row] for row in rows]
+
+    def rolling_totals(self):
+        """Returns RollingTotals (O(log n) date-window sums) for the cached table."""
+        return self._derived_index("rolling", RollingTotals)
+
+    def spending_anomalies(self):
+        """Returns SpendingAnomalies (streaming per-category outlier detection) for the cached table."""
+        return self._derived_index("anomalies", SpendingAnomalies)
+
+    def listing(self, start=None, end=None, transaction_type=None, category=None):
+        """Returns a newest-first TransactionListing of the matching transactions."""
+        return TransactionListing(self, start, end, transaction_type, category)
+
+    def iter_chunks(self, start=None, end=None, transaction_type=None, category=None, chunk_size=5000):
+        """Yields matching transactions in date order as lists of at most chunk_size.
+
+        SQLite streams rows from a cursor; the JSON backend slices row views off
+        the cached table, so neither materializes a second copy of the data.
+        """
+        storage = self.storage()
+        if storage.indexed:
+            for records in storage.iter_transaction_record_chunks(
+                start.isoformat() if start else None,
+                end.isoformat() if end else None,
+                transaction_type,
+                category,
+                chunk_size
+            ):
+                yield [transaction_from_dict(t) for t in records]
+            return
+
+        store = self.load()
+        rows = store.select(start, end, transaction_type, category)
+        for i in range(0, len(rows), chunk_size):
+            yield [store[row] for row in rows[i:i + chunk_size]]
+
+    def totals(self, start=None, end=None):
+        """Returns {(type, category): total amount} for start <= date < end."""
+        storage = self.storage()
+        if storage.indexed:
+            return storage.transaction_totals(
+                start.isoformat() if start else None,
+                end.isoformat() if end else None
+            )
+        return self.load().totals(start, end)
+
+    def monthly_totals(self):
+        """Returns per-(month, type, category) totals from the persisted rollup.
+
+        Storage saves the rollup at compaction and folds in the records
+        appended since, so this costs O(months x categories) plus the log
+        tail, and nothing at all while the storage fingerprint is unchanged.
+        If it is missing or stale it is rebuilt once from the cached table.
+        """
+        storage = self.storage()
+        fingerprint = storage.fingerprint()
+        if self._monthly is not None and self._monthly[0] == fingerprint:
+            return self._monthly[1]
+        rollup = storage.load_rollup()
+        if rollup is None:
+            rollup = aggregate(self.load()).sums
+            storage.save_rollup(rollup, source=self._fingerprint)
+        totals = MonthlyTotals(rollup)
+        self._monthly = (fingerprint, totals)
+        return totals
+
+    def recurring_index(self):
+        """Returns the persisted RecurringIndex of expense groups.
+
+        Like monthly_totals(), read once per storage fingerprint, so detecting
+        bills never rescans the history; a missing or stale index is rebuilt once.
+        """
+        storage = self.storage()
+        fingerprint = storage.fingerprint()
+        if self._recurring is not None and self._recurring[0] == fingerprint:
+            return self._recurring[1]
+        series = storage.load_recurring()
+        if series is None:
+            series = build_recurring(t.to_dict() for t in self.load())
+            storage.save_recurring(series, source=self._fingerprint)
+        index = RecurringIndex(series)
+        self._recurring = (fingerprint, index)
+        return index
+
+
+class TransactionListing:
+    """Newest-first view of the transactions matching a filter, read one page at a time.
+
+    SQLite pages with LIMIT/OFFSET; the JSON backend keeps the matching row
+    numbers from the date index and builds row views only for the page asked for.
+    """
+
+    def __init__(self, repository, start=None, end=None, transaction_type=None, category=None):
+        self.start = start
+        self.end = end
+        self.transaction_type = transaction_type
+        self.category = category
+        self._storage = storage = repository.storage()
+        if storage.indexed:
+            self._store = self._rows = None
+            self._total = storage.count_transactions(*self._iso_filters(start))
+        else:
+            self._store = repository.load()
+            self._rows = self._store.select(start, end, transaction_type, category)
+            self._total = len(self._rows)
+
+    def _iso_filters(self, start):
+        return (
+            start.isoformat() if start else None,
+            self.end.isoformat() if self.end else None,
+            self.transaction_type,
+            self.category
+        )
+
+    def __len__(self):
+        return self._total
+
+    def page(self, offset, limit):
+        """Returns up to limit transactions, skipping the offset newest ones."""
+        if self._rows is None:
+            records = self._storage.query_transaction_records(
+                *self._iso_filters(self.start), newest_first=True, limit=limit, offset=offset
+            )
+            return [transaction_from_dict(t) for t in records]
+
+        hi = self._total - offset
+        lo = max(hi - limit, 0)
+        if hi <= 0:
+            return []
+        return [self._store[row] for row in reversed(self._rows[lo:hi])]
+
+    def offset_of(self, day):
+        """Returns the offset of the newest matching transaction dated on or before day."""
+        if self._rows is None:
+            after = day + datetime.timedelta(days=1)
+            if self.start is not None and self.start > after:
+                after = self.start
+            return self._storage.count_transactions(*self._iso_filters(after))
+
+        on_or_before = bisect_right(self._rows, day.toordinal(), key=self._store.days.__getitem__)
+        return self._total - on_or_before
+
+
+# One repository per ledger, created on first use
+_repositories = {}
+_repositories_lock = threading.Lock()
+
+
+def get_repository(ledger=None):
+    """Returns the repository every module reads ledger's (default: the current ledger's) transactions through."""
+    ledger = ledger or current_ledger()
+    repository = _repositories.get(ledger)
+    if repository is None:
+        with _repositories_lock:
+            repository = _repositories.setdefault(ledger, TransactionRepository(ledger))
+    return repository
@@ -0,0 +1,126 @@
+import re
+from array import array
+from bisect import bisect_left, insort
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# More new tokens than this in one refresh re-sorts the vocabulary instead of inserting each
+VOCABULARY_RESORT_THRESHOLD = 64
+
+
+def tokenize(text):
+    """Lower-cased alphanumeric words of text."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query):
+    """Splits a query into terms; a trailing * on a term makes it a prefix match."""
+    terms = []
+    for word in query.lower().split():
+        tokens = tokenize(word)
+        terms += [(token, False) for token in tokens]
+        # Only this word's own last token becomes a prefix; a lone "*" widens nothing
+        if word.endswith("*") and tokens:
+            terms[-1] = (tokens[-1], True)
+    return terms
+
+
+class SearchIndex:
+    """Inverted index from description words to ColumnStore rows.
+
+    Descriptions are dictionary-encoded in the store, so postings go through
+    the distinct descriptions: token -> description codes -> rows. AND queries
+    intersect the small per-token code sets and only then expand to rows.
+    Rows and descriptions added to the store are picked up by refresh().
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.postings = {}  # token -> set of description codes
+        self.vocabulary = []  # sorted tokens, for prefix lookups
+        self.rows_by_code = []  # description code -> array of row numbers
+        self.indexed_codes = 0
+        self.indexed_rows = 0
+
+    def refresh(self):
+        """Indexes the descriptions and rows appended to the store since the last call."""
+        values = self.store.descriptions.values
+        new_tokens = []
+        for code in range(self.indexed_codes, len(values)):
+            for token in set(tokenize(values[code])):
+                codes = self.postings.get(token)
+                if codes is None:
+                    codes = self.postings[token] = set()
+                    new_tokens.append(token)
+                codes.add(code)
+            self.rows_by_code.append(array("I"))
+        self.indexed_codes = len(values)
+
+        if len(new_tokens) > VOCABULARY_RESORT_THRESHOLD:
+            self.vocabulary = sorted(self.postings)
+        else:
+            for token in new_tokens:
+                insort(self.vocabulary, token)
+
+        description_codes = self.store.description_codes
+        rows_by_code = self.rows_by_code
+        for row in range(self.indexed_rows, len(self.store)):
+            rows_by_code[description_codes[row]].append(row)
+        self.indexed_rows = len(self.store)
+
+    def _prefix_tokens(self, prefix):
+        """Yields the vocabulary tokens starting with prefix (a bisect plus a short scan)."""
+        for i in range(bisect_left(self.vocabulary, prefix), len(self.vocabulary)):
+            token = self.vocabulary[i]
+            if not token.startswith(prefix):
+                break
+            yield token
+
+    def matching_codes(self, query):
+        """Returns the description codes containing every term of query."""
+        terms = parse_query(query)
+        # Exact terms first, rarest first, so prefix expansions only intersect a small set
+        terms.sort(key=lambda term: (term[1], len(self.postings.get(term[0], ()))))
+        matches = None
+        for token, prefix in terms:
+            if not prefix:
+                codes = self.postings.get(token, set())
+                matches = set(codes) if matches is None else matches & codes
+            elif matches is None:
+                matches = set().union(*(self.postings[t] for t in self._prefix_tokens(token)))
+            else:
+                matches = set().union(*(matches & self.postings[t] for t in self._prefix_tokens(token)))
+            if not matches:
+                return set()
+        return matches or set()
+
+    def search(self, query, start=None, end=None, transaction_type=None, category=None):
+        """Returns the rows matching query and the filters (start <= date < end), newest first."""
+        codes = self.matching_codes(query)
+        if not codes:
+            return []
+
+        store = self.store
+        type_code = category_code = None
+        if transaction_type is not None:
+            type_code = store.types.code_of(transaction_type)
+            if type_code is None:
+                return []
+        if category is not None:
+            category_code = store.categories.code_of(category)
+            if category_code is None:
+                return []
+        lo = start.toordinal() if start else None
+        hi = end.toordinal() if end else None
+
+        days, type_codes, category_codes = store.days, store.type_codes, store.category_codes
+        rows = [
+            row
+            for code in codes
+            for row in self.rows_by_code[code]
+            if (lo is None or days[row] >= lo)
+            and (hi is None or days[row] < hi)
+            and (type_code is None or type_codes[row] == type_code)
+            and (category_code is None or category_codes[row] == category_code)
+        ]
+        rows.sort(key=lambda row: (days[row], row), reverse=True)
+        return rows
@@ -1,56 +1,123 @@
 import datetime
-import json
+import time
+from bisect import bisect_left
 import questionary
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 
-# In-memory database for transactions
-transactions = []
-TRANSACTIONS_FILE = "database/transactions.txt"
+from features.analytics.aggregation import type_total
+from features.storage.storage import get_storage
+from features.transactions.models import Transaction, to_paisa
+from features.transactions.repository import get_repository
 
 # Transaction categories
 EXPENSE_CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
 INCOME_CATEGORIES = ["Salary", "Freelance", "Business", "Investment", "Gift", "Other"]
 
-class Transaction:
-    def __init__(self, date, transaction_type, category, description, amount):
-        self.date = date
-        self.type = transaction_type
-        self.category = category
-        self.description = description
-        self.amount = amount  # Stored as an integer (paisa/cents)
-
-    def to_dict(self):
-        return {
-            "date": self.date.isoformat(),
-            "type": self.type,
-            "category": self.category,
-            "description": self.description,
-            "amount": self.amount
-        }
+# Rows shown per page by list_transactions
+PAGE_SIZE = 20
 
 def load_transactions():
-    """Loads transactions from the file."""
-    global transactions
-    try:
-        with open(TRANSACTIONS_FILE, "r") as f:
-            data = json.load(f)
-            transactions = [Transaction(
-                datetime.datetime.fromisoformat(t["date"]).date(),
-                t["type"],
-                t["category"],
-                t["description"],
-                t["amount"]
-            ) for t in data]
-    except (FileNotFoundError, json.JSONDecodeError):
-        transactions = []
-
-def save_transactions():
-    """Saves transactions to the file."""
-    with open(TRANSACTIONS_FILE, "w") as f:
-        json.dump([t.to_dict() for t in transactions], f, indent=4)
+    """Returns the shared transaction table by reference, re-reading storage only if it changed.
+
+    The table is replaced when storage changes, so call this rather than
+    keeping a reference across operations.
+    """
+    return get_repository().load()
+
+def save_transactions(transactions=None):
+    """Writes the given transactions (default: the shared table) back to storage, replacing it."""
+    repository = get_repository()
+    repository.save(repository.load() if transactions is None else transactions)
+
+def compact_transactions():
+    """Folds the append-only log into the snapshot file."""
+    get_storage().compact()
+
+def append_transaction(transaction):
+    """Stores a single transaction without rewriting the existing ones."""
+    get_repository().append(transaction)
+
+def append_transactions(new_transactions, compact=True):
+    """Stores a batch of transactions with one storage write."""
+    get_repository().append_many(new_transactions, compact)
+
+def query_transactions(start=None, end=None, transaction_type=None, category=None, newest_first=False):
+    """Returns transactions with start <= date < end matching the filters."""
+    return get_repository().query(start, end, transaction_type, category, newest_first)
+
+def iter_transaction_chunks(start=None, end=None, transaction_type=None, category=None, chunk_size=5000):
+    """Yields transactions with start <= date < end in date order, chunk_size at a time."""
+    return get_repository().iter_chunks(start, end, transaction_type, category, chunk_size)
+
+def recent_transactions(n=10):
+    """Returns the n newest transactions, newest first."""
+    return get_repository().recent(n)
+
+def transaction_totals(start=None, end=None):
+    """Returns {(type, category): total amount} for transactions with start <= date < end."""
+    return get_repository().totals(start, end)
+
+def monthly_totals():
+    """Returns MonthlyTotals read from the incrementally maintained monthly rollup."""
+    return get_repository().monthly_totals()
+
+def month_balance(month):
+    """Returns the income, expenses and balance of month's calendar month, in rupees/dollars."""
+    totals = monthly_totals().month_of(month)
+    income = type_total(totals, "Income")
+    expenses = type_total(totals, "Expense")
+    return {
+        "month": month.strftime("%Y-%m"),
+        "income": income / 100,
+        "expenses": expenses / 100,
+        "balance": (income - expenses) / 100,
+    }
+
+def transaction_summary(t):
+    """A JSON-ready dict of a transaction, with the amount in rupees/dollars."""
+    return {
+        "date": t.date.isoformat(),
+        "type": t.type,
+        "category": t.category,
+        "description": t.description,
+        "amount": t.amount / 100,
+    }
+
+def make_transaction(transaction_type, amount, category, description="", date=None):
+    """Builds a validated Transaction; amount is in paisa/cents and date defaults to today.
+
+    Raises ValueError for an unknown type or category or a non-positive amount.
+    """
+    categories = {"Expense": EXPENSE_CATEGORIES, "Income": INCOME_CATEGORIES}.get(transaction_type)
+    if categories is None:
+        raise ValueError(f"Unknown transaction type: {transaction_type}")
+    if category not in categories:
+        raise ValueError(f"Unknown {transaction_type.lower()} category: {category}")
+    if amount <= 0:
+        raise ValueError("Amount must be positive.")
+    return Transaction(date or datetime.date.today(), transaction_type, category, description, amount)
+
+def record_transaction(transaction_type, amount, category, description="", date=None):
+    """Validates and stores one transaction without prompting; returns it."""
+    transaction = make_transaction(transaction_type, amount, category, description, date)
+    append_transaction(transaction)
+    return transaction
+
+def rolling_totals():
+    """Returns RollingTotals for O(log n) "last N days" / "month to date" style window sums."""
+    return get_repository().rolling_totals()
+
+def spending_anomalies():
+    """Returns SpendingAnomalies, which flags expenses far above their category's running mean."""
+    return get_repository().spending_anomalies()
+
+def recurring_bills(today=None):
+    """Returns the active RecurringBills detected from repeated expenses, soonest due first."""
+    return get_repository().recurring_index().bills(today)
 
 def add_expense():
     """Adds an expense transaction."""
@@ -58,12 +125,12 @@ def add_expense():
     try:
         amount_str = questionary.text(
             "Enter the expense amount:",
-            validate=lambda text: text.isdigit() and float(text) > 0,
+            validate=_is_positive_amount,
             qmark="[?]"
         ).ask()
         if amount_str is None: return
 
-        amount = int(float(amount_str) * 100)
+        amount = to_paisa(amount_str)
 
         category = questionary.select(
             "Select an expense category:",
@@ -84,9 +151,7 @@ def add_expense():
 
         date = datetime.datetime.now().date() if not date_str else datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
 
-        new_transaction = Transaction(date, "Expense", category, description, amount)
-        transactions.append(new_transaction)
-        save_transactions()
+        record_transaction("Expense", amount, category, description, date)
         console.print("[bold green]Expense added successfully![/bold green]")
     except (ValueError, TypeError):
         console.print("[bold red]Invalid input. Please try again.[/bold red]")
@@ -97,12 +162,12 @@ def add_income():
     try:
         amount_str = questionary.text(
             "Enter the income amount:",
-            validate=lambda text: text.isdigit() and float(text) > 0,
+            validate=_is_positive_amount,
             qmark="[?]"
         ).ask()
         if amount_str is None: return
 
-        amount = int(float(amount_str) * 100)
+        amount = to_paisa(amount_str)
 
         category = questionary.select(
             "Select an income category:",
@@ -123,19 +188,52 @@ def add_income():
 
         date = datetime.datetime.now().date() if not date_str else datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
 
-        new_transaction = Transaction(date, "Income", category, description, amount)
-        transactions.append(new_transaction)
-        save_transactions()
+        record_transaction("Income", amount, category, description, date)
         console.print("[bold green]Income added successfully![/bold green]")
     except (ValueError, TypeError):
         console.print("[bold red]Invalid input. Please try again.[/bold red]")
 
+def _is_positive_amount(text):
+    try:
+        return to_paisa(text) > 0
+    except ValueError:
+        return False
+
+def _is_date(text):
+    try:
+        datetime.date.fromisoformat(text)
+        return True
+    except ValueError:
+        return False
+
+def render_transactions_page(transactions_page, title):
+    """Builds a table holding only the rows of one page."""
+    table = Table(title=title)
+    table.add_column("Date", style="cyan")
+    table.add_column("Type", style="magenta")
+    table.add_column("Category", style="yellow")
+    table.add_column("Description", style="green")
+    table.add_column("Amount", justify="right", style="bold")
+
+    for t in transactions_page:
+        amount_str = f"{t.amount / 100:.2f}"
+        style = "red" if t.type == "Expense" else "green"
+        table.add_row(
+            t.date.strftime("%Y-%m-%d"),
+            t.type,
+            t.category,
+            # Descriptions are user text, not rich markup
+            Text(t.description),
+            Text(amount_str, style=style)
+        )
+    return table
+
 def list_transactions():
-    """Lists all transactions."""
-    load_transactions()
+    """Lists transactions newest first, one page at a time."""
     console = Console()
+    repository = get_repository()
 
-    if not transactions:
+    if not repository.has_transactions():
         console.print("[bold yellow]No transactions found.[/bold yellow]")
         return
 
@@ -144,51 +242,137 @@ def list_transactions():
         choices=["All", "Last 7 days", "Expenses only", "Income only"],
         qmark="[?]"
     ).ask()
+    if filter_choice is None: return
 
-    filtered_transactions = transactions
     today = datetime.date.today()
 
+    # Filters are handed to the storage backend so SQLite can answer them from its indexes
     if filter_choice == "Last 7 days":
         seven_days_ago = today - datetime.timedelta(days=7)
-        filtered_transactions = [t for t in transactions if t.date >= seven_days_ago]
+        listing = repository.listing(start=seven_days_ago)
     elif filter_choice == "Expenses only":
-        filtered_transactions = [t for t in transactions if t.type == "Expense"]
+        listing = repository.listing(transaction_type="Expense")
     elif filter_choice == "Income only":
-        filtered_transactions = [t for t in transactions if t.type == "Income"]
+        listing = repository.listing(transaction_type="Income")
+    else:
+        listing = repository.listing()
 
-    table = Table(title="Transactions")
-    table.add_column("Date", style="cyan")
-    table.add_column("Type", style="magenta")
-    table.add_column("Category", style="yellow")
-    table.add_column("Description", style="green")
-    table.add_column("Amount", justify="right", style="bold")
+    total = len(listing)
+    if not total:
+        console.print("[bold yellow]No transactions found.[/bold yellow]")
+        return
 
-    for t in sorted(filtered_transactions, key=lambda x: x.date, reverse=True):
-        amount_str = f"{t.amount / 100:.2f}"
-        style = "red" if t.type == "Expense" else "green"
-        table.add_row(
-            t.date.strftime("%Y-%m-%d"),
-            t.type,
-            t.category,
-            t.description,
-            Text(amount_str, style=style)
-        )
-    
-    console.print(table)
+    page_through(console, "Transactions", total, listing.page, listing.offset_of)
+
+def page_through(console, title, total, page, offset_of):
+    """Shows total newest-first transactions PAGE_SIZE at a time until the user goes back.
+
+    page(offset, limit) returns one page; offset_of(day) is the offset of the
+    newest transaction dated on or before day, for Jump to Date, which opens
+    the page holding it. Only the page shown is rendered, but whether the
+    rows behind page() are read lazily is up to the caller.
+    """
+    offset = 0
+    while True:
+        transactions_page = page(offset, PAGE_SIZE)
+        page_number = offset // PAGE_SIZE + 1
+        page_count = (total + PAGE_SIZE - 1) // PAGE_SIZE
+        console.print(render_transactions_page(
+            transactions_page,
+            f"{title} {offset + 1}-{offset + len(transactions_page)} of {total} "
+            f"(page {page_number}/{page_count})"
+        ))
+
+        choices = []
+        if offset + PAGE_SIZE < total:
+            choices.append("Next Page")
+        if offset > 0:
+            choices.append("Previous Page")
+        if page_count > 1:
+            choices += ["Jump to Date", "First Page", "Last Page"]
+        choices.append("Back")
+
+        action = questionary.select("Navigate:", choices=choices, qmark="[?]").ask()
+        if action == "Next Page":
+            offset += PAGE_SIZE
+        elif action == "Previous Page":
+            offset = max(offset - PAGE_SIZE, 0)
+        elif action == "First Page":
+            offset = 0
+        elif action == "Last Page":
+            offset = (page_count - 1) * PAGE_SIZE
+        elif action == "Jump to Date":
+            date_str = questionary.text(
+                "Show transactions on or before (YYYY-MM-DD):",
+                validate=lambda text: _is_date(text) or "Please enter a date as YYYY-MM-DD.",
+                qmark="[?]"
+            ).ask()
+            if date_str:
+                offset = min(offset_of(datetime.date.fromisoformat(date_str)), total - 1)
+                # Stay on page boundaries so the page number and Next/Previous stay consistent
+                offset -= offset % PAGE_SIZE
+        else:
+            break
+
+def search_transactions():
+    """Finds transactions by words in their description.
+
+    Every match is collected into a list up front (the search index answers
+    in one pass); only the paging through that list is done a page at a time.
+    """
+    console = Console()
+
+    query = questionary.text(
+        "Search descriptions (all words must match, end a word with * for prefix):",
+        qmark="[?]"
+    ).ask()
+    if not query or not query.strip():
+        return
+
+    filter_choice = questionary.select(
+        "Filter results by:",
+        choices=["All", "Last 7 days", "Last 30 days", "Expenses only", "Income only"],
+        qmark="[?]"
+    ).ask()
+    if filter_choice is None: return
+
+    today = datetime.date.today()
+    start = transaction_type = None
+    if filter_choice == "Last 7 days":
+        start = today - datetime.timedelta(days=7)
+    elif filter_choice == "Last 30 days":
+        start = today - datetime.timedelta(days=30)
+    elif filter_choice == "Expenses only":
+        transaction_type = "Expense"
+    elif filter_choice == "Income only":
+        transaction_type = "Income"
+
+    started = time.perf_counter()
+    results = get_repository().search(query, start=start, transaction_type=transaction_type)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if not results:
+        console.print(f"[bold yellow]No transactions match '{escape(query)}'.[/bold yellow]")
+        return
+
+    console.print(f"[dim]{len(results)} matches in {elapsed_ms:.1f} ms[/dim]")
+    page_through(
+        console,
+        f"Matches for '{escape(query)}'",
+        len(results),
+        lambda offset, limit: results[offset:offset + limit],
+        # Results are newest first: count the ones dated after day
+        lambda day: bisect_left(results, -day.toordinal(), key=lambda t: -t.date.toordinal())
+    )
 
-from rich.text import Text
 def show_balance():
     """Shows the current balance for the current month."""
-    load_transactions()
     console = Console()
 
-    today = datetime.date.today()
-    current_month_transactions = [
-        t for t in transactions if t.date.year == today.year and t.date.month == today.month
-    ]
+    totals = monthly_totals().month_of(datetime.date.today())
 
-    total_income = sum(t.amount for t in current_month_transactions if t.type == "Income")
-    total_expenses = sum(t.amount for t in current_month_transactions if t.type == "Expense")
+    total_income = type_total(totals, "Income")
+    total_expenses = type_total(totals, "Expense")
     balance = total_income - total_expenses
 
     total_income_str = f"{total_income / 100:.2f}"
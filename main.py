@@ -1,32 +1,52 @@
+import argparse
+import importlib
+
 import questionary
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
-# Import Transactions
-from features.transactions.transactions import (
-    add_expense,
-    add_income,
-    list_transactions,
-    show_balance,
-)
+console = Console()
 
-# Import Analytics
-from features.analytics.analytics import display_analytics_menu
 
-# Import Smart Assistant
-from features.smart_assistant.smart_assistant import display_smart_assistant_menu
+class LazyAction:
+    """Menu action naming a feature function by module path.
 
-# Import Data Management
-from features.data_management.data_management import display_data_management_menu
+    The feature module is imported the first time the action is chosen, so
+    startup only pays for questionary and rich.
+    """
 
-# Import Budgets
-from features.budgets.budgets import (
-    set_budget,
-    view_budgets
-)
+    def __init__(self, module_name, function_name):
+        self.module_name = module_name
+        self.function_name = function_name
+        self._function = None
 
-console = Console()
+    def __call__(self):
+        if self._function is None:
+            module = importlib.import_module(self.module_name)
+            self._function = getattr(module, self.function_name)
+        return self._function()
+
+
+def lazy(path):
+    """Builds a LazyAction from "package.module:function"."""
+    module_name, function_name = path.split(":")
+    return LazyAction(module_name, function_name)
+
+
+# Menu registries: choice label -> action
+TRANSACTION_MENU = {
+    "Add Expense": lazy("features.transactions.transactions:add_expense"),
+    "Add Income": lazy("features.transactions.transactions:add_income"),
+    "List Transactions": lazy("features.transactions.transactions:list_transactions"),
+    "Search Transactions": lazy("features.transactions.transactions:search_transactions"),
+    "Show Balance": lazy("features.transactions.transactions:show_balance"),
+}
+
+BUDGET_MENU = {
+    "Set a Budget": lazy("features.budgets.budgets:set_budget"),
+    "View Budgets": lazy("features.budgets.budgets:view_budgets"),
+}
 
 
 def display_welcome_message():
@@ -34,53 +54,36 @@ def display_welcome_message():
     console.print(Panel(welcome_text, border_style="blue"))
 
 
-def manage_transactions():
+def run_submenu(title, menu):
+    """Shows a registry-driven menu until "Back to Main Menu" is chosen."""
     while True:
         choice = questionary.select(
-            "Transaction Management",
-            choices=[
-                "Add Expense",
-                "Add Income",
-                "List Transactions",
-                "Show Balance",
-                "Back to Main Menu"
-            ]
+            title,
+            choices=list(menu) + ["Back to Main Menu"]
         ).ask()
 
-        if choice == "Add Expense":
-            add_expense()
-        elif choice == "Add Income":
-            add_income()
-        elif choice == "List Transactions":
-            list_transactions()
-        elif choice == "Show Balance":
-            show_balance()
-        elif choice == "Back to Main Menu":
+        if choice in menu:
+            menu[choice]()
+        else:
             break
 
 
+def manage_transactions():
+    run_submenu("Transaction Management", TRANSACTION_MENU)
+
+
 def manage_budgets():
     """Budget management menu"""
-    while True:
-        choice = questionary.select(
-            "Budget Management",
-            choices=[
-                "Set a Budget",
-                "View Budgets",
-                "Back to Main Menu"
-            ]
-        ).ask()
-
-        if choice == "Set a Budget":
-            set_budget()
-        elif choice == "View Budgets":
-            view_budgets()
-        elif choice == "Back to Main Menu":
-            break
+    run_submenu("Budget Management", BUDGET_MENU)
 
 
-def manage_analytics():
-    display_analytics_menu()
+MAIN_MENU = {
+    "Manage Transactions": manage_transactions,
+    "Manage Budgets": manage_budgets,
+    "View Analytics": lazy("features.analytics.analytics:display_analytics_menu"),
+    "Smart Assistant": lazy("features.smart_assistant.smart_assistant:display_smart_assistant_menu"),
+    "Data Management": lazy("features.data_management.data_management:display_data_management_menu"),
+}
 
 
 def main_menu():
@@ -89,33 +92,23 @@ def main_menu():
 
         choice = questionary.select(
             "What would you like to do?",
-            choices=[
-                "Manage Transactions",
-                "Manage Budgets",
-                "View Analytics",
-                "Smart Assistant",
-                "Data Management",
-                "Exit"
-            ]
+            choices=list(MAIN_MENU) + ["Exit"]
         ).ask()
 
-        if choice == "Manage Transactions":
-            manage_transactions()
-        elif choice == "Manage Budgets":
-            manage_budgets()
-        elif choice == "View Analytics":
-            manage_analytics()
-        elif choice == "Smart Assistant":
-            display_smart_assistant_menu()
-        elif choice == "Data Management":
-            display_data_management_menu()
-        elif choice == "Exit":
+        if choice in MAIN_MENU:
+            MAIN_MENU[choice]()
+        else:
             console.print(Panel(Text("Thank you for using Personal Finance Tracker!",
                                      justify="center", style="bold green"), border_style="blue"))
             break
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Personal Finance Tracker")
+    parser.add_argument("--ledger", help="Ledger to work on (default: FINANCE_TRACKER_LEDGER or 'default')")
+    args = parser.parse_args()
+    if args.ledger:
+        # Only imported when needed, so a plain start stays as light as before
+        from features.storage.storage import set_default_ledger
+        set_default_ledger(args.ledger)
     main_menu()
-
-
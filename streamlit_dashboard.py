@@ -1,15 +1,9 @@
 import streamlit as st
 import datetime
-import pandas as pd
 
-from features.transactions.transactions import (
-    load_transactions,
-    transactions,
-    EXPENSE_CATEGORIES,
-    INCOME_CATEGORIES
-)
-
-from features.budgets.budgets import load_budgets, budgets
+from features.analytics.report_cache import get_report
+from features.storage.storage import current_ledger, get_storage, list_ledgers, using_ledger
+from features.transactions.transactions import recent_transactions
 
 
 st.set_page_config(layout="centered", page_title="Personal Finance Tracker Dashboard")
@@ -32,24 +26,60 @@ def color_amount(row):
     return [f'color: {color}' for _ in row.index]
 
 
+@st.cache_resource
+def dashboard_storage(ledger):
+    """Storage backend of a ledger, shared by every session and rerun."""
+    return get_storage(ledger)
+
+
+@st.cache_data(max_entries=8)
+def load_snapshot(ledger, data_version, today):
+    """Pre-aggregated, pre-sorted dashboard data for one version of a ledger's stored data.
+
+    Streamlit re-runs main() on every widget interaction; as long as no data
+    file changed, those reruns get this cached snapshot without touching storage.
+    """
+    import pandas as pd  # only needed for the recent transactions table
+
+    recent = pd.DataFrame([{
+        "Date": t.date.isoformat(),
+        "Type": t.type,
+        "Category": t.category,
+        "Description": t.description,
+        "Amount": t.amount / 100,
+    } for t in recent_transactions(10)])
+
+    return {
+        "report": get_report("comprehensive", today),
+        "recent": recent,
+    }
+
+
 def main():
     st.title("Personal Finance Tracker Dashboard")
 
-    # Load data
-    load_transactions()
-    load_budgets()
+    # Each session picks its ledger; the rest of this run reads only that ledger's shard
+    ledgers = list_ledgers()
+    default = current_ledger()
+    ledger = st.sidebar.selectbox("Ledger", ledgers, index=ledgers.index(default) if default in ledgers else 0)
+    with using_ledger(ledger):
+        render_dashboard(ledger)
+
 
+def render_dashboard(ledger):
+    # Cached per ledger and data version, so reruns cost a stat() or a PRAGMA
     today = datetime.date.today()
-    month_start = today.replace(day=1)
+    snapshot = load_snapshot(ledger, dashboard_storage(ledger).data_version(), today)
 
     # =======================
     # BALANCE SECTION
     # =======================
     st.header("Balance Overview")
 
-    income = sum(t.amount for t in transactions if t.type == "Income" and t.date >= month_start)
-    expenses = sum(t.amount for t in transactions if t.type == "Expense" and t.date >= month_start)
-    balance = income - expenses
+    report = snapshot["report"]
+    income = report.income
+    expenses = report.expenses
+    balance = report.savings
 
     c1, c2, c3 = st.columns(3)
 
@@ -71,13 +101,9 @@ def main():
     # =======================
     st.header("Budgets This Month")
 
-    if budgets:
-        for category, b in budgets.items():
-            spent = sum(t.amount for t in transactions
-                        if t.type == "Expense" and t.category == category and t.date >= month_start)
-
-            remaining = b.amount - spent
-            pct = (spent / b.amount) * 100 if b.amount > 0 else 0
+    if report.budgets:
+        for status in report.budgets:
+            pct = status.utilization
 
             color = "green"
             if pct >= 100:
@@ -85,11 +111,11 @@ def main():
             elif pct >= 70:
                 color = "orange"
 
-            st.subheader(category)
+            st.subheader(status.category)
             st.markdown(
-                f"Budget: **Rs {b.amount/100:.2f}** | "
-                f"Spent: <span style='color:{color}; font-weight:bold;'>Rs {spent/100:.2f}</span> | "
-                f"Remaining: **Rs {remaining/100:.2f}**",
+                f"Budget: **Rs {status.budgeted/100:.2f}** | "
+                f"Spent: <span style='color:{color}; font-weight:bold;'>Rs {status.spent/100:.2f}</span> | "
+                f"Remaining: **Rs {status.remaining/100:.2f}**",
                 unsafe_allow_html=True
             )
 
@@ -103,17 +129,8 @@ def main():
     # =======================
     st.header("Recent Transactions")
 
-    if transactions:
-        tx = sorted(transactions, key=lambda t: t.date, reverse=True)[:10]
-
-        df = pd.DataFrame([{
-            "Date": t.date.isoformat(),
-            "Type": t.type,
-            "Category": t.category,
-            "Description": t.description,
-            "Amount": t.amount / 100,
-        } for t in tx])
-
+    df = snapshot["recent"]
+    if not df.empty:
         st.dataframe(df.style.apply(color_amount, axis=1), use_container_width=True)
     else:
         st.info("No transactions recorded yet.")
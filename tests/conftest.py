@@ -0,0 +1,19 @@
+import pytest
+
+from features.budgets import budgets as budgets_module
+from features.smart_assistant import smart_assistant as smart_assistant_module
+from features.storage import storage as storage_module
+from features.transactions import repository as repository_module
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def ledger_dir(request, tmp_path, monkeypatch):
+    """Runs the test in an empty data directory on each backend, with no storage or repository cached."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(storage_module.STORAGE_ENV_VAR, request.param)
+    monkeypatch.delenv(storage_module.LEDGER_ENV_VAR, raising=False)
+    monkeypatch.setattr(storage_module, "_storages", {})
+    monkeypatch.setattr(repository_module, "_repositories", {})
+    monkeypatch.setattr(budgets_module, "_ledger_budgets", {})
+    monkeypatch.setattr(smart_assistant_module, "_ledger_goals", {})
+    return tmp_path
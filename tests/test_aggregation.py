@@ -0,0 +1,92 @@
+import datetime
+import random
+
+import pytest
+
+from features.analytics import aggregation
+from features.analytics.aggregation import _aggregate_numpy, _aggregate_python, aggregate, by_category, type_total
+from features.transactions.columnar import ColumnStore
+from features.transactions.models import Transaction
+
+# Month edges on both sides of the 1970-01-01 numpy epoch, and the ends of the date range
+EDGE_DAYS = [
+    datetime.date(1, 1, 1), datetime.date(1899, 12, 31), datetime.date(1900, 1, 1), datetime.date(1969, 12, 31),
+    datetime.date(1970, 1, 1), datetime.date(1970, 1, 31), datetime.date(1970, 2, 1), datetime.date(2000, 2, 29),
+    datetime.date(2026, 12, 31), datetime.date(9999, 12, 31),
+]
+TYPES = ["Expense", "Income", "Transfer"]
+CATEGORIES = ["Food", "Salary", "Bills", "Other", "Ünïcode"]
+
+
+def mixed_transactions(count, seed):
+    rng = random.Random(seed)
+    first, last = datetime.date(1, 1, 1).toordinal(), datetime.date(9999, 12, 31).toordinal()
+    transactions = []
+    for i in range(count):
+        if i % 4 == 0:
+            day = rng.choice(EDGE_DAYS)
+        elif i % 4 == 1:
+            day = datetime.date.fromordinal(rng.randint(first, last))
+        else:
+            day = datetime.date(1969, 12, 1) + datetime.timedelta(days=rng.randint(0, 90))
+        transactions.append(Transaction(day, rng.choice(TYPES), rng.choice(CATEGORIES), "", rng.randint(1, 10 ** 12)))
+    return transactions
+
+
+def brute_force(transactions):
+    sums = {}
+    for t in transactions:
+        key = (t.date.year, t.date.month, t.type, t.category)
+        sums[key] = sums.get(key, 0) + t.amount
+    return sums
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_numpy_and_python_passes_agree(seed):
+    np = pytest.importorskip("numpy")
+    transactions = mixed_transactions(3000, seed)
+    store = ColumnStore.from_transactions(transactions)
+    expected = brute_force(transactions)
+    assert _aggregate_python(store) == expected
+    assert _aggregate_numpy(store, np) == expected
+
+
+def test_pre_epoch_months_are_not_shifted():
+    np = pytest.importorskip("numpy")
+    transactions = [Transaction(day, "Expense", "Food", "", 100) for day in EDGE_DAYS]
+    store = ColumnStore.from_transactions(transactions)
+    sums = _aggregate_numpy(store, np)
+    assert set(sums) == {(day.year, day.month, "Expense", "Food") for day in EDGE_DAYS}
+    assert sums[(1970, 1, "Expense", "Food")] == 200
+    assert sums == _aggregate_python(store)
+
+
+def test_amounts_beyond_int64_fall_back_to_the_python_pass():
+    transactions = mixed_transactions(200, seed=7)
+    transactions.append(Transaction(datetime.date(1950, 6, 1), "Income", "Salary", "", 2 ** 70))
+    store = ColumnStore.from_transactions(transactions)
+    assert isinstance(store.amounts, list)
+    assert aggregate(store).sums == brute_force(transactions)
+
+
+def test_aggregate_without_numpy(monkeypatch):
+    monkeypatch.setattr(aggregation, "_np", False)
+    transactions = mixed_transactions(500, seed=3)
+    assert aggregate(ColumnStore.from_transactions(transactions)).sums == brute_force(transactions)
+
+
+def test_monthly_totals_views():
+    transactions = [
+        Transaction(datetime.date(1969, 12, 31), "Income", "Salary", "", 1000),
+        Transaction(datetime.date(1969, 12, 1), "Expense", "Food", "", 300),
+        Transaction(datetime.date(1969, 12, 15), "Expense", "Bills", "", 200),
+        Transaction(datetime.date(1970, 1, 1), "Expense", "Food", "", 50),
+    ]
+    totals = aggregate(ColumnStore.from_transactions(transactions))
+    december = totals.month(1969, 12)
+    assert type_total(december, "Expense") == 500
+    assert by_category(december, "Expense") == {"Food": 300, "Bills": 200}
+    assert totals.month_of(datetime.date(1970, 1, 20)) == {("Expense", "Food"): 50}
+    assert totals.month(1971, 1) == {}
+    assert totals.overall() == {("Income", "Salary"): 1000, ("Expense", "Food"): 350, ("Expense", "Bills"): 200}
+    assert aggregate(ColumnStore()).sums == {}
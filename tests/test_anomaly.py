@@ -0,0 +1,114 @@
+import datetime
+import math
+import random
+import statistics
+
+import pytest
+
+from features.analytics.anomaly import MIN_SAMPLES, Z_THRESHOLD, RunningStats, SpendingAnomalies
+from features.transactions.columnar import ColumnStore
+from features.transactions.models import Transaction
+
+BASE = datetime.date(2026, 1, 1)
+# Alternating history: log amounts with a known mean and standard deviation
+HISTORY = [10000, 20000] * (MIN_SAMPLES // 2)
+
+
+def expense(amount, category="Food", day=0, transaction_type="Expense"):
+    return Transaction(BASE + datetime.timedelta(days=day), transaction_type, category, "", amount)
+
+
+def anomalies(transactions):
+    detector = SpendingAnomalies(ColumnStore.from_transactions(transactions))
+    detector.refresh()
+    return detector
+
+
+def flagged_amounts(detector):
+    return [t.amount for t, _ in detector.unusual()]
+
+
+def threshold_amount(history):
+    logs = [math.log(a) for a in history]
+    return math.exp(statistics.mean(logs) + Z_THRESHOLD * statistics.stdev(logs))
+
+
+def test_running_stats_match_statistics():
+    rng = random.Random(3)
+    values = [rng.uniform(0, 10) for _ in range(50)]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.count == 50
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.variance == pytest.approx(statistics.variance(values))
+    assert stats.zscore(stats.mean + stats.stddev) == pytest.approx(1.0)
+
+
+def test_single_value_has_no_spread():
+    stats = RunningStats()
+    stats.add(5.0)
+    assert (stats.variance, stats.zscore(100.0)) == (0.0, 0.0)
+
+
+@pytest.mark.parametrize("offset, flagged", [(-1, False), (1, True)])
+def test_z_threshold_boundary(offset, flagged):
+    amount = (math.floor if offset < 0 else math.ceil)(threshold_amount(HISTORY)) + offset
+    detector = anomalies([expense(a, day=i) for i, a in enumerate(HISTORY)] + [expense(amount, day=30)])
+    assert flagged_amounts(detector) == ([amount] if flagged else [])
+    if flagged:
+        [(_, z)] = detector.unusual()
+        assert z >= Z_THRESHOLD
+
+
+@pytest.mark.parametrize("samples, flagged", [(MIN_SAMPLES - 1, False), (MIN_SAMPLES, True)])
+def test_minimum_samples(samples, flagged):
+    history = [10000, 20000] * samples
+    detector = anomalies([expense(a) for a in history[:samples]] + [expense(10 ** 9, day=1)])
+    assert bool(flagged_amounts(detector)) == flagged
+
+
+def test_categories_are_scored_separately():
+    transactions = [expense(a, "Food") for a in HISTORY] + [expense(a * 100, "Bills") for a in HISTORY]
+    # Normal for Bills, far above Food, and a first-ever Health expense
+    transactions += [expense(1500000, "Bills", day=5), expense(1500000, "Food", day=6), expense(10 ** 9, "Health", day=7)]
+    detector = anomalies(transactions)
+    assert [(t.category, t.amount) for t, _ in detector.unusual()] == [("Food", 1500000)]
+    assert detector.category_stats("Health").count == 1
+    assert detector.category_stats("Travel") is None
+
+
+def test_income_is_ignored():
+    detector = anomalies([expense(a) for a in HISTORY] + [expense(10 ** 9, "Salary", 1, "Income")])
+    assert detector.unusual() == []
+    assert detector.category_stats("Salary") is None
+
+
+def test_unusual_filters_by_date_newest_first():
+    # A long history, so one outlier does not widen the spread enough to hide the next
+    transactions = [expense(a) for a in HISTORY * 10] + [expense(10 ** 8, day=d) for d in (3, 9, 20)]
+    detector = anomalies(transactions)
+    assert [t.date.day for t, _ in detector.unusual()] == [21, 10, 4]
+    window = detector.unusual(BASE + datetime.timedelta(days=9), BASE + datetime.timedelta(days=20))
+    assert [t.date.day for t, _ in window] == [10]
+
+
+def test_incremental_refresh_matches_a_full_build():
+    rng = random.Random(7)
+    transactions = [
+        expense(int(rng.lognormvariate(8, 1 if rng.random() < 0.95 else 3)) + 1, rng.choice(["Food", "Bills", "Other"]), rng.randint(0, 90))
+        for _ in range(2000)
+    ]
+    full = anomalies(transactions)
+
+    incremental = SpendingAnomalies(ColumnStore())
+    for i in range(0, len(transactions), 137):
+        incremental.store.extend(transactions[i:i + 137])
+        incremental.refresh()
+
+    assert full.flagged
+    assert [row for row, _ in incremental.flagged] == [row for row, _ in full.flagged]
+    assert [z for _, z in incremental.flagged] == pytest.approx([z for _, z in full.flagged])
+    for category in ("Food", "Bills", "Other"):
+        a, b = full.category_stats(category), incremental.category_stats(category)
+        assert (a.count, a.mean, a.variance) == (b.count, pytest.approx(b.mean), pytest.approx(b.variance))
@@ -0,0 +1,172 @@
+import asyncio
+import json
+
+import pytest
+
+import api
+from features.storage.storage import get_storage
+
+
+def call(method, path, body=None, ledger=None, query=""):
+    """Runs one request through the ASGI app; returns (status, payload)."""
+    headers = [(b"x-ledger", ledger.encode())] if ledger else []
+    raw = body if isinstance(body, bytes) else (json.dumps(body).encode() if body is not None else b"")
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode(), "headers": headers}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": raw, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(api.app(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+@pytest.fixture(autouse=True)
+def fresh_locks(monkeypatch):
+    # Each asyncio.run() is a new event loop; locks must not outlive theirs
+    monkeypatch.setattr(api, "_ledger_locks", {})
+
+
+def test_readers_share_the_lock_and_writers_hold_it_alone():
+    events = []
+
+    async def reader(lock, name, started):
+        async with lock.reading():
+            events.append(f"{name} in")
+            started.set()
+            await asyncio.sleep(0.01)
+            events.append(f"{name} out")
+
+    async def writer(lock):
+        async with lock.writing():
+            events.append("writer in")
+            await asyncio.sleep(0.01)
+            events.append("writer out")
+
+    async def scenario():
+        lock = api.ReadWriteLock()
+        first = asyncio.Event()
+        tasks = [asyncio.create_task(reader(lock, "r1", first)), asyncio.create_task(reader(lock, "r2", asyncio.Event()))]
+        await first.wait()
+        tasks.append(asyncio.create_task(writer(lock)))
+        await asyncio.sleep(0)
+        # Arrives while the writer waits, so it goes after it
+        tasks.append(asyncio.create_task(reader(lock, "r3", asyncio.Event())))
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert events[:2] == ["r1 in", "r2 in"]
+    assert events[4:] == ["writer in", "writer out", "r3 in", "r3 out"]
+
+
+def test_cancelled_writer_lets_readers_in():
+    async def scenario():
+        lock = api.ReadWriteLock()
+        async with lock.reading():
+            waiting = asyncio.create_task(lock.writing().__aenter__())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+        async with lock.reading():
+            return True
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 1))
+
+
+def test_add_and_list_transactions(ledger_dir):
+    status, payload = call("POST", "/transactions", {"type": "Expense", "amount": 12.5, "category": "Food", "date": "2026-03-04"})
+    assert status == 201 and payload["ok"]
+    status, payload = call("GET", "/transactions")
+    assert status == 200
+    assert payload["result"]["total"] == 1
+    assert payload["result"]["transactions"][0]["amount"] == 12.5
+
+
+@pytest.mark.parametrize("method, path, body, query, status", [
+    ("GET", "/nowhere", None, "", 404),
+    ("DELETE", "/transactions", None, "", 405),
+    ("GET", "/transactions", None, "from=yesterday", 400),
+    ("GET", "/transactions", None, "limit=100000", 400),
+    ("GET", "/transactions", None, "offset=-1", 400),
+    ("GET", "/balance", None, "month=2026-13", 400),
+    ("GET", "/reports/nope", None, "", 404),
+    ("POST", "/transactions", b"{not json", "", 400),
+    ("POST", "/transactions", [1, 2], "", 400),
+    ("POST", "/transactions", {"type": "Expense", "category": "Food"}, "", 400),
+    ("POST", "/transactions", {"type": "Expense", "amount": "abc", "category": "Food"}, "", 400),
+    ("POST", "/transactions", {"type": "Expense", "amount": -5, "category": "Food"}, "", 400),
+    ("POST", "/transactions", {"type": "Loan", "amount": 5, "category": "Food"}, "", 400),
+    ("POST", "/transactions", {"type": "Expense", "amount": 5, "category": "Food", "date": "03/04/2026"}, "", 400),
+    ("POST", "/transactions", {"type": ["Expense"], "amount": 5, "category": "Food"}, "", 400),
+    ("POST", "/transactions", {"type": "Expense", "amount": 5, "category": {"name": "Food"}}, "", 400),
+    ("POST", "/transactions", {"type": "Expense", "amount": 5, "category": "Food", "description": 7}, "", 400),
+    ("POST", "/transactions", {"type": "Expense", "amount": 5, "category": "Food", "date": 20260304}, "", 400),
+    ("POST", "/transactions", {"type": "Expense", "amount": True, "category": "Food"}, "", 400),
+    ("POST", "/transactions", {"type": "Expense", "amount": 10 ** 400, "category": "Food"}, "", 400),
+    ("POST", "/transactions", {"type": "Expense", "amount": 1e300, "category": "Food"}, "", 400),
+    ("PUT", "/budgets/Rent", {"amount": 5}, "", 404),
+    ("PUT", "/budgets/Food", {"amount": 0}, "", 400),
+    ("PUT", "/budgets/Food", {"amount": "inf"}, "", 400),
+    ("PUT", "/budgets/Food", {"amount": "nan"}, "", 400),
+    ("PUT", "/budgets/Food", b'{"amount": Infinity}', "", 400),
+    ("PUT", "/budgets/Food", b'{"amount": NaN}', "", 400),
+])
+def test_rejected_requests(ledger_dir, method, path, body, query, status):
+    got, payload = call(method, path, body, query=query)
+    assert got == status
+    assert payload["ok"] is False and payload["error"]
+
+
+def test_invalid_ledger_name(ledger_dir):
+    assert call("GET", "/health", ledger="../etc")[0] == 400
+
+
+def test_reads_on_unknown_ledgers_are_rejected(ledger_dir):
+    status, payload = call("GET", "/balance", ledger="nobody")
+    assert status == 404 and "nobody" in payload["error"]
+    assert "nobody" not in api.list_ledgers()
+    assert "nobody" not in api._ledger_locks
+
+    # A write creates the ledger, which can then be read
+    assert call("PUT", "/budgets/Food", {"amount": 100}, ledger="nobody")[0] == 200
+    assert call("GET", "/budgets", ledger="nobody")[1]["result"]["Food"]["budgeted"] == 100
+
+
+def test_ledger_locks_are_bounded(ledger_dir, monkeypatch):
+    monkeypatch.setattr(api, "MAX_LEDGER_LOCKS", 2)
+    for ledger in ("a", "b", "c", "d"):
+        assert call("PUT", "/budgets/Food", {"amount": 100}, ledger=ledger)[0] == 200
+    assert list(api._ledger_locks) == ["c", "d"]
+
+
+def test_failed_budget_save_is_reported(ledger_dir, monkeypatch):
+    assert call("PUT", "/budgets/Food", {"amount": 100})[0] == 200
+
+    def fail(records):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(get_storage(), "save_budget_records", fail)
+        status, payload = call("PUT", "/budgets/Food", {"amount": 250})
+    assert status == 500 and "disk full" in payload["error"]
+    # The failed change is not served from the shared in-memory budgets either
+    assert call("GET", "/budgets")[1]["result"]["Food"]["budgeted"] == 100
+
+
+def test_unexpected_value_errors_are_server_errors(ledger_dir, monkeypatch):
+    def corrupt(month):
+        raise ValueError("invalid literal for int() with base 10: 'xx'")
+
+    monkeypatch.setattr(api, "month_balance", corrupt)
+    status, payload = call("GET", "/balance", query="month=2026-03")
+    assert status == 500
+    assert payload["error"] == "ValueError: invalid literal for int() with base 10: 'xx'"
+
+
+def test_invalid_transactions_are_client_errors(ledger_dir):
+    status, payload = call("POST", "/transactions", {"type": "Expense", "amount": 5, "category": "Salary"})
+    assert (status, payload["error"]) == (400, "Unknown expense category: Salary")
+    assert call("GET", "/transactions")[1]["result"]["total"] == 0
@@ -0,0 +1,108 @@
+import asyncio
+import datetime
+import json
+
+import pytest
+from rich.console import Console
+
+import api
+import cli
+from features.transactions import transactions
+from features.transactions.models import to_paisa
+from features.transactions.transactions import query_transactions
+
+
+@pytest.mark.parametrize("value, paisa", [
+    ("250", 25000), ("19.99", 1999), ("0.29", 29), (4.35, 435), (" 7 ", 700), (12, 1200),
+    # Half a paisa rounds up, even where the binary float is just below it
+    ("2.675", 268), (1.005, 101), ("0.005", 1), ("0.0049", 0), ("-2.675", -268), ("1e3", 100000),
+])
+def test_to_paisa_rounds_to_the_nearest_paisa(value, paisa):
+    assert to_paisa(value) == paisa
+
+
+@pytest.mark.parametrize("value", ["", "abc", "inf", "-inf", "nan", None, [5], 10 ** 400])
+def test_to_paisa_rejects_non_numbers(value):
+    with pytest.raises(ValueError):
+        to_paisa(value)
+
+
+def batch(*lines):
+    return list(cli.run_batch(cli.build_parser(), lines))
+
+
+def test_batch_add_uses_the_shared_rounding(ledger_dir):
+    [result] = batch("add --type Expense --amount 19.99 --category Food")
+    assert result["ok"]
+    assert [t.amount for t in query_transactions()] == [1999]
+
+
+def test_help_in_a_batch_does_not_end_it(ledger_dir):
+    results = batch(
+        "add --type Expense --amount 5 --category Food",
+        "--help",
+        "add -h",
+        "add --type Expense --amount inf --category Food",
+        "add --type Income --amount 10 --category Salary",
+    )
+    assert [r["ok"] for r in results] == [True, True, True, False, True]
+    assert "balance" in results[1]["result"]["help"]
+    assert "--amount" in results[2]["result"]["help"]
+    assert "invalid amount" in results[3]["error"]
+    assert len(query_transactions()) == 2
+
+
+def test_help_from_the_command_line(capsys):
+    assert cli.main(["add", "--help"]) == 0
+    assert "--amount" in capsys.readouterr().out
+
+
+def test_invalid_arguments_from_the_command_line(capsys):
+    assert cli.main(["add", "--type", "Expense"]) == 2
+    assert json.loads(capsys.readouterr().out)["ok"] is False
+
+
+def test_import_reports_the_first_row_errors(ledger_dir):
+    rows = ["2026-03-01,Expense,Food,ok,1.5"] + [f"2026-03-0{i},Expense,Food,bad,x{i}" for i in range(2, 5)]
+    (ledger_dir / "statement.csv").write_text("\n".join(["Date,Type,Category,Description,Amount"] + rows) + "\n")
+    [result] = batch("import statement.csv --max-errors 2")
+    assert result["ok"]
+    summary = result["result"]
+    assert (summary["imported"], summary["skipped_rows"], len(summary["errors"])) == (1, 3, 2)
+    assert "x2" in summary["errors"][0]
+
+
+def test_balance_is_the_same_from_the_cli_the_api_and_the_menu(ledger_dir, monkeypatch):
+    # The menu only shows the current month
+    month_start = datetime.date.today().replace(day=1)
+    next_month = (month_start + datetime.timedelta(days=32)).replace(day=1)
+    batch(
+        f"add --type Income --amount 1000 --category Salary --date {month_start}",
+        f"add --type Expense --amount 250.75 --category Food --date {next_month - datetime.timedelta(days=1)}",
+        f"add --type Expense --amount 99 --category Bills --date {next_month}",
+    )
+    month = month_start.strftime("%Y-%m")
+    [result] = batch(f"balance --month {month}")
+    expected = {"month": month, "income": 1000.0, "expenses": 250.75, "balance": 749.25}
+    assert result["result"] == expected
+
+    monkeypatch.setattr(api, "_ledger_locks", {})
+    scope = {"type": "http", "method": "GET", "path": "/balance", "query_string": f"month={month}".encode(), "headers": []}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(api.app(scope, receive, send))
+    assert json.loads(sent[1]["body"])["result"] == expected
+
+    console = Console(record=True, width=200)
+    monkeypatch.setattr(transactions, "Console", lambda: console)
+    transactions.show_balance()
+    output = console.export_text()
+    assert "Total Income: 1000.00" in output
+    assert "Total Expenses: 250.75" in output
+    assert "Current Balance: 749.25" in output
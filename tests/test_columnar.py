@@ -0,0 +1,105 @@
+import datetime
+
+import pytest
+
+from features.analytics.aggregation import _aggregate_numpy, _aggregate_python, _numpy
+from features.transactions.columnar import ColumnStore
+from features.transactions.repository import get_repository
+from features.transactions.transactions import make_transaction
+
+# Insertion order deliberately differs from date order
+DAYS = [datetime.date(2026, 3, d) for d in (10, 2, 25, 2, 17, 31, 1)]
+
+
+def record(day, transaction_type="Expense", category="Food", description="", amount=100):
+    return {"date": day.isoformat(), "type": transaction_type, "category": category,
+            "description": description, "amount": amount}
+
+
+@pytest.fixture
+def store():
+    return ColumnStore.from_records(
+        record(day, "Income" if i % 3 == 0 else "Expense", "Salary" if i % 3 == 0 else "Food", amount=i + 1)
+        for i, day in enumerate(DAYS)
+    )
+
+
+def days_of(store, rows):
+    return [store[row].date for row in rows]
+
+
+def test_rows_between_is_date_ordered_and_half_open(store):
+    rows = store.rows_between(datetime.date(2026, 3, 2), datetime.date(2026, 3, 25))
+    assert days_of(store, rows) == [datetime.date(2026, 3, d) for d in (2, 2, 10, 17)]
+    # Rows with the same day stay in insertion order
+    assert list(rows[:2]) == [1, 3]
+    assert len(store.rows_between()) == len(DAYS)
+    assert list(store.rows_between(datetime.date(2026, 4, 1))) == []
+
+
+def test_select_filters_within_range(store):
+    rows = store.select(datetime.date(2026, 3, 1), datetime.date(2026, 4, 1), transaction_type="Income")
+    assert days_of(store, rows) == [datetime.date(2026, 3, d) for d in (1, 2, 10)]
+    assert store.select(category="Food", transaction_type="Income") == []
+    assert store.select(category="Travel") == []
+
+
+def test_recent_is_newest_first(store):
+    assert days_of(store, store.recent(3)) == [datetime.date(2026, 3, d) for d in (31, 25, 17)]
+    assert store.recent(0) == []
+    assert len(store.recent(100)) == len(DAYS)
+
+
+def test_out_of_order_appends_keep_the_index_sorted(store):
+    store.extend([make_transaction("Expense", 5, "Food", "", datetime.date(2026, 3, d)) for d in (3, 30)])
+    store.extend([make_transaction("Expense", 5, "Food", "", datetime.date(2026, 2, d % 28 + 1)) for d in range(100)])
+    assert list(store.sorted_days) == sorted(store.days)
+    assert [store.days[row] for row in store.date_order] == list(store.sorted_days)
+
+
+def test_many_codes_widen_the_code_columns_in_step():
+    store = ColumnStore()
+    day = datetime.date(2026, 1, 1)
+    for i in range(300):
+        store.append_record(record(day, transaction_type=f"type{i}", category=f"category{i}"))
+    for i in range(70000):
+        store._append_record(record(day, category=f"c{i}"))
+    store._index_rows(300)
+
+    assert store.type_codes.typecode == "I" and store.category_codes.typecode == "I"
+    columns = (store.days, store.amounts, store.type_codes, store.category_codes, store.description_codes)
+    assert {len(column) for column in columns} == {70300}
+    assert store[299].type == "type299"
+    assert store[-1].category == "c69999"
+    sums = _aggregate_python(store)
+    assert len(sums) == 70300
+    np = _numpy()
+    if np is not None:
+        assert _aggregate_numpy(store, np) == sums
+
+
+def test_rejected_row_leaves_columns_in_step():
+    store = ColumnStore()
+    store.append_record(record(datetime.date(2026, 1, 1)))
+    with pytest.raises(TypeError):
+        store.append_record(record(datetime.date(2026, 1, 2), amount="12"))
+    columns = (store.days, store.amounts, store.type_codes, store.category_codes, store.description_codes)
+    assert {len(column) for column in columns} == {1}
+
+
+def test_listing_pages_and_offset_of(ledger_dir):
+    repository = get_repository()
+    repository.save([make_transaction("Expense", 100 + i, "Food", f"t{i}", day) for i, day in enumerate(DAYS)])
+    listing = repository.listing(start=datetime.date(2026, 3, 2))
+    assert len(listing) == 6
+
+    newest = [t.date.day for t in listing.page(0, 4)]
+    assert newest == [31, 25, 17, 10]
+    assert [t.date.day for t in listing.page(4, 4)] == [2, 2]
+    assert listing.page(6, 4) == []
+
+    assert listing.offset_of(datetime.date(2026, 4, 1)) == 0
+    assert listing.offset_of(datetime.date(2026, 3, 17)) == 2
+    # A day with no transactions lands on the next older one
+    assert listing.offset_of(datetime.date(2026, 3, 20)) == 2
+    assert listing.offset_of(datetime.date(2026, 3, 1)) == 6
@@ -0,0 +1,79 @@
+import datetime
+import os
+
+import pytest
+
+from features.analytics.recurring import RecurringIndex
+from features.storage import storage as storage_module
+from features.storage.storage import JsonStorage, add_to_rollup, build_recurring
+
+
+def expense(day, description="Netflix", amount=64900, category="Entertainment"):
+    return {"date": day, "type": "Expense", "category": category, "description": description, "amount": amount}
+
+
+MONTHLY_BILL = [expense(f"2026-{month:02d}-05") for month in range(1, 5)]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = JsonStorage.in_directory(str(tmp_path))
+    storage.save_transaction_records([expense("2025-12-20", "Groceries", 1500, "Food")])
+    return storage
+
+
+def file_identity(path):
+    st = os.stat(path)
+    return st.st_ino, st.st_mtime_ns
+
+
+def test_appends_do_not_rewrite_derived_files(storage):
+    rollup_before = file_identity(storage.rollup_file)
+    recurring_before = file_identity(storage.recurring_file)
+    for record in MONTHLY_BILL:
+        storage.append_transaction_record(record)
+    assert file_identity(storage.rollup_file) == rollup_before
+    assert file_identity(storage.recurring_file) == recurring_before
+
+
+def test_loaded_derived_data_includes_appended_records(storage):
+    for record in MONTHLY_BILL:
+        storage.append_transaction_record(record)
+    records = storage.load_transaction_records()
+    assert storage.load_rollup() == add_to_rollup({}, records)
+    assert storage.load_recurring() == build_recurring(records)
+    assert [bill.frequency for bill in RecurringIndex(storage.load_recurring()).bills(datetime.date(2026, 4, 20))] == ["monthly"]
+
+
+def test_compaction_saves_derived_data_again(storage):
+    storage.append_transaction_records(MONTHLY_BILL)
+    storage.compact()
+    records = storage.load_transaction_records()
+    assert storage.load_rollup() == add_to_rollup({}, records)
+    assert storage.load_recurring() == build_recurring(records)
+
+
+def test_append_triggered_compaction_keeps_derived_data_current(storage, monkeypatch):
+    monkeypatch.setattr(storage_module, "LOG_COMPACT_BYTES", 300)
+    for record in MONTHLY_BILL * 3:
+        storage.append_transaction_record(record)
+    records = storage.load_transaction_records()
+    assert storage.load_rollup() == add_to_rollup({}, records)
+    assert storage.load_recurring() == build_recurring(records)
+
+
+def test_snapshot_replaced_elsewhere_makes_derived_data_stale(storage, tmp_path):
+    rollup = storage.load_rollup()
+    # Another writer replaces the snapshot without updating the rollup
+    other = JsonStorage.in_directory(str(tmp_path))
+    other._write_snapshot([expense("2026-01-01")], (None, 0))
+    assert storage.load_rollup() is None
+    assert storage.load_recurring() is None
+    assert rollup is not None
+
+
+def test_save_with_outdated_source_is_skipped(storage):
+    source = storage.fingerprint()
+    storage.append_transaction_record(MONTHLY_BILL[0])
+    storage.save_rollup({}, source=source)
+    assert storage.load_rollup() == add_to_rollup({}, storage.load_transaction_records())
@@ -0,0 +1,128 @@
+import csv
+import datetime
+import gzip
+import json
+
+import pytest
+
+from features.data_management import exporters
+from features.data_management.exporters import CSV_FIELDNAMES, export_transactions
+from features.transactions.transactions import record_transaction
+
+TRANSACTIONS = [
+    ("Expense", 45050, "Food", "Lunch, with \"quotes\"", datetime.date(2026, 1, 31)),
+    ("Income", 5000000, "Salary", "January pay", datetime.date(2026, 2, 1)),
+    ("Expense", 120000, "Bills", "Electricity", datetime.date(2026, 2, 10)),
+    ("Expense", 999, "Food", "Snacks", datetime.date(2026, 2, 28)),
+    ("Expense", 30000, "Transport", "Fuel", datetime.date(2026, 3, 1)),
+]
+
+
+def as_dicts(transactions):
+    return [
+        {"date": day.isoformat(), "type": t_type, "category": category, "description": description, "amount": amount}
+        for t_type, amount, category, description, day in transactions
+    ]
+
+
+@pytest.fixture
+def ledger(ledger_dir):
+    # Recorded out of date order; exports come out in date order
+    for t_type, amount, category, description, day in reversed(TRANSACTIONS):
+        record_transaction(t_type, amount, category, description, day)
+    return ledger_dir
+
+
+def read_text(path, compress=False):
+    opener = gzip.open if compress else open
+    with opener(path, "rt", newline="", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_csv_has_the_header_and_one_row_per_transaction(ledger, compress):
+    path = ledger / "out.csv"
+    assert export_transactions(str(path), "csv", compress=compress, chunk_size=2) == len(TRANSACTIONS)
+    rows = list(csv.reader(read_text(path, compress).splitlines()))
+    assert rows[0] == CSV_FIELDNAMES
+    assert rows[1:] == [
+        [day.isoformat(), t_type, category, description, str(amount / 100)]
+        for t_type, amount, category, description, day in TRANSACTIONS
+    ]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_json_is_one_valid_array(ledger, compress):
+    path = ledger / "out.json"
+    assert export_transactions(str(path), "json", compress=compress, chunk_size=2) == len(TRANSACTIONS)
+    assert json.loads(read_text(path, compress)) == as_dicts(TRANSACTIONS)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_jsonl_has_one_object_per_line(ledger, compress):
+    path = ledger / "out.jsonl"
+    assert export_transactions(str(path), "jsonl", compress=compress, chunk_size=2) == len(TRANSACTIONS)
+    lines = read_text(path, compress).split("\n")
+    assert lines[-1] == ""
+    assert [json.loads(line) for line in lines[:-1]] == as_dicts(TRANSACTIONS)
+
+
+@pytest.mark.parametrize("export_format, expected", [
+    ("json", []),
+    ("jsonl", ""),
+    ("csv", ",".join(CSV_FIELDNAMES) + "\r\n"),
+])
+def test_exporting_no_rows_still_writes_a_valid_file(ledger_dir, export_format, expected):
+    path = ledger_dir / f"out.{export_format}"
+    assert export_transactions(str(path), export_format) == 0
+    text = read_text(path)
+    assert (json.loads(text) if export_format == "json" else text) == expected
+
+
+def test_gzip_output_is_really_compressed(ledger):
+    path = ledger / "out.jsonl.gz"
+    export_transactions(str(path), "jsonl", compress=True)
+    with open(path, "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+
+
+@pytest.mark.parametrize("filters, expected", [
+    # The end bound is exclusive: March 1 is left out
+    ({"start": datetime.date(2026, 2, 1), "end": datetime.date(2026, 3, 1)}, TRANSACTIONS[1:4]),
+    ({"start": datetime.date(2026, 2, 11)}, TRANSACTIONS[3:]),
+    ({"end": datetime.date(2026, 2, 1)}, TRANSACTIONS[:1]),
+    ({"category": "Food"}, [TRANSACTIONS[0], TRANSACTIONS[3]]),
+    ({"transaction_type": "Income"}, [TRANSACTIONS[1]]),
+    ({"transaction_type": "Expense", "start": datetime.date(2026, 2, 1)}, [TRANSACTIONS[2], *TRANSACTIONS[3:]]),
+    ({"category": "Health"}, []),
+])
+def test_filters_select_the_exported_rows(ledger, filters, expected):
+    path = ledger / "out.json"
+    assert export_transactions(str(path), "json", chunk_size=2, **filters) == len(expected)
+    assert json.loads(read_text(path)) == as_dicts(expected)
+
+
+def test_unknown_format_is_rejected(ledger):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        export_transactions(str(ledger / "out.xml"), "xml")
+    assert not (ledger / "out.xml").exists()
+
+
+def test_parquet_without_pyarrow_fails_before_writing(ledger, monkeypatch):
+    monkeypatch.setattr(exporters, "pyarrow", None)
+    path = ledger / "out.parquet"
+    with pytest.raises(RuntimeError, match="requires pyarrow"):
+        export_transactions(str(path), "parquet")
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_parquet_round_trip(ledger, compress):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    path = ledger / "out.parquet"
+    assert export_transactions(str(path), "parquet", compress=compress, chunk_size=2) == len(TRANSACTIONS)
+    table = pyarrow_parquet.read_table(str(path))
+    assert table.num_rows == len(TRANSACTIONS)
+    assert [
+        {**row, "date": row["date"].isoformat()} for row in table.to_pylist()
+    ] == as_dicts(TRANSACTIONS)
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+from rich.console import Console
+
+from features.smart_assistant import smart_assistant
+from features.smart_assistant.smart_assistant import load_goals, save_goals
+from features.storage.storage import JsonStorage, SqliteStorage, get_storage, using_ledger
+
+EMERGENCY_FUND = {"type": "Emergency Fund", "target_amount": 5000000, "target_date": ""}
+
+
+class Answer:
+    def __init__(self, value):
+        self.value = value
+
+    def ask(self):
+        return self.value
+
+
+def test_goals_are_one_shared_dict_per_ledger(ledger_dir):
+    goals = load_goals()
+    goals["emergency_fund"] = EMERGENCY_FUND
+    save_goals()
+    assert load_goals() is goals
+
+    with using_ledger("household"):
+        assert load_goals() == {}
+        load_goals()["savings_target"] = {"type": "Savings Target", "target_amount": 100, "target_date": ""}
+        save_goals()
+    assert load_goals() == {"emergency_fund": EMERGENCY_FUND}
+    with using_ledger("household"):
+        assert list(load_goals()) == ["savings_target"]
+
+
+def test_goals_written_elsewhere_are_reloaded_in_place(ledger_dir):
+    goals = load_goals()
+    assert goals == {}
+    # Another process (say the dashboard) saves goals through its own storage
+    storage = get_storage()
+    if storage.name == "sqlite":
+        other = SqliteStorage(storage.path)
+    else:
+        other = JsonStorage.in_directory(os.path.dirname(storage.goals_file))
+    other.save_goals({"emergency_fund": EMERGENCY_FUND})
+    assert load_goals() is goals
+    assert goals == {"emergency_fund": EMERGENCY_FUND}
+
+
+def fail(goals):
+    raise OSError("disk full")
+
+
+def test_failed_save_is_not_served_from_memory(ledger_dir, monkeypatch):
+    load_goals()["emergency_fund"] = EMERGENCY_FUND
+    save_goals()
+
+    goals = load_goals()
+    goals["savings_target"] = {"type": "Savings Target", "target_amount": 100, "target_date": ""}
+    with monkeypatch.context() as m:
+        m.setattr(get_storage(), "save_goals", fail)
+        with pytest.raises(OSError):
+            save_goals()
+    assert load_goals() == {"emergency_fund": EMERGENCY_FUND}
+
+
+@pytest.mark.parametrize("broken", [False, True])
+def test_set_goal_screen(ledger_dir, monkeypatch, broken):
+    answers = iter(["50000", ""])
+    monkeypatch.setattr(smart_assistant.questionary, "select", lambda *args, **kwargs: Answer("Emergency Fund"))
+    monkeypatch.setattr(smart_assistant.questionary, "text", lambda *args, **kwargs: Answer(next(answers)))
+    console = Console(record=True, width=200)
+    monkeypatch.setattr(smart_assistant, "console", console)
+    if broken:
+        monkeypatch.setattr(get_storage(), "save_goals", fail)
+
+    smart_assistant.set_financial_goals()
+
+    output = console.export_text()
+    if broken:
+        assert "Could not save goals: disk full" in output
+        assert get_storage().load_goals() == {}
+    else:
+        assert "Emergency Fund goal set successfully!" in output
+        assert get_storage().load_goals() == {"emergency_fund": EMERGENCY_FUND}
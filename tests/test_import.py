@@ -0,0 +1,166 @@
+import datetime
+import os
+
+import pytest
+from rich.console import Console
+
+import cli
+from features.data_management import data_management
+from features.data_management.data_management import IMPORT_BATCH_SIZE, import_transactions
+from features.storage.storage import get_storage, using_ledger
+from features.transactions.models import Transaction
+from features.transactions.transactions import load_transactions, record_transaction
+
+BASE = datetime.date(2024, 1, 1)
+
+
+def expense(day, amount=10000, category="Food", description="Lunch"):
+    return Transaction(BASE + datetime.timedelta(days=day), "Expense", category, description, amount)
+
+
+def row(t):
+    return (t.date, t.type, t.category, t.description, t.amount)
+
+
+def stored():
+    return [row(t) for t in load_transactions()]
+
+
+def test_duplicates_within_one_file_are_imported_once(ledger_dir):
+    rows = [expense(0), expense(0, description="Lunch again"), expense(1), expense(0, amount=10001), expense(1)]
+    assert import_transactions(iter(rows)) == (3, 2)
+    # The key is (date, type, category, amount): the description does not tell rows apart
+    assert stored() == [row(rows[0]), row(rows[2]), row(rows[3])]
+
+
+def test_duplicates_of_stored_transactions_are_skipped(ledger_dir):
+    record_transaction("Expense", 10000, "Food", "Lunch", BASE)
+    record_transaction("Income", 10000, "Salary", "Pay", BASE)
+    rows = [expense(0), expense(0, category="Transport"), Transaction(BASE, "Income", "Salary", "Pay", 10000)]
+    assert import_transactions(rows) == (1, 2)
+    assert stored()[2:] == [row(rows[1])]
+    # Importing the same file again adds nothing
+    assert import_transactions(rows) == (0, 3)
+    assert len(stored()) == 3
+
+
+@pytest.mark.parametrize("extra", [-1, 0, 1, IMPORT_BATCH_SIZE + 7])
+def test_rows_on_both_sides_of_a_batch_boundary(ledger_dir, extra):
+    count = IMPORT_BATCH_SIZE + extra
+    rows = [expense(i % 3000, amount=100 + i) for i in range(count)]
+    # Repeats of the first and last rows land in a later batch than the originals
+    duplicates = [rows[0], rows[IMPORT_BATCH_SIZE - 2], rows[-1]]
+    assert import_transactions(iter(rows + duplicates)) == (count, len(duplicates))
+    assert sorted(stored()) == sorted(row(t) for t in rows)
+
+
+def test_batches_append_without_compacting_then_compact_once(ledger_dir, monkeypatch):
+    calls = []
+    append, compact = data_management.append_transactions, data_management.compact_transactions
+
+    def spy_append(batch, compact=True):
+        calls.append(("append", len(batch), compact))
+        return append(batch, compact=compact)
+
+    def spy_compact():
+        calls.append(("compact",))
+        return compact()
+
+    monkeypatch.setattr(data_management, "append_transactions", spy_append)
+    monkeypatch.setattr(data_management, "compact_transactions", spy_compact)
+    assert import_transactions((expense(i, amount=i + 1) for i in range(25)), batch_size=10) == (25, 0)
+    assert calls == [("append", 10, False), ("append", 10, False), ("append", 5, False), ("compact",)]
+    storage = get_storage()
+    if storage.name == "json":
+        # Everything was folded into the snapshot
+        assert not os.path.exists(storage.log_file)
+
+
+def test_an_import_of_only_duplicates_appends_nothing(ledger_dir, monkeypatch):
+    record_transaction("Expense", 10000, "Food", "Lunch", BASE)
+    calls = []
+    monkeypatch.setattr(data_management, "append_transactions", lambda batch, compact=True: calls.append(batch))
+    assert import_transactions([expense(0)] * 3) == (0, 3)
+    assert calls == []
+
+
+class Answer:
+    def __init__(self, value):
+        self.value = value
+
+    def ask(self):
+        return self.value
+
+
+HEADER = "Date,Type,Category,Description,Amount"
+STATEMENTS = {
+    "january.csv": [
+        "2026-01-05,Expense,Food,Lunch,12.50",
+        "2026-01-05,Expense,Food,Lunch repeated,12.50",
+        "2026-01-06,Income,Salary,Pay,5000",
+        "2026-01-07,Expense,Food,Broken,twelve",
+    ],
+    "february.csv": [
+        "2026-01-06,Income,Salary,Pay again,5000",
+        "2026-02-01,Expense,Bills,Rent,900",
+        "2026-02-02,Expense,Transport,Bus,2.25",
+    ],
+}
+
+
+def write_statements(directory):
+    directory.mkdir()
+    for name, lines in STATEMENTS.items():
+        (directory / name).write_text("\n".join([HEADER] + lines) + "\n")
+    # Matches the pattern but cannot be read: its worker fails
+    (directory / "broken.csv").mkdir()
+    return directory
+
+
+def test_bulk_import_merges_files_parsed_in_worker_processes(ledger_dir, monkeypatch):
+    write_statements(ledger_dir / "statements")
+    record_transaction("Expense", 225, "Transport", "Bus", datetime.date(2026, 2, 2))
+    answers = iter(["statements"])
+    monkeypatch.setattr(data_management.questionary, "text", lambda *args, **kwargs: Answer(next(answers)))
+    monkeypatch.setattr(data_management.questionary, "confirm", lambda *args, **kwargs: Answer(True))
+    console = Console(record=True, width=200)
+    monkeypatch.setattr(data_management, "console", console)
+
+    data_management.bulk_import_transactions_csv()
+
+    output = console.export_text()
+    # Six valid rows: one repeats a row of its own file, one a row of the other file, one a stored row
+    assert "Imported 3 new transactions from 3 files (3 duplicates skipped)" in output
+    # File -> [valid rows, skipped rows, error] from the summary table
+    summary = {
+        cells[0]: cells[1:]
+        for cells in ([cell.strip() for cell in line.split("│")[1:-1]] for line in output.splitlines())
+        if cells and cells[0].startswith("statements")
+    }
+    assert summary[os.path.join("statements", "january.csv")] == ["3", "1", ""]
+    assert summary[os.path.join("statements", "february.csv")] == ["3", "0", ""]
+    # The unreadable file is reported on its own row without stopping the others
+    assert summary[os.path.join("statements", "broken.csv")][:2] == ["0", "0"]
+    assert "Is a directory" in summary[os.path.join("statements", "broken.csv")][2]
+    assert "january.csv: Skipping row due to data conversion error" in output
+    assert sorted((t.date.isoformat(), t.category, t.amount) for t in load_transactions()) == [
+        ("2026-01-05", "Food", 1250),
+        ("2026-01-06", "Salary", 500000),
+        ("2026-02-01", "Bills", 90000),
+        ("2026-02-02", "Transport", 225),
+    ]
+
+    # The sequential `cli.py import` path counts the same files the same way
+    with using_ledger("sequential"):
+        record_transaction("Expense", 225, "Transport", "Bus", datetime.date(2026, 2, 2))
+        [result] = cli.run_batch(cli.build_parser(), [
+            "import statements/january.csv statements/february.csv"
+        ])
+        assert result["ok"]
+        assert (result["result"]["imported"], result["result"]["duplicates"]) == (3, 3)
+        assert sorted((t.date.isoformat(), t.category, t.amount) for t in load_transactions()) == [
+            ("2026-01-05", "Food", 1250),
+            ("2026-01-06", "Salary", 500000),
+            ("2026-02-01", "Bills", 90000),
+            ("2026-02-02", "Transport", 225),
+        ]
@@ -0,0 +1,114 @@
+import json
+import os
+
+import pytest
+
+from features.storage import storage as storage_module
+from features.storage.storage import JsonStorage
+
+
+def record(i, category="Food", amount=None):
+    return {
+        "date": f"2026-01-{i % 28 + 1:02d}",
+        "type": "Expense",
+        "category": category,
+        "description": f"t{i}",
+        "amount": amount if amount is not None else 100 + i,
+    }
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return JsonStorage.in_directory(str(tmp_path))
+
+
+def descriptions(records):
+    return [r["description"] for r in records]
+
+
+def test_appends_replay_in_order(storage):
+    storage.append_transaction_records([record(0), record(1)])
+    storage.append_transaction_record(record(2))
+    assert descriptions(storage.load_transaction_records()) == ["t0", "t1", "t2"]
+
+
+def test_compaction_folds_log_into_snapshot(storage):
+    storage.append_transaction_records([record(i) for i in range(3)])
+    storage.compact()
+    assert not os.path.exists(storage.log_file)
+    storage.append_transaction_record(record(3))
+    assert descriptions(storage.load_transaction_records()) == ["t0", "t1", "t2", "t3"]
+
+
+def test_append_compacts_past_threshold(storage, monkeypatch):
+    monkeypatch.setattr(storage_module, "LOG_COMPACT_BYTES", 500)
+    for i in range(20):
+        storage.append_transaction_record(record(i))
+    assert descriptions(storage.load_transaction_records()) == [f"t{i}" for i in range(20)]
+    assert os.path.exists(storage.transactions_file)
+    assert not os.path.exists(storage.log_file) or os.path.getsize(storage.log_file) <= 500
+
+
+def crash_before_log_removal(monkeypatch):
+    def fail(path):
+        raise OSError("simulated crash")
+    monkeypatch.setattr(storage_module.os, "remove", fail)
+
+
+def test_crash_between_snapshot_and_log_removal_does_not_duplicate(storage, monkeypatch):
+    storage.append_transaction_records([record(i) for i in range(3)])
+    with monkeypatch.context() as m:
+        crash_before_log_removal(m)
+        with pytest.raises(OSError):
+            storage.compact()
+    assert os.path.exists(storage.log_file)
+    assert descriptions(storage.load_transaction_records()) == ["t0", "t1", "t2"]
+
+    # Appends after the crash go to the leftover log and are replayed once
+    storage.append_transaction_record(record(3))
+    assert descriptions(storage.load_transaction_records()) == ["t0", "t1", "t2", "t3"]
+    storage.compact()
+    assert descriptions(storage.load_transaction_records()) == ["t0", "t1", "t2", "t3"]
+
+
+def test_crash_during_full_save_does_not_replay_old_log(storage, monkeypatch):
+    storage.append_transaction_records([record(i) for i in range(3)])
+    with monkeypatch.context() as m:
+        crash_before_log_removal(m)
+        with pytest.raises(OSError):
+            storage.save_transaction_records([record(9)])
+    assert descriptions(storage.load_transaction_records()) == ["t9"]
+
+
+def test_reads_legacy_list_snapshot_and_headerless_log(storage):
+    with open(storage.transactions_file, "w") as f:
+        json.dump([record(0)], f)
+    with open(storage.log_file, "w") as f:
+        f.write(json.dumps(record(1)) + "\n")
+    assert descriptions(storage.load_transaction_records()) == ["t0", "t1"]
+    storage.append_transaction_record(record(2))
+    storage.compact()
+    assert descriptions(storage.load_transaction_records()) == ["t0", "t1", "t2"]
+
+
+def test_torn_last_line_is_ignored(storage):
+    storage.append_transaction_records([record(0), record(1)])
+    with open(storage.log_file, "ab") as f:
+        f.write(json.dumps(record(2)).encode()[:20])
+    assert descriptions(storage.load_transaction_records()) == ["t0", "t1"]
+
+
+@pytest.mark.parametrize("torn", [b'{"date": "2026-01', b'{"description": "' + b"x" * 10000])
+def test_append_after_torn_line_keeps_new_records(storage, torn):
+    storage.append_transaction_records([record(0), record(1)])
+    with open(storage.log_file, "ab") as f:
+        f.write(torn)
+    storage.append_transaction_record(record(3))
+    assert descriptions(storage.load_transaction_records()) == ["t0", "t1", "t3"]
+
+
+def test_torn_header_starts_a_fresh_log(storage):
+    with open(storage.log_file, "wb") as f:
+        f.write(b'{"log_id": "ab')
+    storage.append_transaction_record(record(0))
+    assert descriptions(storage.load_transaction_records()) == ["t0"]
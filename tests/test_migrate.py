@@ -0,0 +1,64 @@
+import pytest
+
+from features.storage.migrate import migrate_json_to_sqlite
+from features.storage.storage import JsonStorage, SqliteStorage, add_to_rollup, build_recurring
+
+RECORDS = [
+    {"date": "2025-12-31", "type": "Income", "category": "Salary", "description": "December pay", "amount": 5000000},
+    {"date": "2026-01-05", "type": "Expense", "category": "Entertainment", "description": "Netflix", "amount": 64900},
+    {"date": "2026-02-05", "type": "Expense", "category": "Entertainment", "description": "Netflix", "amount": 64900},
+    {"date": "2026-02-05", "type": "Expense", "category": "Food", "description": "Café ünïcode", "amount": 1},
+]
+# Appended after the snapshot, so they only exist in the JSON log
+LOGGED = [
+    {"date": "2026-03-05", "type": "Expense", "category": "Entertainment", "description": "Netflix", "amount": 64900},
+    {"date": "2026-03-06", "type": "Expense", "category": "Food", "description": "Lunch", "amount": 2 ** 62},
+]
+BUDGETS = [{"category": "Food", "amount": 500000}, {"category": "Bills", "amount": 0}]
+GOALS = {"Car": {"target_amount": 100000000, "current_amount": 2500000, "deadline": "2027-01-01"}}
+
+
+@pytest.fixture
+def source(tmp_path):
+    source = JsonStorage.in_directory(str(tmp_path / "json"))
+    source.save_transaction_records(RECORDS)
+    source.append_transaction_records(LOGGED)
+    source.save_budget_records(BUDGETS)
+    source.save_goals(GOALS)
+    return source
+
+
+def test_migrated_ledger_loads_the_same_data(source, tmp_path):
+    path = str(tmp_path / "finance.db")
+    assert migrate_json_to_sqlite(path, source) == (len(RECORDS + LOGGED), [])
+
+    target = SqliteStorage(path)
+    records = target.load_transaction_records()
+    assert records == RECORDS + LOGGED
+    assert target.load_budget_records() == BUDGETS
+    assert target.load_goals() == GOALS
+    assert target.load_rollup() == add_to_rollup({}, records)
+    assert target.load_recurring() == build_recurring(records)
+
+
+def test_running_the_migration_again_does_not_duplicate_rows(source, tmp_path):
+    path = str(tmp_path / "finance.db")
+    migrate_json_to_sqlite(path, source)
+    assert migrate_json_to_sqlite(path, source) == (len(RECORDS + LOGGED), [])
+
+    target = SqliteStorage(path)
+    assert target.load_transaction_records() == RECORDS + LOGGED
+    assert target.load_budget_records() == BUDGETS
+    assert target.load_goals() == GOALS
+    assert target.load_rollup() == add_to_rollup({}, RECORDS + LOGGED)
+
+
+def test_bad_records_are_skipped_and_reported(tmp_path):
+    source = JsonStorage.in_directory(str(tmp_path / "json"))
+    # A hand-edited file: save_transaction_records would refuse the incomplete record
+    source._write_snapshot([RECORDS[0], {"date": "2026-01-01", "type": "Expense"}, RECORDS[1]], (None, 0))
+    path = str(tmp_path / "finance.db")
+    migrated, skipped = migrate_json_to_sqlite(path, source)
+    assert migrated == 2
+    assert len(skipped) == 1 and skipped[0].startswith("Transaction 2:")
+    assert SqliteStorage(path).load_transaction_records() == RECORDS[:2]
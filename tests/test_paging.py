@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+from rich.console import Console
+
+from features.transactions import transactions
+from features.transactions.models import Transaction
+from features.transactions.transactions import PAGE_SIZE, page_through
+
+TOTAL = 4 * PAGE_SIZE + 15
+NEWEST = datetime.date(2026, 6, 30)
+# Newest first, one transaction per day
+ROWS = [Transaction(NEWEST - datetime.timedelta(days=i), "Expense", "Food", f"row {i}", 100) for i in range(TOTAL)]
+
+
+class Answer:
+    def __init__(self, value):
+        self.value = value
+
+    def ask(self):
+        return self.value
+
+
+def titles(monkeypatch, actions, dates=()):
+    """Pages through ROWS taking actions in turn; returns the title of every page shown."""
+    actions, dates = iter(actions), iter(dates)
+    monkeypatch.setattr(transactions.questionary, "select", lambda *args, **kwargs: Answer(next(actions)))
+    monkeypatch.setattr(transactions.questionary, "text", lambda *args, **kwargs: Answer(next(dates)))
+    shown = []
+    monkeypatch.setattr(transactions, "render_transactions_page", lambda page, title: shown.append((title, page)) or "")
+
+    def offset_of(day):
+        return sum(1 for t in ROWS if t.date > day)
+
+    page_through(Console(record=True), "Transactions", TOTAL, lambda o, n: ROWS[o:o + n], offset_of)
+    return shown
+
+
+@pytest.mark.parametrize("days_back, title", [
+    # The page holding the date opens, starting on a page boundary
+    (2 * PAGE_SIZE + 7, f"Transactions {2 * PAGE_SIZE + 1}-{3 * PAGE_SIZE} of {TOTAL} (page 3/5)"),
+    (PAGE_SIZE, f"Transactions {PAGE_SIZE + 1}-{2 * PAGE_SIZE} of {TOTAL} (page 2/5)"),
+    (0, f"Transactions 1-{PAGE_SIZE} of {TOTAL} (page 1/5)"),
+    # Older than everything: the last page
+    (TOTAL + 30, f"Transactions {4 * PAGE_SIZE + 1}-{TOTAL} of {TOTAL} (page 5/5)"),
+])
+def test_jump_to_date_lands_on_the_page_holding_it(monkeypatch, days_back, title):
+    target = NEWEST - datetime.timedelta(days=days_back)
+    shown = titles(monkeypatch, ["Jump to Date", "Back"], [target.isoformat()])
+    assert shown[1][0] == title
+    if days_back < TOTAL:
+        assert target in [t.date for t in shown[1][1]]
+
+
+def test_paging_after_a_jump_keeps_to_page_boundaries(monkeypatch):
+    target = NEWEST - datetime.timedelta(days=PAGE_SIZE + 3)
+    shown = titles(monkeypatch, ["Jump to Date", "Next Page", "Previous Page", "Previous Page", "Back"], [target.isoformat()])
+    assert [title for title, _ in shown] == [
+        f"Transactions 1-{PAGE_SIZE} of {TOTAL} (page 1/5)",
+        f"Transactions {PAGE_SIZE + 1}-{2 * PAGE_SIZE} of {TOTAL} (page 2/5)",
+        f"Transactions {2 * PAGE_SIZE + 1}-{3 * PAGE_SIZE} of {TOTAL} (page 3/5)",
+        f"Transactions {PAGE_SIZE + 1}-{2 * PAGE_SIZE} of {TOTAL} (page 2/5)",
+        f"Transactions 1-{PAGE_SIZE} of {TOTAL} (page 1/5)",
+    ]
+
+
+def test_cancelled_jump_stays_on_the_page(monkeypatch):
+    shown = titles(monkeypatch, ["Next Page", "Jump to Date", "Back"], [None])
+    assert shown[1][0] == shown[2][0] == f"Transactions {PAGE_SIZE + 1}-{2 * PAGE_SIZE} of {TOTAL} (page 2/5)"
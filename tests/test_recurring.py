@@ -0,0 +1,141 @@
+import datetime
+
+import pytest
+
+from features.analytics.recurring import MIN_OCCURRENCES, PERIODS, RecurringIndex, add_months, detect_period
+from features.storage.storage import MAX_OCCURRENCES, build_recurring
+
+START = datetime.date(2026, 1, 5)
+
+
+def expense(day, description="Netflix", amount=64900, category="Entertainment"):
+    return {"date": day.isoformat(), "type": "Expense", "category": category, "description": description, "amount": amount}
+
+
+def payments(gaps, start=START, **fields):
+    days = [start]
+    for gap in gaps:
+        days.append(days[-1] + datetime.timedelta(days=gap))
+    return [expense(day, **fields) for day in days]
+
+
+def frequencies(records, today):
+    return [bill.frequency for bill in RecurringIndex.from_records(records).bills(today)]
+
+
+@pytest.mark.parametrize("name, length, tolerance", PERIODS)
+def test_every_period_is_detected(name, length, tolerance):
+    # Gaps at both edges of the tolerance still make a series
+    gaps = [length - tolerance, length + tolerance, length]
+    days = [START.toordinal()]
+    for gap in gaps:
+        days.append(days[-1] + gap)
+    assert detect_period(days) == (name, length, tolerance)
+
+
+@pytest.mark.parametrize("name, length, tolerance", PERIODS)
+def test_a_gap_past_the_tolerance_breaks_the_series(name, length, tolerance):
+    days = [START.toordinal()]
+    for gap in [length, length, length + tolerance + 1]:
+        days.append(days[-1] + gap)
+    assert detect_period(days) is None
+
+
+def test_fewer_than_min_occurrences_is_not_a_series():
+    days = [START.toordinal() + 7 * i for i in range(MIN_OCCURRENCES)]
+    assert detect_period(days)[0] == "weekly"
+    assert detect_period(days[:-1]) is None
+
+
+@pytest.mark.parametrize("day, months, expected", [
+    (datetime.date(2026, 1, 31), 1, datetime.date(2026, 2, 28)),
+    (datetime.date(2028, 1, 31), 1, datetime.date(2028, 2, 29)),
+    (datetime.date(2026, 3, 31), 1, datetime.date(2026, 4, 30)),
+    (datetime.date(2026, 11, 30), 3, datetime.date(2027, 2, 28)),
+    (datetime.date(2026, 12, 15), 1, datetime.date(2027, 1, 15)),
+    (datetime.date(2028, 2, 29), 12, datetime.date(2029, 2, 28)),
+])
+def test_add_months_clamps_to_the_end_of_the_month(day, months, expected):
+    assert add_months(day, months) == expected
+
+
+def test_monthly_bill_due_date_follows_the_calendar():
+    records = [expense(datetime.date(2025, month, 31)) for month in (10, 12)]
+    records.append(expense(datetime.date(2026, 1, 31)))
+    records.insert(1, expense(datetime.date(2025, 11, 30)))
+    (bill,) = RecurringIndex.from_records(records).bills(datetime.date(2026, 2, 1))
+    assert bill.frequency == "monthly"
+    assert bill.next_due == datetime.date(2026, 2, 28)
+
+
+def test_amounts_in_one_bucket_form_one_series():
+    records = [
+        expense(START, amount=49900),
+        expense(START + datetime.timedelta(days=30), amount=50200),
+        expense(START + datetime.timedelta(days=60), amount=50100),
+    ]
+    assert len(build_recurring(records)) == 1
+    (bill,) = RecurringIndex.from_records(records).bills(START + datetime.timedelta(days=70))
+    # The latest payment's amount and description are reported
+    assert bill.amount == 50100
+
+
+def test_far_apart_amounts_and_descriptions_are_separate_series():
+    records = payments([30, 30], amount=64900) + payments([30, 30], amount=99900)
+    records += payments([30, 30], description="Spotify", amount=64900)
+    assert len(build_recurring(records)) == 3
+    assert frequencies(records, START + datetime.timedelta(days=70)) == ["monthly"] * 3
+
+
+def test_digits_in_descriptions_do_not_split_a_series():
+    records = [
+        expense(START + datetime.timedelta(days=30 * i), description=f"Rent invoice #{1000 + i}")
+        for i in range(3)
+    ]
+    (series,) = build_recurring(records).values()
+    assert series["description"] == "Rent invoice #1002"
+
+
+def test_income_is_never_a_recurring_bill():
+    records = [{**record, "type": "Income", "category": "Salary"} for record in payments([30, 30])]
+    assert build_recurring(records) == {}
+
+
+def test_only_the_latest_occurrences_are_kept():
+    # A weekly habit that turned monthly: once the old gaps age out it is monthly
+    records = payments([7] * 20) + payments([30] * MAX_OCCURRENCES, start=START + datetime.timedelta(days=170))
+    (series,) = build_recurring(records).values()
+    assert len(series["days"]) == MAX_OCCURRENCES
+    assert detect_period(series["days"])[0] == "monthly"
+
+
+def test_out_of_order_and_repeated_days_are_folded_in():
+    records = payments([30, 30])
+    index = RecurringIndex.from_records([records[2], records[0]])
+    assert index.add([records[1], records[0]]) == {next(iter(index.series))}
+    assert index.series == build_recurring(records)
+    assert index.add([records[1]]) == set()
+
+
+def test_irregular_payments_are_not_a_series():
+    assert frequencies(payments([30, 9, 50, 30]), START + datetime.timedelta(days=130)) == []
+
+
+@pytest.mark.parametrize("name, length, tolerance", PERIODS)
+def test_inactive_series_is_dropped_after_a_missed_period(name, length, tolerance):
+    records = payments([length] * 3)
+    index = RecurringIndex.from_records(records)
+    (bill,) = index.bills(START)
+    assert bill.frequency == name
+    # Overdue for up to a whole period, then treated as cancelled
+    assert [b.frequency for b in index.bills(bill.next_due + datetime.timedelta(days=length))] == [name]
+    assert index.bills(bill.next_due + datetime.timedelta(days=length + 1)) == []
+
+
+def test_bills_are_sorted_soonest_due_first():
+    records = payments([30, 30], description="Netflix")
+    records += payments([30, 30], description="Rent", start=START - datetime.timedelta(days=5))
+    records += payments([7, 7], description="Gym", start=START + datetime.timedelta(days=40))
+    bills = RecurringIndex.from_records(records).bills(START + datetime.timedelta(days=60))
+    assert [bill.description for bill in bills] == ["Gym", "Rent", "Netflix"]
+    assert [bill.next_due for bill in bills] == sorted(bill.next_due for bill in bills)
@@ -0,0 +1,86 @@
+import datetime
+
+import pytest
+
+from features.analytics.report_cache import ReportCache, clear_report_cache, get_report, report_cache_stats
+from features.budgets.budgets import Budget, save_budgets
+from features.storage import storage as storage_module
+from features.storage.storage import current_ledger, using_ledger
+from features.transactions.transactions import append_transaction, make_transaction
+
+TODAY = datetime.date(2026, 3, 15)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_report_cache()
+    yield
+    clear_report_cache()
+
+
+def spend(amount, category="Food"):
+    append_transaction(make_transaction("Expense", amount, category, "", TODAY))
+
+
+def counters():
+    stats = report_cache_stats()
+    return stats["hits"], stats["misses"]
+
+
+def test_unchanged_data_is_served_from_cache(ledger_dir):
+    spend(1000)
+    before = counters()
+    first = get_report("spending", TODAY)
+    assert get_report("spending", TODAY) is first
+    assert counters() == (before[0] + 1, before[1] + 1)
+
+
+def test_new_transaction_recomputes(ledger_dir):
+    spend(1000)
+    assert get_report("spending", TODAY).total == 1000
+    spend(250)
+    assert get_report("spending", TODAY).total == 1250
+
+
+def test_budget_save_recomputes(ledger_dir):
+    spend(1000)
+    assert get_report("comprehensive", TODAY).budgets == []
+    save_budgets({"Food": Budget("Food", 5000)})
+    [status] = get_report("comprehensive", TODAY).budgets
+    assert (status.category, status.budgeted, status.spent) == ("Food", 5000, 1000)
+
+
+def test_write_from_another_process_recomputes(ledger_dir):
+    spend(1000)
+    assert get_report("spending", TODAY).total == 1000
+    # A second backend on the same files stands in for another process
+    other = storage_module._open_storage(current_ledger())
+    other.append_transaction_records([make_transaction("Expense", 500, "Food", "", TODAY).to_dict()])
+    assert get_report("spending", TODAY).total == 1500
+
+
+def test_ledgers_and_parameters_are_cached_separately(ledger_dir):
+    spend(1000)
+    with using_ledger("other"):
+        spend(70)
+        assert get_report("spending", TODAY).total == 70
+    assert get_report("spending", TODAY).total == 1000
+    assert get_report("spending", TODAY).today == TODAY
+    assert get_report("spending", TODAY + datetime.timedelta(days=1)).today == TODAY + datetime.timedelta(days=1)
+
+
+def test_unknown_report():
+    with pytest.raises(ValueError):
+        get_report("nope")
+
+
+def test_least_recently_used_is_evicted():
+    cache = ReportCache(max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+    assert cache.get_or_compute("a", lambda: "recomputed") == 1
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"], stats["hits"], stats["misses"]) == (2, 2, 2, 4)
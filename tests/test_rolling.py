@@ -0,0 +1,100 @@
+import datetime
+import random
+
+import pytest
+
+from features.analytics.rolling import REBUILD_THRESHOLD, RollingTotals
+from features.transactions.columnar import ColumnStore
+from features.transactions.models import Transaction
+from features.transactions.transactions import make_transaction
+
+BASE = datetime.date(2026, 1, 1)
+CATEGORIES = ["Food", "Transport", "Bills"]
+
+
+def random_transactions(rng, count, first=-60, last=60):
+    return [
+        Transaction(
+            BASE + datetime.timedelta(days=rng.randint(first, last)),
+            "Income" if rng.random() < 0.2 else "Expense",
+            rng.choice(CATEGORIES),
+            "",
+            rng.randint(1, 10000),
+        )
+        for _ in range(count)
+    ]
+
+
+def brute_force(store, start, end, transaction_type, category=None):
+    return sum(
+        t.amount for t in store
+        if start <= t.date < end and t.type == transaction_type and (category is None or t.category == category)
+    )
+
+
+def assert_windows_match(rolling, rng, checks=200):
+    store = rolling.store
+    for _ in range(checks):
+        start = BASE + datetime.timedelta(days=rng.randint(-80, 80))
+        end = start + datetime.timedelta(days=rng.randint(0, 40))
+        for transaction_type, category in [("Expense", None), ("Income", None), ("Expense", rng.choice(CATEGORIES))]:
+            assert rolling.window(start, end, transaction_type, category) == brute_force(store, start, end, transaction_type, category)
+        by_category = {c: brute_force(store, start, end, "Expense", c) for c in CATEGORIES}
+        assert rolling.by_category(start, end, "Expense") == {c: v for c, v in by_category.items() if v}
+
+
+def build(transactions):
+    rolling = RollingTotals(ColumnStore.from_transactions(transactions))
+    rolling.refresh()
+    return rolling
+
+
+def test_windows_match_a_full_scan():
+    rng = random.Random(1)
+    assert_windows_match(build(random_transactions(rng, 500)), rng)
+
+
+@pytest.mark.parametrize("batch_size", [1, 5, REBUILD_THRESHOLD + 1])
+def test_out_of_order_extends_match_a_full_scan(batch_size):
+    rng = random.Random(batch_size)
+    rolling = build(random_transactions(rng, 100, first=0, last=30))
+    for _ in range(6):
+        # Batches reach before, inside and after the days seen so far
+        rolling.store.extend(random_transactions(rng, batch_size, first=-70, last=70))
+        rolling.refresh()
+        assert_windows_match(rolling, rng, checks=40)
+
+
+def test_window_edges_and_helpers():
+    rolling = build([
+        make_transaction("Expense", 100, "Food", "", BASE),
+        make_transaction("Expense", 50, "Food", "", BASE),
+        make_transaction("Expense", 7, "Food", "", BASE + datetime.timedelta(days=1)),
+        make_transaction("Expense", 1, "Food", "", BASE.replace(day=1) - datetime.timedelta(days=1)),
+    ])
+    assert rolling.window(BASE, BASE, "Expense") == 0
+    assert rolling.window(BASE, BASE + datetime.timedelta(days=1), "Expense") == 150
+    assert rolling.last_days(1, "Expense", today=BASE) == 150
+    assert rolling.last_days(2, "Expense", today=BASE + datetime.timedelta(days=1)) == 157
+    assert rolling.month_to_date("Expense", today=BASE + datetime.timedelta(days=5)) == 157
+    assert rolling.window(BASE, BASE + datetime.timedelta(days=9), "Income") == 0
+    assert rolling.window(BASE, BASE + datetime.timedelta(days=9), "Expense", "Travel") == 0
+
+
+def test_far_apart_dates_cost_one_entry_each():
+    rolling = build([
+        make_transaction("Expense", 100, category, "", day)
+        for category in CATEGORIES
+        for day in (datetime.date(1, 1, 1), BASE, datetime.date(9999, 12, 31))
+    ])
+    assert all(len(days) == 3 for days, _ in rolling.series.values())
+    assert rolling.window(datetime.date(1, 1, 1), datetime.date(9999, 12, 31), "Expense") == 600
+    rolling.store.append(make_transaction("Expense", 5, "Food", "", datetime.date(1, 1, 2)))
+    rolling.refresh()
+    assert rolling.window(datetime.date(1, 1, 1), BASE, "Expense", "Food") == 105
+
+
+def test_empty_store():
+    rolling = build([])
+    assert rolling.window(BASE, BASE + datetime.timedelta(days=30), "Expense") == 0
+    assert rolling.by_category(BASE, BASE + datetime.timedelta(days=30), "Expense") == {}
@@ -0,0 +1,207 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from features.analytics.recurring import RecurringBill
+from features.budgets.budgets import Budget, load_budgets, save_budgets
+from features.smart_assistant import rules
+from features.smart_assistant.rules import ALERT, OPPORTUNITY, RECOMMENDATION, REMINDER, FinancialSnapshot, evaluate
+from features.transactions.models import Transaction
+from features.transactions.transactions import record_transaction
+
+TODAY = datetime.date(2026, 3, 15)
+
+
+def snapshot(**fields):
+    """A snapshot with nothing in it, overridden by fields."""
+    values = dict(
+        today=TODAY, budgets={}, income=0, expenses=0, savings=0, savings_rate=0, category_spending={},
+        todays_expenses=0, last_7_days=0, previous_7_days=0, avg_daily_budget=0,
+        month_expenses=[], unusual_expenses=[], recurring_bills=[]
+    )
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def run(name, s):
+    """Runs one registered rule with its registered thresholds."""
+    (r,) = [r for r in rules.RULES if r.name == name]
+    return list(r.check(s, **r.thresholds))
+
+
+def expense(amount, category="Food", day=TODAY):
+    return Transaction(day, "Expense", category, "", amount)
+
+
+def bill(days_left, description="Netflix", category="Entertainment"):
+    due = TODAY + datetime.timedelta(days=days_left)
+    return RecurringBill(category, description, 64900, "monthly", due - datetime.timedelta(days=30), due)
+
+
+LOW_SAVINGS = [
+    "Low savings rate. Try to save at least 10-20% of your income.",
+    "Consider the 50/30/20 rule: 50% for needs, 30% for wants, 20% for savings/debt.",
+]
+
+
+@pytest.mark.parametrize("income, savings_rate, expected", [
+    (100000, 9.99, LOW_SAVINGS),
+    (100000, 10, []),
+    (100000, -50, LOW_SAVINGS),
+    (0, 0, []),
+])
+def test_low_savings_rate(income, savings_rate, expected):
+    assert run("low_savings_rate", snapshot(income=income, savings_rate=savings_rate)) == expected
+
+
+OVER = "You are overspending in 'Food'. Consider reducing spending in this area."
+NEAR = "You are close to your budget limit in 'Food'. Be mindful of spending."
+UNBUDGETED = "Consider setting a budget for 'Food' as you have significant spending there."
+
+
+@pytest.mark.parametrize("budgets, spent, expected", [
+    ({"Food": 10000}, 9000, []),
+    ({"Food": 10000}, 9001, [NEAR]),
+    ({"Food": 10000}, 11000, [NEAR]),
+    ({"Food": 10000}, 11001, [OVER]),
+    ({}, 1, [UNBUDGETED]),
+    ({"Food": 0}, 5000, []),
+])
+def test_category_budget_status(budgets, spent, expected):
+    assert run("category_budget_status", snapshot(budgets=budgets, category_spending={"Food": spent})) == expected
+
+
+@pytest.mark.parametrize("budgets, expected", [
+    ({}, ["No budgets set. Setting budgets can help you control your spending."]),
+    ({"Food": 0}, []),
+])
+def test_no_budgets(budgets, expected):
+    assert run("no_budgets", snapshot(budgets=budgets)) == expected
+
+
+EXCELLENT = ["Excellent financial performance! Consider increasing your savings goals or exploring investments."]
+
+
+@pytest.mark.parametrize("savings_rate, spent, expected", [
+    (20, 10000, EXCELLENT),
+    (19.99, 10000, []),
+    (20, 10001, []),
+])
+def test_strong_performance(savings_rate, spent, expected):
+    s = snapshot(savings_rate=savings_rate, budgets={"Food": 10000}, category_spending={"Food": spent, "Other": 99999})
+    assert run("strong_performance", s) == expected
+
+
+@pytest.mark.parametrize("spent, expected", [
+    (7999, []),
+    (8000, ["🔔 Budget WARNING: 'Food' is 80% used. Approaching limit! (Spent: 80.00, Budget: 100.00)"]),
+    (9999, ["🔔 Budget WARNING: 'Food' is 100% used. Approaching limit! (Spent: 99.99, Budget: 100.00)"]),
+    (10000, ["⚠️  Budget ALERT: 'Food' is 100% used! (Spent: 100.00, Budget: 100.00)"]),
+    (25000, ["⚠️  Budget ALERT: 'Food' is 250% used! (Spent: 250.00, Budget: 100.00)"]),
+])
+def test_budget_utilization(spent, expected):
+    s = snapshot(budgets={"Food": 10000, "Bills": 0}, category_spending={"Food": spent, "Bills": 500})
+    assert run("budget_utilization", s) == expected
+
+
+@pytest.mark.parametrize("income, amounts, expected", [
+    (100000, [19999], []),
+    (100000, [20000, 19999], ["⚡ Large Transaction ALERT: Expense of 200.00 in 'Food' on 2026-03-15."]),
+    (0, [20000], []),
+])
+def test_large_transactions(income, amounts, expected):
+    s = snapshot(income=income, month_expenses=[expense(amount) for amount in amounts])
+    assert run("large_transactions", s) == expected
+
+
+@pytest.mark.parametrize("avg_daily_budget, todays_expenses, expected", [
+    (1000, 1000, []),
+    (1000, 1001, ["📅 Today's spending (10.01) is above your average daily budget (10.00)."]),
+    (0, 1001, []),
+])
+def test_over_daily_budget(avg_daily_budget, todays_expenses, expected):
+    s = snapshot(avg_daily_budget=avg_daily_budget, todays_expenses=todays_expenses)
+    assert run("over_daily_budget", s) == expected
+
+
+@pytest.mark.parametrize("previous, last, expected", [
+    (10000, 12500, []),
+    (10000, 12501, ["📈 You spent 25% more in the last 7 days than in the 7 days before."]),
+    (10000, 30000, ["📈 You spent 200% more in the last 7 days than in the 7 days before."]),
+    (0, 30000, []),
+])
+def test_weekly_spending_jump(previous, last, expected):
+    assert run("weekly_spending_jump", snapshot(previous_7_days=previous, last_7_days=last)) == expected
+
+
+def test_unusual_spending_shows_at_most_five():
+    unusual = [(expense(50000 + i, "Shopping"), 3.25 + i) for i in range(6)]
+    messages = run("unusual_spending", snapshot(unusual_expenses=unusual))
+    assert len(messages) == 5
+    assert messages[0] == (
+        "🔍 Unusual Spending: 500.00 in 'Shopping' on 2026-03-15 "
+        "is far above your usual 'Shopping' expense (z-score 3.2)."
+    )
+
+
+@pytest.mark.parametrize("spending, budgets, expected", [
+    ({"Bills": 8500, "Food": 1500}, {}, ["- 'Bills': High spending (85.00). Is there a way to cut back here?"]),
+    ({"Bills": 8400, "Food": 1600}, {}, [
+        "- 'Bills': High spending (84.00). Is there a way to cut back here?",
+        "- 'Food': High spending (16.00). Is there a way to cut back here?",
+    ]),
+    ({"Bills": 8500, "Food": 1500}, {"Food": 1000}, [
+        "- 'Bills': High spending (85.00). Is there a way to cut back here?",
+        "- 'Food': You are over budget by 5.00. Consider reducing this amount.",
+    ]),
+    # Spending exactly the budget is not over it
+    ({"Bills": 8500, "Food": 1500}, {"Food": 1500}, ["- 'Bills': High spending (85.00). Is there a way to cut back here?"]),
+])
+def test_reducible_categories(spending, budgets, expected):
+    assert run("reducible_categories", snapshot(category_spending=spending, budgets=budgets)) == expected
+
+
+def test_upcoming_bills_at_each_boundary():
+    bills = [bill(-1, "Rent"), bill(0, "Gym"), bill(7, ""), bill(8, "Insurance")]
+    assert run("upcoming_bills", snapshot(recurring_bills=bills)) == [
+        "⏰ 'Rent' (monthly, ~649.00) was due on 2026-03-14 and has not been recorded yet.",
+        "⏰ 'Gym' (monthly, ~649.00) is due today.",
+        # Without a description the category names the bill
+        "📆 'Entertainment' (monthly, ~649.00) is due in 7 day(s), on 2026-03-22.",
+    ]
+
+
+def test_evaluate_runs_only_the_kinds_asked_for():
+    s = snapshot(income=100000, savings_rate=5, todays_expenses=5000, avg_daily_budget=1000)
+    findings = evaluate(s, kinds=(RECOMMENDATION, REMINDER))
+    assert set(findings) == {RECOMMENDATION, REMINDER}
+    assert findings[RECOMMENDATION][:2] == LOW_SAVINGS
+    assert findings[REMINDER] == []
+    assert evaluate(s, kinds=(ALERT,))[ALERT] == [
+        "📅 Today's spending (50.00) is above your average daily budget (10.00)."
+    ]
+    assert evaluate(s, kinds=(OPPORTUNITY,)) == {OPPORTUNITY: []}
+
+
+def test_snapshot_reads_month_to_date_figures(ledger_dir):
+    record_transaction("Income", 100000, "Salary", date=datetime.date(2026, 3, 1))
+    record_transaction("Expense", 10000, "Food", date=datetime.date(2026, 2, 28))
+    record_transaction("Expense", 25000, "Food", date=datetime.date(2026, 3, 10))
+    record_transaction("Expense", 5000, "Transport", date=TODAY)
+    record_transaction("Expense", 7500, "Food", date=TODAY + datetime.timedelta(days=1))
+    budgets = load_budgets()
+    budgets["Food"] = Budget("Food", 31000)
+    save_budgets(budgets)
+
+    s = FinancialSnapshot(TODAY)
+    assert (s.income, s.expenses, s.savings) == (100000, 30000, 70000)
+    assert s.savings_rate == 70
+    assert s.category_spending == {"Food": 25000, "Transport": 5000}
+    # Seven days ending today: March 9 to 15
+    assert (s.todays_expenses, s.last_7_days, s.previous_7_days) == (5000, 30000, 0)
+    assert s.avg_daily_budget == 1000
+    assert [t.amount for t in s.month_expenses] == [5000, 25000]
+    assert run("budget_utilization", s) == [
+        "🔔 Budget WARNING: 'Food' is 81% used. Approaching limit! (Spent: 250.00, Budget: 310.00)"
+    ]
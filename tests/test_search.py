@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+from rich.console import Console
+
+from features.transactions import transactions as transactions_module
+from features.transactions.columnar import ColumnStore
+from features.transactions.search import SearchIndex, parse_query
+from features.transactions.transactions import append_transactions, make_transaction
+
+DAY = datetime.date(2026, 3, 1)
+
+
+@pytest.mark.parametrize("query, terms", [
+    ("Rent", [("rent", False)]),
+    ("net*", [("net", True)]),
+    ("rent *", [("rent", False)]),
+    ("rent !*", [("rent", False)]),
+    ("rent-march*", [("rent", False), ("march", True)]),
+    ("netflix* rent", [("netflix", True), ("rent", False)]),
+    ("!! *", []),
+])
+def test_parse_query(query, terms):
+    assert parse_query(query) == terms
+
+
+@pytest.fixture
+def index():
+    rows = [
+        ("Expense", "Bills", "Rent March", 0),
+        ("Expense", "Entertainment", "Netflix", 1),
+        ("Expense", "Entertainment", "Network cable", 2),
+        ("Income", "Salary", "Rent refund", 3),
+        ("Expense", "Bills", "Rent April", 4),
+        ("Expense", "Bills", "Rent", -10),
+    ]
+    store = ColumnStore.from_transactions(
+        make_transaction(t, 100, c, d, DAY + datetime.timedelta(days=offset)) for t, c, d, offset in rows
+    )
+    index = SearchIndex(store)
+    index.refresh()
+    return index
+
+
+def descriptions(index, rows):
+    return [index.store[row].description for row in rows]
+
+
+def test_words_must_all_match_newest_first(index):
+    assert descriptions(index, index.search("rent")) == ["Rent April", "Rent refund", "Rent March", "Rent"]
+    assert descriptions(index, index.search("RENT march")) == ["Rent March"]
+    assert index.search("rent netflix") == []
+    assert index.search("renting") == []
+
+
+def test_prefix_matching(index):
+    assert descriptions(index, index.search("net*")) == ["Network cable", "Netflix"]
+    assert descriptions(index, index.search("net* cab*")) == ["Network cable"]
+    # A lone * does not turn "rent" into a prefix of "rental" etc.
+    assert index.search("ren *") == []
+    assert index.search("x*") == []
+
+
+def test_filters(index):
+    start = DAY + datetime.timedelta(days=3)
+    assert descriptions(index, index.search("rent", start=start)) == ["Rent April", "Rent refund"]
+    assert descriptions(index, index.search("rent", end=DAY)) == ["Rent"]
+    assert descriptions(index, index.search("rent", transaction_type="Income")) == ["Rent refund"]
+    assert descriptions(index, index.search("rent", start=start, transaction_type="Expense", category="Bills")) == ["Rent April"]
+    assert index.search("rent", transaction_type="Transfer") == []
+
+
+def test_refresh_picks_up_appended_rows(index):
+    index.store.append(make_transaction("Expense", 5, "Food", "Rent snacks", DAY + datetime.timedelta(days=9)))
+    index.refresh()
+    assert descriptions(index, index.search("rent sna*")) == ["Rent snacks"]
+    assert descriptions(index, index.search("rent"))[0] == "Rent snacks"
+
+
+class Answer:
+    def __init__(self, value):
+        self.value = value
+
+    def ask(self):
+        return self.value
+
+
+def test_search_screen_shows_the_query_literally(ledger_dir, monkeypatch):
+    append_transactions([make_transaction("Expense", 100, "Food", "[bold]lunch[/]", DAY)])
+    console = Console(record=True, width=200)
+    monkeypatch.setattr(transactions_module, "Console", lambda: console)
+    texts = iter(["lunch [/]"])
+    selects = iter(["All", "Back"])
+    monkeypatch.setattr(transactions_module.questionary, "text", lambda *a, **k: Answer(next(texts)))
+    monkeypatch.setattr(transactions_module.questionary, "select", lambda *a, **k: Answer(next(selects)))
+
+    transactions_module.search_transactions()
+    output = console.export_text()
+    assert "Matches for 'lunch [/]' 1-1 of 1" in output
+    assert "[bold]lunch[/]" in output
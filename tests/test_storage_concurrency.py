@@ -0,0 +1,143 @@
+"""Several processes sharing one JSON database: consistent reads, and no loss or duplicates after a crash."""
+import multiprocessing
+import os
+
+from features.storage import storage as storage_module
+from features.storage.storage import JsonStorage, add_to_rollup
+
+BATCH = 3
+# Small enough that compactions (snapshot replace + log removal) happen constantly
+COMPACT_BYTES = 2 * 1024
+CRASH_EXIT_CODE = 3
+
+
+def make_batch(writer, i):
+    return [
+        {"date": f"2026-{i % 12 + 1:02d}-{j + 1:02d}", "type": "Expense", "category": "Food",
+         "description": f"w{writer}-{i}-{j}", "amount": 100 + writer * 10 + j}
+        for j in range(BATCH)
+    ]
+
+
+def check_snapshot(records):
+    """Returns (problems, {writer: whole batches seen}) for one loaded snapshot."""
+    problems, seen = [], {}
+    descriptions = [r["description"] for r in records]
+    if len(descriptions) != len(set(descriptions)):
+        problems.append("duplicated records")
+    for description in descriptions:
+        writer, i, j = (int(part) for part in description[1:].split("-"))
+        seen.setdefault(writer, set()).add((i, j))
+    batches = {}
+    for writer, items in seen.items():
+        count = len(items) // BATCH
+        if items != {(i, j) for i in range(count) for j in range(BATCH)}:
+            problems.append(f"writer {writer}: partial or out-of-order batches")
+        batches[writer] = count
+    return problems, batches
+
+
+def writer_process(directory, writer, appends):
+    storage_module.LOG_COMPACT_BYTES = COMPACT_BYTES
+    storage = JsonStorage.in_directory(directory)
+    for i in range(appends):
+        storage.append_transaction_records(make_batch(writer, i))
+
+
+def crashing_writer_process(directory, writer, crash_at_compaction):
+    """Appends until its crash_at_compaction-th compaction, then dies between the snapshot replace and the log removal."""
+    storage_module.LOG_COMPACT_BYTES = COMPACT_BYTES
+    storage = JsonStorage.in_directory(directory)
+    remove = os.remove
+    compactions = 0
+
+    def crash_before_log_removal(path):
+        nonlocal compactions
+        if path == storage.log_file:
+            compactions += 1
+            if compactions == crash_at_compaction:
+                os._exit(CRASH_EXIT_CODE)
+        remove(path)
+
+    storage_module.os.remove = crash_before_log_removal
+    i = 0
+    while True:
+        storage.append_transaction_records(make_batch(writer, i))
+        i += 1
+
+
+def reader_process(directory, stop, results):
+    storage = JsonStorage.in_directory(directory)
+    problems, last, reads = [], {}, 0
+    while not stop.is_set():
+        found, batches = check_snapshot(storage.load_transaction_records())
+        problems.extend(found)
+        for writer, count in batches.items():
+            if count < last.get(writer, 0):
+                problems.append(f"writer {writer}: went back from {last[writer]} to {count} batches")
+            last[writer] = count
+        reads += 1
+    results.put((reads, problems[:10]))
+
+
+def run(directory, writers, readers=2):
+    """Runs the writer processes with readers alongside; returns (writer exit codes, reads, reader problems)."""
+    stop = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    reader_processes = [
+        multiprocessing.Process(target=reader_process, args=(directory, stop, results)) for _ in range(readers)
+    ]
+    writer_processes = [multiprocessing.Process(target=target, args=(directory, *args)) for target, args in writers]
+    for p in reader_processes + writer_processes:
+        p.start()
+    for p in writer_processes:
+        p.join(60)
+    stop.set()
+    outcomes = [results.get(timeout=60) for _ in reader_processes]
+    for p in reader_processes:
+        p.join(60)
+    return [p.exitcode for p in writer_processes], sum(r for r, _ in outcomes), [x for _, ps in outcomes for x in ps]
+
+
+def assert_consistent(storage, expected_batches):
+    records = storage.load_transaction_records()
+    problems, batches = check_snapshot(records)
+    assert problems == []
+    assert batches == expected_batches
+    assert storage.load_rollup() == add_to_rollup({}, records)
+
+
+def test_concurrent_writers_and_readers(tmp_path):
+    directory = str(tmp_path)
+    # An empty snapshot also creates the rollup, which later loads bring up to date
+    JsonStorage.in_directory(directory).save_transaction_records([])
+
+    exit_codes, reads, problems = run(directory, [(writer_process, (w, 60)) for w in range(4)])
+
+    assert exit_codes == [0] * 4
+    assert reads > 0
+    assert problems == []
+    assert_consistent(JsonStorage.in_directory(directory), {w: 60 for w in range(4)})
+
+
+def test_crash_between_snapshot_replace_and_log_removal(tmp_path):
+    directory = str(tmp_path)
+    storage = JsonStorage.in_directory(directory)
+    storage.save_transaction_records([])
+
+    exit_codes, _, problems = run(directory, [(crashing_writer_process, (0, 3))])
+    assert exit_codes == [CRASH_EXIT_CODE]
+    assert problems == []
+    # The dead writer left its log behind next to a snapshot that already includes it
+    assert os.path.exists(storage.log_file)
+    records = storage.load_transaction_records()
+    problems, batches = check_snapshot(records)
+    assert problems == []
+    crashed_batches = batches[0]
+    assert crashed_batches > 0
+
+    # Other processes carry on appending and compacting on top of the leftover log
+    exit_codes, _, problems = run(directory, [(writer_process, (w, 40)) for w in (1, 2)])
+    assert exit_codes == [0, 0]
+    assert problems == []
+    assert_consistent(storage, {0: crashed_batches, 1: 40, 2: 40})